@@ -0,0 +1,57 @@
+import abc
+import io
+import json
+import os
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+def read_json(*path):
+    with open(os.path.join(ROOT, *path)) as f:
+        return json.load(f)
+
+
+def read_county_data():
+    """Return the unemployment rate of the counties in tests/us-counties.json."""
+    df = pd.read_csv(
+        os.path.join(ROOT, "tests", "us_county_data.csv"),
+        na_values=[" "],
+        dtype={"FIPS_Code": str},
+    )
+    return df[["FIPS_Code", "Unemployment_rate_2011"]].dropna()
+
+
+class _MapBenchmark(abc.ABC):
+    """Time building, rendering and saving the map of `make_map` separately.
+
+    Subclasses load their data in `load` and build the map in `make_map`,
+    both take the benchmark parameters.
+    """
+
+    timeout = 300
+
+    def load(self, *params):
+        pass
+
+    @abc.abstractmethod
+    def make_map(self, *params):
+        """Return the map to benchmark."""
+
+    def setup(self, *params):
+        self.load(*params)
+        self.m = self.make_map(*params)
+        self.m.get_root().render()
+
+    def time_construct(self, *params):
+        self.make_map(*params)
+
+    def time_render(self, *params):
+        self.m.get_root().render()
+
+    def time_save(self, *params):
+        self.m.save(io.BytesIO(), close_file=False)
+
+    def peakmem_save(self, *params):
+        self.m.save(io.BytesIO(), close_file=False)
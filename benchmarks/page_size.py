@@ -0,0 +1,166 @@
+"""
+Size of the saved pages of the example maps, with and without `compact`.
+
+The maps follow the notebooks in `examples/`, using their data files. Run
+from the repository root::
+
+    python benchmarks/page_size.py
+
+The sizes are tracked by asv too.
+
+"""
+
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import folium
+from folium import plugins
+
+DATA = os.path.join(os.path.dirname(__file__), os.pardir, "examples", "data")
+
+
+def read_json(name):
+    with open(os.path.join(DATA, name)) as f:
+        return json.load(f)
+
+
+def quickstart():
+    m = folium.Map([45.5236, -122.6750], zoom_start=13)
+    folium.Marker([45.3288, -121.6625], popup="<i>Mt. Hood Meadows</i>").add_to(m)
+    folium.Marker(
+        [45.3311, -121.7113],
+        popup="<b>Timberline Lodge</b>",
+        tooltip="Click me!",
+        icon=folium.Icon(color="green"),
+    ).add_to(m)
+    folium.Circle([45.5244, -122.6699], radius=100).add_to(m)
+    folium.LatLngPopup().add_to(m)
+    return m
+
+
+def markers():
+    rng = np.random.default_rng(0)
+    m = folium.Map([45.5, -122.6], zoom_start=10)
+    for lat, lng in rng.normal([45.5, -122.6], 0.1, size=(1000, 2)):
+        folium.Marker(
+            [lat, lng],
+            popup=f"{lat:.4f}, {lng:.4f}",
+            tooltip="Marker",
+            icon=folium.Icon(color="red", icon="info-sign"),
+        ).add_to(m)
+    return m
+
+
+def choropleth():
+    unemployment = pd.read_csv(os.path.join(DATA, "US_Unemployment_Oct2012.csv"))
+    m = folium.Map([48, -102], zoom_start=3)
+    folium.Choropleth(
+        geo_data=read_json("us-states.json"),
+        data=unemployment,
+        columns=["State", "Unemployment"],
+        key_on="feature.id",
+        fill_color="YlGn",
+        legend_name="Unemployment Rate (%)",
+    ).add_to(m)
+    return m
+
+
+def geojson_popups():
+    m = folium.Map([48, -102], zoom_start=3)
+    folium.GeoJson(
+        read_json("us-states.json"),
+        style_function=lambda feature: {"fillColor": "#ffff00", "weight": 1},
+        highlight_function=lambda feature: {"weight": 3},
+        tooltip=folium.GeoJsonTooltip(["name"]),
+        popup=folium.GeoJsonPopup(["name"]),
+    ).add_to(m)
+    return m
+
+
+def topojson():
+    m = folium.Map([-59.1759, -11.6016], zoom_start=2)
+    folium.TopoJson(
+        read_json("antarctic_ice_shelf_topo.json"),
+        "objects.antarctic_ice_shelf",
+        name="topojson",
+    ).add_to(m)
+    folium.LayerControl().add_to(m)
+    return m
+
+
+def heatmap():
+    rng = np.random.default_rng(0)
+    data = rng.normal([48, 5], [1, 1], size=(10000, 2))
+    m = folium.Map([48, 5], zoom_start=6)
+    plugins.HeatMap(data.tolist()).add_to(m)
+    return m
+
+
+def marker_cluster():
+    rng = np.random.default_rng(0)
+    data = rng.normal([48, 5], [1, 1], size=(1000, 2))
+    m = folium.Map([48, 5], zoom_start=6)
+    plugins.MarkerCluster(data.tolist(), popups=[str(i) for i in range(1000)]).add_to(m)
+    return m
+
+
+def plugins_showcase():
+    m = folium.Map([45.5, -122.6], zoom_start=10)
+    plugins.Fullscreen().add_to(m)
+    plugins.MiniMap().add_to(m)
+    plugins.MeasureControl().add_to(m)
+    plugins.MousePosition().add_to(m)
+    plugins.Draw().add_to(m)
+    plugins.AntPath([[45.5, -122.6], [45.6, -122.5], [45.7, -122.7]]).add_to(m)
+    folium.LayerControl().add_to(m)
+    return m
+
+
+MAPS = {
+    "quickstart": quickstart,
+    "markers": markers,
+    "choropleth": choropleth,
+    "geojson_popups": geojson_popups,
+    "topojson": topojson,
+    "heatmap": heatmap,
+    "marker_cluster": marker_cluster,
+    "plugins": plugins_showcase,
+}
+
+
+def page_size(m, **kwargs):
+    f = io.BytesIO()
+    m.save(f, close_file=False, **kwargs)
+    return len(f.getvalue())
+
+
+class PageSize:
+    """Track the page sizes with asv."""
+
+    params = (list(MAPS), [False, True])
+    param_names = ["map", "compact"]
+
+    def setup(self, name, compact):
+        self.m = MAPS[name]()
+
+    def track_size(self, name, compact):
+        return page_size(self.m, compact=compact)
+
+    track_size.unit = "bytes"
+
+
+def main():
+    print(f"{'map':<16} {'default':>10} {'compact':>10} {'saved':>7}")
+    for name, make_map in MAPS.items():
+        m = make_map()
+        default = page_size(m)
+        compact = page_size(m, compact=True)
+        print(f"{name:<16} {default:>10} {compact:>10} {1 - compact / default:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Time to build, render and save maps with elements of various sizes.
+
+"""
+
+import numpy as np
+
+import folium
+from folium import plugins
+
+from .common import _MapBenchmark, read_county_data, read_json
+
+
+def random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal([45.5, -122.6], [1.0, 1.0], size=(n, 2))
+
+
+class Markers(_MapBenchmark):
+    params = [100, 1000, 3000]
+    param_names = ["n"]
+
+    def load(self, n):
+        self.points = random_points(n).tolist()
+
+    def make_map(self, n):
+        m = folium.Map([45.5, -122.6], zoom_start=8)
+        for i, point in enumerate(self.points):
+            folium.Marker(point, popup=str(i), tooltip="marker").add_to(m)
+        return m
+
+
+class GeoJsonStyled(_MapBenchmark):
+    """`GeoJson` of the counties in tests/us-counties.json with style and
+    highlight functions."""
+
+    params = [100, 1000, 3108]
+    param_names = ["n_features"]
+
+    def load(self, n_features):
+        data = read_json("tests", "us-counties.json")
+        data["features"] = data["features"][:n_features]
+        self.data = data
+
+    def make_map(self, n_features):
+        m = folium.Map([43, -100], zoom_start=4)
+        folium.GeoJson(
+            self.data,
+            style_function=lambda feature: {
+                "fillColor": "red" if feature["id"] < "30000" else "blue",
+                "weight": 1,
+            },
+            highlight_function=lambda feature: {"weight": 3},
+        ).add_to(m)
+        return m
+
+
+class Choropleth(_MapBenchmark):
+    """`Choropleth` of tests/us_county_data.csv on tests/us-counties.json."""
+
+    params = [100, 1000, 3108]
+    param_names = ["n_features"]
+
+    def load(self, n_features):
+        data = read_json("tests", "us-counties.json")
+        data["features"] = data["features"][:n_features]
+        self.geo_data = data
+        self.df = read_county_data()
+
+    def make_map(self, n_features):
+        m = folium.Map([43, -100], zoom_start=4)
+        folium.Choropleth(
+            geo_data=self.geo_data,
+            data=self.df,
+            columns=["FIPS_Code", "Unemployment_rate_2011"],
+            key_on="feature.id",
+            fill_color="YlGn",
+        ).add_to(m)
+        return m
+
+
+class HeatMap(_MapBenchmark):
+    params = [10_000, 100_000, 1_000_000]
+    param_names = ["n"]
+
+    def load(self, n):
+        self.points = random_points(n)
+
+    def make_map(self, n):
+        m = folium.Map([45.5, -122.6], zoom_start=8)
+        plugins.HeatMap(self.points).add_to(m)
+        return m
+
+
+class FastMarkerCluster(_MapBenchmark):
+    params = [1000, 10_000, 100_000]
+    param_names = ["n"]
+
+    def load(self, n):
+        self.points = random_points(n)
+
+    def make_map(self, n):
+        m = folium.Map([45.5, -122.6], zoom_start=8)
+        plugins.FastMarkerCluster(self.points).add_to(m)
+        return m
+
+
+class TopoJson(_MapBenchmark):
+    """`TopoJson` of tests/or_counties_topo.json."""
+
+    def load(self):
+        self.data = read_json("tests", "or_counties_topo.json")
+
+    def make_map(self):
+        m = folium.Map([43.9, -120.6], zoom_start=6)
+        folium.TopoJson(
+            self.data,
+            "objects.or_counties_geo",
+            style_function=lambda feature: {"weight": 1},
+        ).add_to(m)
+        return m
+
+
+class ImageOverlay(_MapBenchmark):
+    """`ImageOverlay` of an RGBA array, reprojected with `mercator_project`."""
+
+    params = [256, 1024, 2048]
+    param_names = ["size"]
+
+    def load(self, size):
+        rng = np.random.default_rng(0)
+        self.image = rng.random((size, size, 4))
+
+    def make_map(self, size):
+        m = folium.Map([0, 0], zoom_start=2)
+        folium.raster_layers.ImageOverlay(
+            self.image,
+            bounds=[[-80, -180], [80, 180]],
+            mercator_project=True,
+        ).add_to(m)
+        return m
+
+
+class DualMap(_MapBenchmark):
+    """`DualMap` with the same markers on both maps."""
+
+    params = [100, 1000]
+    param_names = ["n"]
+
+    def load(self, n):
+        self.points = random_points(n).tolist()
+
+    def make_map(self, n):
+        m = plugins.DualMap([45.5, -122.6], zoom_start=8)
+        for point in self.points:
+            folium.Marker(point).add_to(m)
+        return m
@@ -41,6 +41,7 @@ from folium.map import (
     Popup,
     Tooltip,
 )
+from folium.profiler import profile
 from folium.raster_layers import TileLayer, WmsTileLayer
 from folium.utilities import JsCode
 from folium.vector_layers import Circle, CircleMarker, Polygon, PolyLine, Rectangle
@@ -110,4 +111,6 @@ __all__ = [
     "PolyLine",
     "Polygon",
     "Rectangle",
+    # profiler
+    "profile",
 ]
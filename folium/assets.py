@@ -0,0 +1,369 @@
+"""
+Local cache of the Javascript and CSS resources used by maps.
+
+Maps link to their Javascript and CSS resources on CDNs. To view them
+without network access, `Map.save(..., inline_assets=True)` embeds these
+resources in the page instead, reading them from an on-disk cache.
+
+The cache stores each resource at ``<host>/<path>`` of its URL. Since the
+URLs contain the version of the libraries, a cached file never needs to be
+refreshed. A vendored copy of the cache can be used directly, by pointing
+`inline_assets` or the ``FOLIUM_ASSET_CACHE`` environment variable to it.
+
+The cache is filled with :func:`prefetch`, or from the command line::
+
+    python -m folium.assets [--cache-dir DIR] [URL ...]
+
+Without URLs, the resources of folium and all its plugins are fetched.
+
+When publishing many maps on one site, `Map.save(..., asset_dir=...)`
+instead writes the resources to a shared directory, together with the
+static CSS and Javascript that folium would otherwise repeat in every page.
+The files are named after a hash of their content, so pages link to them
+with URLs that never change and browsers reuse their cached copies.
+
+"""
+
+import argparse
+import base64
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import urljoin, urlparse
+
+import requests
+from branca.element import CssLink, Element, Figure, JavascriptLink
+
+from folium.elements import RawElement, _helper_scripts
+
+TypeCacheDir = Union[str, Path, None]
+
+_css_url_pattern = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_style_pattern = re.compile(r"\s*<style>.*?</style>", re.DOTALL)
+# Element names end with a uuid, see `branca.element.Element.get_name`.
+_element_name_pattern = re.compile(r"_[0-9a-f]{32}")
+
+# Processed content of the cached files, by URL and file modification.
+_memory: dict[tuple[str, Path, int], str] = {}
+
+
+def get_cache_dir(cache_dir: TypeCacheDir = None) -> Path:
+    """Return the asset cache directory.
+
+    Defaults to the ``FOLIUM_ASSET_CACHE`` environment variable, or
+    ``~/.cache/folium/assets``.
+    """
+    if cache_dir is not None:
+        return Path(cache_dir)
+    if os.environ.get("FOLIUM_ASSET_CACHE"):
+        return Path(os.environ["FOLIUM_ASSET_CACHE"])
+    return Path.home() / ".cache" / "folium" / "assets"
+
+
+def url_to_path(url: str, cache_dir: TypeCacheDir = None) -> Path:
+    """Return the path of the cached copy of a URL."""
+    parsed = urlparse(url)
+    if not parsed.netloc:
+        raise ValueError(f"Cannot cache {url!r}, it is not an absolute URL.")
+    path = parsed.path.lstrip("/") or "index"
+    if parsed.query:
+        path += "?" + parsed.query
+    parts = [re.sub(r"[^\w.@+=-]", "_", part) for part in path.split("/")]
+    return get_cache_dir(cache_dir).joinpath(parsed.netloc, *parts)
+
+
+def prefetch(
+    urls: Optional[Iterable[str]] = None,
+    cache_dir: TypeCacheDir = None,
+    overwrite: bool = False,
+) -> list[Path]:
+    """Download resources into the cache.
+
+    Stylesheets are scanned for the fonts and images they refer to, which
+    are downloaded too.
+
+    Parameters
+    ----------
+    urls: list of str, optional
+        URLs of the resources. By default, all resources of folium and its
+        plugins.
+    cache_dir: str or Path, optional
+        The cache directory, see :func:`get_cache_dir`.
+    overwrite: bool, default False
+        Download resources that are cached already.
+
+    Returns
+    -------
+    The paths of the cached files.
+    """
+    if urls is None:
+        urls = sorted({url for _, url in default_urls()})
+    paths = []
+    pending = list(urls)
+    seen = set()
+    while pending:
+        url = pending.pop(0)
+        if url.startswith("//"):
+            url = "https:" + url
+        if url in seen:
+            continue
+        seen.add(url)
+        path = url_to_path(url, cache_dir)
+        if overwrite or not path.exists():
+            response = requests.get(url, timeout=60)
+            response.raise_for_status()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(response.content)
+        paths.append(path)
+        if path.suffix == ".css":
+            css = path.read_text(encoding="utf8", errors="replace")
+            for _, ref in _css_url_pattern.findall(css):
+                if not ref.startswith(("data:", "#")):
+                    pending.append(urljoin(url, ref).split("#")[0])
+    return paths
+
+
+def default_urls() -> list[tuple[str, str]]:
+    """Return the ("js" or "css", url) resources of folium and its plugins."""
+    import folium.plugins  # noqa: F401  register all plugin classes
+    from folium.elements import JSCSSMixin
+    from folium.folium import _default_css, _default_js
+    from folium.vector_layers import _POLYLINE_ENCODED_JS
+
+    out = [("js", url) for _, url in _default_js]
+    out += [("css", url) for _, url in _default_css]
+    out.append(("js", _POLYLINE_ENCODED_JS[1]))
+    classes = [JSCSSMixin]
+    while classes:
+        cls = classes.pop()
+        classes.extend(cls.__subclasses__())
+        out += [("js", url) for _, url in cls.default_js]
+        out += [("css", url) for _, url in cls.default_css]
+    return list(dict.fromkeys(out))
+
+
+def read_asset(url: str, cache_dir: TypeCacheDir = None) -> str:
+    """Return the content of a cached resource, ready to be inlined.
+
+    The ``url()`` references of stylesheets are made absolute, or are
+    replaced by data URIs when the referenced file is cached too.
+    """
+    path = _cached_path(url, cache_dir)
+    key = (url, path, path.stat().st_mtime_ns)
+    if key not in _memory:
+        text = path.read_text(encoding="utf8")
+        if path.suffix == ".css":
+            text = _rewrite_css_urls(text, url, cache_dir, _data_uri)
+        _memory[key] = text
+    return _memory[key]
+
+
+def _cached_path(url: str, cache_dir: TypeCacheDir) -> Path:
+    path = url_to_path(url, cache_dir)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"{url} is not in the asset cache {get_cache_dir(cache_dir)}. "
+            "Fill the cache with folium.assets.prefetch() or "
+            "`python -m folium.assets`."
+        )
+    return path
+
+
+def _data_uri(path: Path) -> str:
+    mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    return f"data:{mimetype};base64,{base64.b64encode(path.read_bytes()).decode()}"
+
+
+def _rewrite_css_urls(
+    css: str, url: str, cache_dir: TypeCacheDir, cached: Callable[[Path], str]
+) -> str:
+    """Make the url() references of a stylesheet absolute, or replace the
+    ones that are cached by `cached(path)`."""
+
+    def replace(match: re.Match) -> str:
+        ref = match.group(2)
+        if ref.startswith(("data:", "#")):
+            return match.group(0)
+        absolute = urljoin(url, ref)
+        path = url_to_path(absolute.split("#")[0], cache_dir)
+        if not path.exists():
+            return f'url("{absolute}")'
+        return f'url("{cached(path)}")'
+
+    return _css_url_pattern.sub(replace, css)
+
+
+@contextmanager
+def inlined_assets(figure: Figure, cache_dir: TypeCacheDir = None) -> Iterator[None]:
+    """Temporarily replace the resource links in the figure header by the
+    content of the resources.
+
+    The figure must have been rendered so that its header is complete.
+    Each URL is inlined once, even if several elements link to it.
+    """
+    original = dict(figure.header._children)
+    seen = set()
+    children = {}
+    for name, child in original.items():
+        if isinstance(child, (JavascriptLink, CssLink)):
+            if child.url in seen:
+                continue
+            seen.add(child.url)
+            text = read_asset(child.url, cache_dir)
+            if isinstance(child, JavascriptLink):
+                text = re.sub("</(script)", r"<\\/\1", text, flags=re.IGNORECASE)
+                child = RawElement(f"<script>{text}</script>")
+            else:
+                text = re.sub("</(style)", r"<\\/\1", text, flags=re.IGNORECASE)
+                child = RawElement(f"<style>{text}</style>")
+        children[name] = child
+    figure.header._children = children
+    try:
+        yield
+    finally:
+        figure.header._children = original
+
+
+def write_hashed(directory: Union[str, Path], name: str, data: bytes) -> str:
+    """Write data to a file named after its content and return the file name.
+
+    The hash of the content is inserted before the extension of `name`, like
+    ``leaflet.3f8b2c1d9e0a.js``. Existing files are not written again.
+    """
+    directory = Path(directory)
+    stem, suffix = os.path.splitext(name)
+    filename = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{suffix}"
+    path = directory / filename
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so that other processes exporting
+        # to the same directory never see a partial file.
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+    return filename
+
+
+@contextmanager
+def shared_assets(
+    figure: Figure,
+    asset_dir: Union[str, Path],
+    asset_url: Optional[str] = None,
+    cache_dir: TypeCacheDir = None,
+) -> Iterator[None]:
+    """Temporarily link the figure to shared copies of its static resources.
+
+    The Javascript and CSS resources, and the fonts and images cached for
+    their stylesheets, are copied from the asset cache to `asset_dir`. The
+    static ``<style>`` blocks in the header and the helper functions of
+    the script are moved to files in `asset_dir` too. All files are named
+    after a hash of their content, see :func:`write_hashed`.
+
+    The figure must have been rendered so that its header is complete.
+
+    Parameters
+    ----------
+    figure: Figure
+        The rendered figure.
+    asset_dir: str or Path
+        The directory to write the shared files to.
+    asset_url: str, optional
+        The URL of `asset_dir` as seen from the page, by default `asset_dir`.
+    cache_dir: str or Path, optional
+        The asset cache directory, see :func:`get_cache_dir`.
+    """
+    if asset_url is None:
+        asset_url = Path(asset_dir).as_posix()
+    asset_url = asset_url.rstrip("/")
+
+    def write(name: str, data: bytes) -> str:
+        return f"{asset_url}/{write_hashed(asset_dir, name, data)}"
+
+    def write_cached(path: Path) -> str:
+        # Stylesheets and the files they refer to are in the same directory.
+        return write_hashed(asset_dir, path.name, path.read_bytes())
+
+    original_header = dict(figure.header._children)
+    original_script = dict(figure.script._children)
+    seen = set()
+    header = {}
+    for name, child in original_header.items():
+        if isinstance(child, (JavascriptLink, CssLink)):
+            if child.url in seen:
+                continue
+            seen.add(child.url)
+            path = _cached_path(child.url, cache_dir)
+            filename = os.path.basename(urlparse(child.url).path) or path.name
+            if isinstance(child, JavascriptLink):
+                child = JavascriptLink(write(filename, path.read_bytes()))
+            else:
+                css = path.read_text(encoding="utf8")
+                css = _rewrite_css_urls(css, child.url, cache_dir, write_cached)
+                child = CssLink(write(filename, css.encode("utf8")))
+        elif type(child) in (Element, RawElement):
+            text = child.render()
+            static = [
+                match.group(0).strip()
+                for match in _style_pattern.finditer(text)
+                if not _element_name_pattern.search(match.group(0))
+            ]
+            if static:
+                css = "\n".join(
+                    block[len("<style>") : -len("</style>")].strip() for block in static
+                )
+                stem = _element_name_pattern.sub("", name)
+                url = write(f"{stem}.css", css.encode("utf8") + b"\n")
+                if url not in seen:
+                    seen.add(url)
+                    header[f"{name}_shared_css"] = CssLink(url)
+                for block in static:
+                    text = text.replace(block, "", 1)
+                child = RawElement(text)
+        header[name] = child
+    script = {}
+    for name, child in original_script.items():
+        if name in _helper_scripts:
+            text = child.render().strip()
+            url = write(f"{name}.js", text.encode("utf8") + b"\n")
+            header[name] = JavascriptLink(url)
+        else:
+            script[name] = child
+    figure.header._children = header
+    figure.script._children = script
+    try:
+        yield
+    finally:
+        figure.header._children = original_header
+        figure.script._children = original_script
+
+
+def main(args: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m folium.assets",
+        description="Download Javascript and CSS resources into the cache "
+        "used by Map.save(inline_assets=True).",
+    )
+    parser.add_argument(
+        "urls",
+        nargs="*",
+        help="URLs to download, by default those of folium and its plugins",
+    )
+    parser.add_argument("--cache-dir", help="cache directory to fill")
+    parser.add_argument(
+        "--overwrite", action="store_true", help="download cached files again"
+    )
+    options = parser.parse_args(args)
+    paths = prefetch(
+        options.urls or None, cache_dir=options.cache_dir, overwrite=options.overwrite
+    )
+    print(f"{len(paths)} files in {get_cache_dir(options.cache_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import base64
+import re
+from collections.abc import Iterator
 from functools import wraps
+from typing import Any, Optional, TypeVar
 
 from branca.element import (
     CssLink,
@@ -9,7 +13,44 @@ from branca.element import (
 )
 
 from folium.template import Template
-from folium.utilities import JsCode, camelize
+from folium.utilities import JsCode, camelize, pack_rtree
+
+T = TypeVar("T")
+
+# Scripts defined once per page that only hold static helper functions.
+_helper_scripts = (
+    "folium_inflate",
+    "folium_progressive",
+    "folium_lazy_layers",
+    "folium_geojson_chunks",
+    "folium_spatial_index",
+    "folium_geojson_worker",
+)
+
+# Scripts named after the element that adds them, like "marker_<id>_set_icon".
+_owner_pattern = re.compile(r"^(.*?_[0-9a-f]{32})_")
+
+
+def descendants(element: Element) -> Iterator[Element]:
+    """Yield an element and all its children, depth first."""
+    yield element
+    for child in element._children.values():
+        yield from descendants(child)
+
+
+def script_owner(name: str, owners: dict[str, T]) -> Optional[T]:
+    """Return the owner of the figure script called `name`.
+
+    `owners` maps the names of elements to their owners. Scripts that may
+    be needed by several elements, like the helper functions and the class
+    includes, have no owner.
+    """
+    if name in _helper_scripts or name.endswith("_includes"):
+        return None
+    if name in owners:
+        return owners[name]
+    match = _owner_pattern.match(name)
+    return owners.get(match.group(1)) if match else None
 
 
 def leaflet_method(fn):
@@ -162,6 +203,822 @@ class ElementAddToElement(MacroElement):
             )
 
 
+class _SharedScript(MacroElement):
+    """Add the `script` macro of the template once per page.
+
+    The script is added to the figure under `script_name`, so that the
+    helper functions it defines are shared by all elements that use them.
+    """
+
+    script_name: str
+
+    def render(self, **kwargs):
+        figure = self.get_root()
+        assert isinstance(
+            figure, Figure
+        ), "You cannot render this Element if it is not in a Figure."
+        script = self._template.module.__dict__.get("script", None)
+        if script is not None:
+            figure.script.add_child(
+                Element(script(self, kwargs)), name=self.script_name
+            )
+
+
+class Inflate(_SharedScript):
+    """Define the Javascript function `foliumInflate` once per page.
+
+    It decodes a payload made by :func:`folium.utilities.compress_json` and
+    returns a Promise of the parsed JSON. Browsers without the native
+    `DecompressionStream` load pako to inflate the data.
+    """
+
+    script_name = "folium_inflate"
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            function foliumInflate(data) {
+                var bytes = Uint8Array.from(atob(data), function(c) {
+                    return c.charCodeAt(0);
+                });
+                if (typeof DecompressionStream !== "undefined") {
+                    var stream = new Blob([bytes]).stream()
+                        .pipeThrough(new DecompressionStream("deflate"));
+                    return new Response(stream).text().then(JSON.parse);
+                }
+                if (!foliumInflate.pako) {
+                    foliumInflate.pako = new Promise(function(resolve, reject) {
+                        var script = document.createElement("script");
+                        script.src = {{ this.pako_url|tojson }};
+                        script.onload = function() {
+                            resolve(window.pako);
+                        };
+                        script.onerror = reject;
+                        document.head.appendChild(script);
+                    });
+                }
+                return foliumInflate.pako.then(function(pako) {
+                    return JSON.parse(pako.inflate(bytes, {to: "string"}));
+                });
+            }
+        {% endmacro %}
+    """)
+
+    pako_url = "https://cdn.jsdelivr.net/npm/pako@2.1.0/dist/pako_inflate.min.js"
+
+
+class GeoJsonChunks(_SharedScript):
+    """Define the Javascript function `foliumGeoJsonChunks` once per page.
+
+    It adds the chunks of a GeoJSON layer made by
+    :func:`folium.utilities.chunk_features` that are in view when the map
+    stops moving, each as a child layer with the options of the layer.
+    Chunks are parsed or downloaded when they first come into view. When
+    more than `maxChunks` chunks are loaded, the least recently used chunks
+    that are out of view are removed.
+    """
+
+    script_name = "folium_geojson_chunks"
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            function foliumGeoJsonChunks(layer, options) {
+                var chunkOptions = L.extend({}, layer.options);
+                if (!chunkOptions.style) {
+                    chunkOptions.style = function(feature) {
+                        return feature.properties && feature.properties.style;
+                    };
+                }
+                var index = options.index.map(function(entry) {
+                    return {key: entry[0], bounds: L.latLngBounds(entry[1])};
+                });
+                // In order of use, the least recently used first.
+                var loaded = new Map();
+                var map = null;
+
+                function load(key) {
+                    var chunk = loaded.get(key);
+                    if (chunk) {
+                        loaded.delete(key);
+                        loaded.set(key, chunk);
+                        return;
+                    }
+                    chunk = {layer: null};
+                    loaded.set(key, chunk);
+                    function add(features) {
+                        // The chunk may have been evicted while downloading.
+                        if (loaded.get(key) === chunk) {
+                            chunk.layer = L.geoJson(features, chunkOptions);
+                            layer.addLayer(chunk.layer);
+                        }
+                    }
+                    if (options.urls) {
+                        fetch(options.urls[key]).then(function(response) {
+                            return response.json();
+                        }).then(add);
+                    } else {
+                        add(JSON.parse(options.data[key]));
+                    }
+                }
+
+                function update() {
+                    var visible = {};
+                    if (map.getZoom() >= options.minZoom) {
+                        var bounds = map.getBounds();
+                        index.forEach(function(chunk) {
+                            if (bounds.intersects(chunk.bounds)) {
+                                visible[chunk.key] = true;
+                                load(chunk.key);
+                            }
+                        });
+                    }
+                    loaded.forEach(function(chunk, key) {
+                        if (loaded.size > options.maxChunks && !visible[key]) {
+                            loaded.delete(key);
+                            if (chunk.layer) {
+                                layer.removeLayer(chunk.layer);
+                            }
+                        }
+                    });
+                }
+
+                layer.on("add", function() {
+                    map = layer._map;
+                    map.on("moveend", update);
+                    update();
+                });
+                layer.on("remove", function() {
+                    map.off("moveend", update);
+                });
+            }
+        {% endmacro %}
+    """)
+
+
+class GeoJsonWorker(_SharedScript):
+    """Define the Javascript function `foliumGeoJsonWorker` once per page.
+
+    It parses GeoJSON in a Web Worker, made from a Blob URL, and hands the
+    features back in batches when the browser is idle. The worker downloads
+    a `url`, inflates a `compressed` payload made by
+    :func:`folium.utilities.compress_json` or parses a JSON `text`. It
+    decodes lines encoded as polylines and moves all coordinates into one
+    Float64Array, which is transferred instead of copied. The coordinates
+    of each batch are unpacked just before the batch is added.
+
+    Returns a Promise that resolves when all batches are added.
+    """
+
+    script_name = "folium_geojson_worker"
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            function foliumGeoJsonWorker(source, batchSize, add) {
+                if (!foliumGeoJsonWorker.url) {
+                    var code = "(" + foliumGeoJsonWorker.main.toString() + ")();";
+                    foliumGeoJsonWorker.url = URL.createObjectURL(
+                        new Blob([code], {type: "text/javascript"}));
+                }
+                var unpack = foliumGeoJsonWorker.unpack;
+                return new Promise(function(resolve, reject) {
+                    var worker = new Worker(foliumGeoJsonWorker.url);
+                    worker.onerror = function(error) {
+                        worker.terminate();
+                        reject(error);
+                    };
+                    worker.onmessage = function(event) {
+                        worker.terminate();
+                        if (event.data.error) {
+                            reject(new Error(event.data.error));
+                            return;
+                        }
+                        var features = event.data.features;
+                        var values = new Float64Array(event.data.values);
+                        var start = 0;
+
+                        function schedule() {
+                            if (window.requestIdleCallback) {
+                                requestIdleCallback(work, {timeout: 200});
+                            } else {
+                                setTimeout(work, 0);
+                            }
+                        }
+
+                        function work(deadline) {
+                            // Milliseconds of work without requestIdleCallback.
+                            var end = performance.now() + 8;
+                            do {
+                                var batch = features.slice(start, start + batchSize);
+                                batch.forEach(function(feature) {
+                                    feature.geometry = unpack(feature.geometry, values);
+                                });
+                                add({type: "FeatureCollection", features: batch}, start);
+                                start += batch.length;
+                            } while (start < features.length && (deadline && deadline.timeRemaining
+                                ? deadline.timeRemaining() > 1
+                                : performance.now() < end));
+                            if (start < features.length) {
+                                schedule();
+                            } else {
+                                resolve();
+                            }
+                        }
+
+                        schedule();
+                    };
+                    worker.postMessage({
+                        source: source,
+                        base: location.href,
+                        pakoUrl: {{ this.pako_url|tojson }}
+                    });
+                });
+            }
+
+            // Runs in the worker, so it cannot use anything from outside.
+            foliumGeoJsonWorker.main = function() {
+                // Append the pairs of an encoded polyline to `values`.
+                function decodeLine(text, values) {
+                    var index = 0;
+                    var pair = [0, 0];
+                    var count = 0;
+                    while (index < text.length) {
+                        for (var k = 0; k < 2; k++) {
+                            var shift = 0;
+                            var result = 0;
+                            var byte;
+                            do {
+                                byte = text.charCodeAt(index++) - 63;
+                                result |= (byte & 0x1f) << shift;
+                                shift += 5;
+                            } while (byte >= 0x20);
+                            pair[k] += result & 1 ? ~(result >> 1) : result >> 1;
+                            values.push(pair[k] / 1e5);
+                        }
+                        count++;
+                    }
+                    return count;
+                }
+
+                // Replace the positions and lines by their place in `values`.
+                function pack(coordinates, values) {
+                    var offset = values.length;
+                    if (typeof coordinates === "string") {
+                        return {o: offset, n: decodeLine(coordinates, values), d: 2};
+                    }
+                    if (!Array.isArray(coordinates) || !coordinates.length) {
+                        return coordinates;
+                    }
+                    if (typeof coordinates[0] === "number") {
+                        values.push.apply(values, coordinates);
+                        return {o: offset, d: coordinates.length, p: 1};
+                    }
+                    var d = Array.isArray(coordinates[0]) && coordinates[0].length;
+                    var line = coordinates.every(function(position) {
+                        return Array.isArray(position) && position.length === d
+                            && typeof position[0] === "number";
+                    });
+                    if (!line) {
+                        return coordinates.map(function(item) {
+                            return pack(item, values);
+                        });
+                    }
+                    coordinates.forEach(function(position) {
+                        for (var j = 0; j < d; j++) {
+                            values.push(position[j]);
+                        }
+                    });
+                    return {o: offset, n: coordinates.length, d: d};
+                }
+
+                function packGeometry(geometry, values) {
+                    if (!geometry) {
+                        return;
+                    }
+                    if (geometry.type === "GeometryCollection") {
+                        geometry.geometries.forEach(function(item) {
+                            packGeometry(item, values);
+                        });
+                    } else {
+                        geometry.coordinates = pack(geometry.coordinates, values);
+                    }
+                }
+
+                function inflate(data, pakoUrl) {
+                    var bytes = Uint8Array.from(atob(data), function(c) {
+                        return c.charCodeAt(0);
+                    });
+                    if (typeof DecompressionStream !== "undefined") {
+                        var stream = new Blob([bytes]).stream()
+                            .pipeThrough(new DecompressionStream("deflate"));
+                        return new Response(stream).text();
+                    }
+                    importScripts(pakoUrl);
+                    return Promise.resolve(pako.inflate(bytes, {to: "string"}));
+                }
+
+                self.onmessage = function(event) {
+                    var source = event.data.source;
+                    var text;
+                    if (source.url) {
+                        text = fetch(new URL(source.url, event.data.base))
+                            .then(function(response) {
+                                return response.text();
+                            });
+                    } else if (source.compressed) {
+                        text = inflate(source.compressed, event.data.pakoUrl);
+                    } else {
+                        text = Promise.resolve(source.text);
+                    }
+                    text.then(function(text) {
+                        var data = JSON.parse(text);
+                        var features = data.type === "FeatureCollection" ? data.features
+                            : data.type === "Feature" ? [data]
+                            : [{type: "Feature", properties: {}, geometry: data}];
+                        var values = [];
+                        features.forEach(function(feature) {
+                            packGeometry(feature.geometry, values);
+                        });
+                        var buffer = new Float64Array(values).buffer;
+                        self.postMessage({features: features, values: buffer}, [buffer]);
+                    }).catch(function(error) {
+                        self.postMessage({error: String(error)});
+                    });
+                };
+            };
+
+            // Undo `pack` in the worker.
+            foliumGeoJsonWorker.unpack = function(coordinates, values) {
+                if (Array.isArray(coordinates)) {
+                    return coordinates.map(function(item) {
+                        return foliumGeoJsonWorker.unpack(item, values);
+                    });
+                }
+                if (!coordinates || typeof coordinates !== "object") {
+                    return coordinates;
+                }
+                if (coordinates.type) {
+                    if (coordinates.type === "GeometryCollection") {
+                        coordinates.geometries = foliumGeoJsonWorker.unpack(
+                            coordinates.geometries, values);
+                    } else {
+                        coordinates.coordinates = foliumGeoJsonWorker.unpack(
+                            coordinates.coordinates, values);
+                    }
+                    return coordinates;
+                }
+                var o = coordinates.o;
+                var d = coordinates.d;
+                if (coordinates.p) {
+                    return Array.prototype.slice.call(values, o, o + d);
+                }
+                var line = new Array(coordinates.n);
+                for (var i = 0; i < line.length; i++, o += d) {
+                    line[i] = d === 2
+                        ? [values[o], values[o + 1]]
+                        : Array.prototype.slice.call(values, o, o + d);
+                }
+                return line;
+            };
+        {% endmacro %}
+    """)
+
+    pako_url = Inflate.pako_url
+
+
+class SpatialIndex(_SharedScript):
+    """Define the Javascript function `foliumIndexedCanvas` once per page.
+
+    It returns a canvas renderer that looks up its paths in a tree made by
+    :func:`folium.utilities.pack_rtree`. Only the paths of the items in view
+    are updated and drawn, and only the ones under the mouse are tested
+    for clicks and hovering. Paths that are not in the tree are always
+    drawn and tested.
+
+    The items are the features passed to `indexFeatures`, in order, or the
+    paths with a `foliumIndex` option. `indexGroup` makes the latter use
+    the renderer when they are added to a group. The `margin` option, in
+    pixels, widens the lookups for the paths that are larger on screen than
+    their bounds, like circle markers.
+    """
+
+    script_name = "folium_spatial_index"
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            function foliumIndexedCanvas(options) {
+                if (!foliumIndexedCanvas.Canvas) {
+                    foliumIndexedCanvas.Canvas = L.Canvas.extend({
+                        initialize: function(options) {
+                            L.Canvas.prototype.initialize.call(this, options);
+                            this._tree = foliumIndexedCanvas.read(this.options.tree);
+                            delete this.options.tree;
+                            // The paths of each item of the tree.
+                            this._items = [];
+                            // The paths that are not in the tree, by id.
+                            this._unindexed = {};
+                            this._featureIds = null;
+                            this._front = 0;
+                            this._back = 0;
+                        },
+
+                        // The features of the tree, from item `start` on.
+                        indexFeatures: function(features, start) {
+                            start = start || 0;
+                            if (!start || !this._featureIds) {
+                                this._featureIds = new Map();
+                            }
+                            var ids = this._featureIds;
+                            features.forEach(function(feature, i) {
+                                ids.set(feature, start + i);
+                            });
+                        },
+
+                        indexGroup: function(group) {
+                            var renderer = this;
+                            var addLayer = group.addLayer;
+                            group.addLayer = function(layer) {
+                                if (layer.options && layer.options.foliumIndex !== undefined) {
+                                    layer.options.renderer = renderer;
+                                }
+                                return addLayer.call(this, layer);
+                            };
+                        },
+
+                        _initPath: function(layer) {
+                            L.Canvas.prototype._initPath.call(this, layer);
+                            layer._foliumOrder = ++this._front;
+                            var id = layer.options.foliumIndex;
+                            if (id === undefined && this._featureIds) {
+                                id = this._featureIds.get(layer.feature);
+                            }
+                            if (id === undefined || !this._tree) {
+                                this._unindexed[L.stamp(layer)] = layer;
+                                return;
+                            }
+                            layer._foliumItem = id;
+                            (this._items[id] = this._items[id] || []).push(layer);
+                        },
+
+                        _removePath: function(layer) {
+                            L.Canvas.prototype._removePath.call(this, layer);
+                            var id = layer._foliumItem;
+                            if (id === undefined) {
+                                delete this._unindexed[L.stamp(layer)];
+                                return;
+                            }
+                            var paths = this._items[id];
+                            paths.splice(paths.indexOf(layer), 1);
+                            delete layer._foliumItem;
+                        },
+
+                        _bringToFront: function(layer) {
+                            L.Canvas.prototype._bringToFront.call(this, layer);
+                            layer._foliumOrder = ++this._front;
+                        },
+
+                        _bringToBack: function(layer) {
+                            L.Canvas.prototype._bringToBack.call(this, layer);
+                            layer._foliumOrder = --this._back;
+                        },
+
+                        // The paths that may be within the pixel bounds, as
+                        // a list in drawing order like the one of L.Canvas.
+                        _query: function(bounds) {
+                            var map = this._map;
+                            var margin = this.options.margin || 0;
+                            var sw = map.layerPointToLatLng(
+                                [bounds.min.x - margin, bounds.max.y + margin]);
+                            var ne = map.layerPointToLatLng(
+                                [bounds.max.x + margin, bounds.min.y - margin]);
+                            var items = this._items;
+                            var paths = [];
+                            if (this._tree) {
+                                foliumIndexedCanvas.search(
+                                    this._tree, sw.lng, sw.lat, ne.lng, ne.lat,
+                                    function(id) {
+                                        if (items[id]) {
+                                            paths.push.apply(paths, items[id]);
+                                        }
+                                    });
+                            }
+                            for (var id in this._unindexed) {
+                                paths.push(this._unindexed[id]);
+                            }
+                            paths.sort(function(a, b) {
+                                return a._foliumOrder - b._foliumOrder;
+                            });
+                            var first = null;
+                            for (var i = paths.length - 1; i >= 0; i--) {
+                                first = {layer: paths[i], next: first};
+                            }
+                            return first;
+                        },
+
+                        // Run a method of L.Canvas on the paths within the
+                        // pixel bounds only.
+                        _within: function(bounds, method, args) {
+                            var all = this._drawFirst;
+                            var first = this._drawFirst = this._query(bounds);
+                            try {
+                                return L.Canvas.prototype[method].apply(this, args);
+                            } finally {
+                                // Unless the first path was moved meanwhile.
+                                if (this._drawFirst === first) {
+                                    this._drawFirst = all;
+                                }
+                            }
+                        },
+
+                        _updatePaths: function() {
+                            if (this._postponeUpdatePaths) {
+                                return;
+                            }
+                            this._redrawBounds = null;
+                            for (var order = this._query(this._bounds); order; order = order.next) {
+                                order.layer._update();
+                            }
+                            this._redraw();
+                        },
+
+                        _draw: function() {
+                            this._within(this._redrawBounds || this._bounds, "_draw", []);
+                        },
+
+                        _onClick: function(e) {
+                            var point = this._map.mouseEventToLayerPoint(e);
+                            this._within(L.bounds(point, point), "_onClick", [e]);
+                        },
+
+                        _handleMouseHover: function(e, point) {
+                            if (!this._mouseHoverThrottled) {
+                                this._within(
+                                    L.bounds(point, point), "_handleMouseHover", [e, point]);
+                            }
+                        }
+                    });
+                }
+                return new foliumIndexedCanvas.Canvas(options);
+            }
+
+            foliumIndexedCanvas.read = function(data) {
+                if (!data) {
+                    return null;
+                }
+                var buffer = Uint8Array.from(atob(data), function(c) {
+                    return c.charCodeAt(0);
+                }).buffer;
+                var view = new DataView(buffer);
+                var tree = {
+                    nodeSize: view.getUint16(2, true),
+                    numItems: view.getUint32(4, true),
+                    levelBounds: []
+                };
+                var n = tree.numItems;
+                var numNodes = n;
+                tree.levelBounds.push(n * 4);
+                do {
+                    n = Math.ceil(n / tree.nodeSize);
+                    numNodes += n;
+                    tree.levelBounds.push(numNodes * 4);
+                } while (n !== 1);
+                tree.boxes = new Float32Array(buffer, 8, numNodes * 4);
+                tree.indices = new (numNodes < 16384 ? Uint16Array : Uint32Array)(
+                    buffer, 8 + numNodes * 16, numNodes);
+                return tree;
+            };
+
+            // Call `visit` with the index of each item that intersects the box.
+            foliumIndexedCanvas.search = function(tree, minX, minY, maxX, maxY, visit) {
+                var boxes = tree.boxes;
+                var levelBounds = tree.levelBounds;
+                var leaves = tree.numItems * 4;
+                var nodeIndex = boxes.length - 4;
+                var queue = [];
+                while (nodeIndex !== undefined) {
+                    var level = 0;
+                    while (levelBounds[level] <= nodeIndex) {
+                        level++;
+                    }
+                    var end = Math.min(nodeIndex + tree.nodeSize * 4, levelBounds[level]);
+                    for (var pos = nodeIndex; pos < end; pos += 4) {
+                        if (maxX < boxes[pos] || maxY < boxes[pos + 1]
+                                || minX > boxes[pos + 2] || minY > boxes[pos + 3]) {
+                            continue;
+                        }
+                        var index = tree.indices[pos >> 2];
+                        if (nodeIndex >= leaves) {
+                            queue.push(index);
+                        } else {
+                            visit(index);
+                        }
+                    }
+                    nodeIndex = queue.pop();
+                }
+            };
+        {% endmacro %}
+    """)
+
+    @staticmethod
+    def options(boxes: Any, margin: float) -> dict:
+        """Return the options of `foliumIndexedCanvas` for rows of boxes."""
+        tree = None
+        if len(boxes):
+            tree = base64.b64encode(pack_rtree(boxes)).decode()
+        return {"tree": tree, "margin": margin}
+
+
+class PerformanceMarks(MacroElement):
+    """Measure in the browser how long the script of each element takes.
+
+    The script of `element` and of each of its descendants is wrapped in
+    `performance.mark` and `performance.measure` calls named
+    ``folium:init:<get_name()>``. Parsing JSON and adding data to GeoJSON
+    layers is measured as ``folium:parse:<kind>``. The page collects the
+    timings in `window.__folium_perf`, whose `summary()` method returns the
+    init and parse times of the page.
+
+    Parameters
+    ----------
+    element: Element
+        The element to instrument, usually a Map.
+    """
+
+    _template = Template("""
+        {% macro header(this, kwargs) %}
+            <script>
+            (function() {
+                var perf = window.__folium_perf = {
+                    elements: [],
+                    parse: [],
+                    stack: []
+                };
+                function current() {
+                    var top = perf.stack[perf.stack.length - 1];
+                    return top ? top.name : null;
+                }
+                function measureParse(kind, start, size, element) {
+                    var end = performance.now();
+                    performance.measure("folium:parse:" + kind, {
+                        start: start,
+                        end: end,
+                        detail: {element: element, size: size}
+                    });
+                    perf.parse.push({
+                        kind: kind,
+                        element: element,
+                        size: size,
+                        start: start,
+                        duration: end - start
+                    });
+                }
+                var parse = JSON.parse;
+                JSON.parse = function(text) {
+                    var start = performance.now();
+                    var result = parse.apply(this, arguments);
+                    if (typeof text === "string" && text.length >= {{ this.min_size }}) {
+                        measureParse("JSON.parse", start, text.length, current());
+                    }
+                    return result;
+                };
+                if (typeof Response !== "undefined") {
+                    var json = Response.prototype.json;
+                    Response.prototype.json = function() {
+                        var start = performance.now();
+                        var element = current();
+                        return json.apply(this, arguments).then(function(result) {
+                            measureParse("Response.json", start, null, element);
+                            return result;
+                        });
+                    };
+                }
+                function hookAddData() {
+                    if (perf.addDataHooked || !window.L || !L.GeoJSON) {
+                        return;
+                    }
+                    perf.addDataHooked = true;
+                    var addData = L.GeoJSON.prototype.addData;
+                    var depth = 0;
+                    L.GeoJSON.prototype.addData = function() {
+                        // addData calls itself for each feature, only time
+                        // the outer call.
+                        if (depth > 0) {
+                            return addData.apply(this, arguments);
+                        }
+                        var start = performance.now();
+                        depth++;
+                        try {
+                            return addData.apply(this, arguments);
+                        } finally {
+                            depth--;
+                            measureParse("L.GeoJSON.addData", start, null, current());
+                        }
+                    };
+                }
+                perf.begin = function(name, type) {
+                    hookAddData();
+                    performance.mark("folium:" + name);
+                    perf.stack.push({name: name, type: type, start: performance.now()});
+                };
+                perf.end = function(name) {
+                    var entry = perf.stack.pop();
+                    var end = performance.now();
+                    performance.measure("folium:init:" + name, {
+                        start: "folium:" + name,
+                        end: end,
+                        detail: {type: entry.type}
+                    });
+                    perf.elements.push({
+                        name: name,
+                        type: entry.type,
+                        start: entry.start,
+                        duration: end - entry.start
+                    });
+                };
+                perf.summary = function() {
+                    function total(entries) {
+                        return entries.reduce(function(sum, entry) {
+                            return sum + entry.duration;
+                        }, 0);
+                    }
+                    var navigation = performance.getEntriesByType("navigation")[0];
+                    return {
+                        init: total(perf.elements),
+                        parse: total(perf.parse),
+                        elements: perf.elements.slice().sort(function(a, b) {
+                            return b.duration - a.duration;
+                        }),
+                        parses: perf.parse.slice(),
+                        domContentLoaded: navigation ? navigation.domContentLoadedEventEnd : null,
+                        load: navigation ? navigation.loadEventEnd : null
+                    };
+                };
+            })();
+            </script>
+        {% endmacro %}
+    """)
+
+    # Only time parsing JSON strings of at least this many characters.
+    min_size = 1024
+
+    def __init__(self, element: Element):
+        super().__init__()
+        self._name = "PerformanceMarks"
+        self.element = element
+
+    def render(self, **kwargs):
+        figure = self.element.get_root()
+        assert isinstance(
+            figure, Figure
+        ), "You cannot render this Element if it is not in a Figure."
+        header = self._template.module.__dict__["header"]
+        # The timing functions are defined before any library is loaded.
+        figure.header.add_child(
+            Element(header(self, kwargs)), name="folium_performance", index=0
+        )
+
+        elements = [self.element]
+        while elements:
+            element = elements.pop()
+            elements.extend(element._children.values())
+            name = element.get_name()
+            script = figure.script._children.get(name)
+            if script is not None and not isinstance(script, PerformanceMeasure):
+                figure.script.add_child(
+                    PerformanceMeasure(script, name, element._name), name=name
+                )
+
+
+class PerformanceMeasure(Element):
+    """Put the timing calls of :class:`PerformanceMarks` around a script.
+
+    The calls are separate statements rather than a block around the
+    script, so that its `let`, `const` and `class` declarations stay
+    visible to the scripts of other elements.
+    """
+
+    _template = Template("""
+        __folium_perf.begin({{ this.name|tojson }}, {{ this.type|tojson }});
+        {{ this.script.render() }}
+        __folium_perf.end({{ this.name|tojson }});
+    """)
+
+    def __init__(self, script: Element, name: str, type: str):
+        super().__init__()
+        self.script = script
+        self.name = name
+        self.type = type
+
+
+class RawElement(Element):
+    """Element that renders as the given text, without templating."""
+
+    def __init__(self, text: str):
+        super().__init__()
+        self.text = text
+
+    def render(self, **kwargs) -> str:
+        return self.text
+
+
 class IncludeStatement(MacroElement):
     """Generate an include statement on a class."""
 
@@ -8,6 +8,7 @@ import json
 import operator
 import warnings
 from collections.abc import Iterable, Sequence
+from pathlib import Path
 from typing import (
     Any,
     Callable,
@@ -18,7 +19,12 @@ from typing import (
 
 import numpy as np
 import requests
-from branca.colormap import ColorMap, LinearColormap, StepColormap
+from branca.colormap import (
+    ColorMap,
+    LinearColormap,
+    StepColormap,
+    _color_float_to_int,
+)
 from branca.element import (
     Div,
     Element,
@@ -30,7 +36,14 @@ from branca.element import (
 )
 from branca.utilities import color_brewer
 
-from folium.elements import JSCSSMixin
+from folium.assets import write_hashed
+from folium.elements import (
+    GeoJsonChunks,
+    GeoJsonWorker,
+    Inflate,
+    JSCSSMixin,
+    SpatialIndex,
+)
 from folium.folium import Map
 from folium.map import Class, FeatureGroup, Icon, Layer, Marker, Popup, Tooltip
 from folium.template import Template
@@ -43,17 +56,32 @@ from folium.utilities import (
     TypePathOptions,
     TypePosition,
     _parse_size,
+    chunk_features,
+    compress_json,
+    encode_geojson,
     escape_backticks,
+    feature_boxes,
+    get_and_assert_figure_root,
     get_bounds,
+    get_coordinate_precision,
     get_obj_in_upper_tree,
     image_to_url,
     javascript_identifier_path_to_array_notation,
     none_max,
     none_min,
+    pad_boxes,
     remove_empty,
-    validate_locations,
+    round_coordinates,
+    simplify_locations,
+    validate_locations_array,
+)
+from folium.vector_layers import (
+    _POLYLINE_ENCODED_JS,
+    Circle,
+    CircleMarker,
+    PolyLine,
+    path_options,
 )
-from folium.vector_layers import Circle, CircleMarker, PolyLine, path_options
 
 
 class RegularPolygonMarker(JSCSSMixin, Marker):
@@ -84,7 +112,7 @@ class RegularPolygonMarker(JSCSSMixin, Marker):
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = new L.RegularPolygonMarker(
-                {{ this.location|tojson }},
+                {{ this.location|round_coordinates(this)|tojson }},
                 {{ this.options|tojavascript }}
             ).addTo({{ this._parent.get_name() }});
         {% endmacro %}
@@ -514,6 +542,53 @@ class GeoJson(Layer):
         Javascript code to be called on each feature.
         See https://leafletjs.com/examples/geojson/
         `onEachFeature` for more information.
+    encoding: {"polyline"}, optional
+        Ship the coordinates of lines and polygons as strings encoded with
+        the Google polyline algorithm, which are decoded in the browser.
+        This makes the page several times smaller, at the cost of rounding
+        to five decimals. Only applies to embedded data.
+    coordinate_precision: int, optional
+        Number of decimals of the coordinates in the output. Overrides the
+        setting of the map.
+    compress: bool or int, default False
+        Embed the data compressed with deflate and base64 encoded, which is
+        inflated in the browser before it is added to the layer. If True,
+        data of at least 10 kB is compressed; pass an int to set this
+        threshold in bytes. Only applies to embedded data. The features are
+        added asynchronously, after the rest of the map script has run.
+    chunk_zoom: int, optional
+        Split the features into a grid of the map tiles at this zoom level,
+        and only add the cells that are in view. Each feature goes to the
+        cell of the center of its bounds. The cells are added when the map
+        stops moving, and are only parsed when they first come into view.
+    chunk_min_zoom: int, optional
+        With `chunk_zoom`, the lowest zoom level of the map at which cells
+        are added, by default `chunk_zoom`.
+    chunk_dir: str or Path, optional
+        With `chunk_zoom`, write each cell to a file in this directory
+        instead of embedding it, to download it when it comes into view.
+        The files are named after a hash of their content.
+    chunk_url: str, optional
+        The URL of `chunk_dir` as seen from the page, by default `chunk_dir`.
+    max_chunks: int, default 100
+        With `chunk_zoom`, the number of cells to keep on the map. When more
+        cells have been added, the least recently used cells that are out
+        of view are removed.
+    spatial_index: bool, default False
+        Draw the features on a canvas that looks them up in a packed Hilbert
+        R-tree of their bounds, built in Python. Only the features in view
+        are updated and drawn when the map moves, and only the ones under
+        the mouse are tested for clicks and hovering. Cannot be combined
+        with `chunk_zoom`.
+    worker: bool, default False
+        Parse the data in a Web Worker instead of on the main thread of the
+        page. The worker also inflates compressed data, decodes `encoding`
+        and downloads the data when it is not embedded. The features are
+        added asynchronously in batches of `worker_batch_size`, when the
+        browser is idle, so that the map stays responsive while they load.
+        Cannot be combined with `chunk_zoom`.
+    worker_batch_size: int, default 1000
+        With `worker`, the number of features to add at once.
     **kwargs
         Keyword arguments are passed to the geoJson object as extra options.
 
@@ -636,13 +711,25 @@ class GeoJson(Layer):
                 {%- endif %}
             });
         };
+        {%- if this.spatial_index %}
+        var {{ this.get_name() }}_renderer = foliumIndexedCanvas(
+            {{ this.index_options|tojson }}
+        );
+        {%- endif %}
         var {{ this.get_name() }} = L.geoJson(null, {
+            {%- if this.spatial_index %}
+                renderer: {{ this.get_name() }}_renderer,
+            {%- endif %}
             {%- if this.smooth_factor is not none  %}
                 smoothFactor: {{ this.smooth_factor|tojson }},
             {%- endif %}
                 onEachFeature: {{ this.get_name() }}_onEachFeature,
             {% if this.style %}
                 style: {{ this.get_name() }}_styler,
+            {%- elif this.worker %}
+                style: function(feature) {
+                    return feature.properties && feature.properties.style;
+                },
             {%- endif %}
             {%- if this.marker %}
                 pointToLayer: {{ this.get_name() }}_pointToLayer,
@@ -651,17 +738,76 @@ class GeoJson(Layer):
         });
 
         function {{ this.get_name() }}_add (data) {
+            {%- if this.spatial_index %}
+            {{ this.get_name() }}_renderer.indexFeatures(data.features);
+            {%- endif %}
             {{ this.get_name() }}
                 .addData(data);
         }
-        {%- if this.embed %}
-            {{ this.get_name() }}_add({{ this.data|tojson }});
+        {%- if this.embed and this.encoding == "polyline" and not this.worker %}
+        function {{ this.get_name() }}_decode(data) {
+            function decode(coordinates) {
+                if (typeof coordinates === "string") {
+                    return L.PolylineUtil.decode(coordinates);
+                }
+                return Array.isArray(coordinates) ? coordinates.map(decode) : coordinates;
+            }
+            function decodeGeometry(geometry) {
+                if (!geometry) {
+                    return;
+                }
+                if (geometry.type === "GeometryCollection") {
+                    geometry.geometries.forEach(decodeGeometry);
+                } else {
+                    geometry.coordinates = decode(geometry.coordinates);
+                }
+            }
+            if (data.type === "FeatureCollection") {
+                data.features.forEach(function(feature) {
+                    decodeGeometry(feature.geometry);
+                });
+            } else if (data.type === "Feature") {
+                decodeGeometry(data.geometry);
+            } else {
+                decodeGeometry(data);
+            }
+            return data;
+        }
+        {%- endif %}
+        {%- if this.chunks %}
+            foliumGeoJsonChunks({{ this.get_name() }}, {{ this.chunks|tojson }});
+        {%- elif this.worker %}
+            foliumGeoJsonWorker(
+                {{ this.worker_source|tojson|escape_braces }},
+                {{ this.worker_batch_size|tojson }},
+                function(data, start) {
+                    {%- if this.spatial_index %}
+                    {{ this.get_name() }}_renderer.indexFeatures(data.features, start);
+                    {%- endif %}
+                    {{ this.get_name() }}.addData(data);
+                }
+            );
+        {%- elif this.compressed %}
+            foliumInflate({{ this.compressed|tojson }}).then(function(data) {
+                {%- if this.encoding == "polyline" %}
+                {{ this.get_name() }}_add({{ this.get_name() }}_decode(data));
+                {%- else %}
+                {{ this.get_name() }}_add(data);
+                {%- endif %}
+                {%- if not this.style %}
+                {{ this.get_name() }}.setStyle(function(feature) {return feature.properties.style;});
+                {%- endif %}
+            });
+        {%- elif this.embed and this.encoding == "polyline" %}
+            {{ this.get_name() }}_add({{ this.get_name() }}_decode({{ this.encoded_data|tojson|escape_braces }}));
+        {%- elif this.embed %}
+            {{ this.get_name() }}_add({{ this.data|round_coordinates(this)|tojson }});
         {%- else %}
             $.ajax({{ this.embed_link|tojson }}, {dataType: 'json', async: false})
                 .done({{ this.get_name() }}_add);
         {%- endif %}
 
-        {%- if not this.style %}
+        {%- if not this.style and not this.compressed and not this.chunks and not this.worker %}
         {{this.get_name()}}.setStyle(function(feature) {return feature.properties.style;});
         {%- endif %}
 
@@ -685,10 +831,47 @@ class GeoJson(Layer):
         zoom_on_click: bool = False,
         on_each_feature: Optional[JsCode] = None,
         marker: Union[Circle, CircleMarker, Marker, None] = None,
+        encoding: Optional[str] = None,
+        coordinate_precision: Optional[int] = None,
+        compress: Union[bool, int] = False,
+        chunk_zoom: Optional[int] = None,
+        chunk_min_zoom: Optional[int] = None,
+        chunk_dir: Union[str, Path, None] = None,
+        chunk_url: Optional[str] = None,
+        max_chunks: int = 100,
+        spatial_index: bool = False,
+        worker: bool = False,
+        worker_batch_size: int = 1000,
         **kwargs: Any,
     ):
-        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        super().__init__(
+            name=name,
+            overlay=overlay,
+            control=control,
+            show=show,
+            coordinate_precision=coordinate_precision,
+        )
         self._name = "GeoJson"
+        if encoding not in (None, "polyline"):
+            raise ValueError(f"Unknown encoding {encoding!r}, use 'polyline'.")
+        if chunk_zoom is not None and (encoding or compress):
+            raise ValueError(
+                "`chunk_zoom` cannot be combined with `encoding` or `compress`."
+            )
+        if chunk_zoom is not None and spatial_index:
+            raise ValueError("`chunk_zoom` cannot be combined with `spatial_index`.")
+        if chunk_zoom is not None and worker:
+            raise ValueError("`chunk_zoom` cannot be combined with `worker`.")
+        self.encoding = encoding
+        self.compress = compress
+        self.chunk_zoom = chunk_zoom
+        self.chunk_min_zoom = chunk_zoom if chunk_min_zoom is None else chunk_min_zoom
+        self.chunk_dir = chunk_dir
+        self.chunk_url = chunk_url
+        self.max_chunks = max_chunks
+        self.spatial_index = spatial_index
+        self.worker = worker
+        self.worker_batch_size = worker_batch_size
         self.embed = embed
         self.embed_link: Optional[str] = None
         self.json = None
@@ -715,6 +898,11 @@ class GeoJson(Layer):
 
         self.data = self.process_data(data)
 
+        if chunk_zoom is not None:
+            self.embed = True
+            self.convert_to_feature_collection()
+        if spatial_index:
+            self.convert_to_feature_collection()
         if self.style or self.highlight:
             self.convert_to_feature_collection()
             if style_function is not None:
@@ -851,8 +1039,90 @@ class GeoJson(Layer):
                 self.style_map = mapper.get_style_map(self.style_function)
             if self.highlight:
                 self.highlight_map = mapper.get_highlight_map(self.highlight_function)
+        if self.embed and self.encoding == "polyline":
+            self.encoded_data = encode_geojson(self.data)
+            if not self.worker:
+                name, url = _POLYLINE_ENCODED_JS
+                figure = get_and_assert_figure_root(self)
+                figure.header.add_child(JavascriptLink(url), name=name)
+        if self.embed and self.encoding == "polyline":
+            payload = self.encoded_data
+        elif self.embed and (self.compress or self.worker):
+            payload = round_coordinates(self.data, get_coordinate_precision(self))
+        self.compressed = None
+        if self.embed and self.compress:
+            self.compressed = compress_json(payload, self.compress)
+            if self.compressed is not None and not self.worker:
+                self.add_child(Inflate(), name="inflate")
+        if self.worker:
+            if not self.embed:
+                self.worker_source = {"url": self.embed_link}
+            elif self.compressed is not None:
+                self.worker_source = {"compressed": self.compressed}
+            else:
+                self.worker_source = {
+                    "text": json.dumps(payload, separators=(",", ":"))
+                }
+            self.add_child(GeoJsonWorker(), name="worker")
+        self.chunks = None
+        if self.chunk_zoom is not None:
+            self.chunks = self._make_chunks()
+            self.add_child(GeoJsonChunks(), name="chunks")
+        if self.spatial_index:
+            self.index_options = self._make_index_options()
+            self.add_child(SpatialIndex(), name="spatial_index")
         super().render()
 
+    def _make_index_options(self) -> dict:
+        """Return the options of `foliumIndexedCanvas`."""
+        boxes = feature_boxes(self.data["features"])
+        # Strokes are hit a few pixels outside of the bounds.
+        margin = 5.0
+        if isinstance(self.marker, Circle):
+            boxes = pad_boxes(boxes, self.marker.options.get("radius", 0))
+        elif isinstance(self.marker, CircleMarker):
+            margin += self.marker.options.get("radius", 10)
+            margin += self.marker.options.get("weight", 3)
+        return SpatialIndex.options(boxes, margin)
+
+    def _make_chunks(self) -> dict:
+        """Return the options of `foliumGeoJsonChunks`."""
+        precision = get_coordinate_precision(self)
+        chunks = chunk_features(self.data["features"], self.chunk_zoom)
+        data = {
+            key: json.dumps(
+                round_coordinates(
+                    {"type": "FeatureCollection", "features": chunk["features"]},
+                    precision,
+                ),
+                separators=(",", ":"),
+            )
+            for key, chunk in chunks.items()
+        }
+        options: dict[str, Any] = {
+            "index": [[key, chunk["bounds"]] for key, chunk in chunks.items()],
+            "minZoom": self.chunk_min_zoom,
+            "maxChunks": self.max_chunks,
+        }
+        if self.chunk_dir is None:
+            options["data"] = data
+        else:
+            url = self.chunk_url
+            if url is None:
+                url = Path(self.chunk_dir).as_posix()
+            options["urls"] = {
+                key: "{}/{}".format(
+                    url.rstrip("/"),
+                    write_hashed(
+                        self.chunk_dir,
+                        key.replace("/", "-") + ".json",
+                        text.encode("utf8"),
+                    ),
+                )
+                for key, text in data.items()
+            }
+        return options
+
 
 TypeStyleMapping = dict[str, Union[str, list[Union[str, int]]]]
 
@@ -956,6 +1226,10 @@ class TopoJson(JSCSSMixin, Layer):
     tooltip: GeoJsonTooltip, Tooltip or str, default None
         Display a text when hovering over the object. Can utilize the data,
         see folium.GeoJsonTooltip for info on how to do that.
+    coordinate_precision: int, optional
+        Number of decimals of the coordinates in the output. Overrides the
+        setting of the map. Quantized topologies are already integers, only
+        their translation is rounded.
 
     Examples
     --------
@@ -980,7 +1254,7 @@ class TopoJson(JSCSSMixin, Layer):
 
     _template = Template("""
         {% macro script(this, kwargs) %}
-            var {{ this.get_name() }}_data = {{ this.data|tojson }};
+            var {{ this.get_name() }}_data = {{ this.data|round_coordinates(this)|tojson }};
             var {{ this.get_name() }} = L.geoJson(
                 topojson.feature(
                     {{ this.get_name() }}_data,
@@ -1016,8 +1290,15 @@ class TopoJson(JSCSSMixin, Layer):
         show: bool = True,
         smooth_factor: Optional[float] = None,
         tooltip: Union[str, Tooltip, None] = None,
+        coordinate_precision: Optional[int] = None,
     ):
-        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        super().__init__(
+            name=name,
+            overlay=overlay,
+            control=control,
+            show=show,
+            coordinate_precision=coordinate_precision,
+        )
         self._name = "TopoJson"
 
         if "read" in dir(data):
@@ -1941,6 +2222,13 @@ class ColorLine(FeatureGroup):
         Line opacity, scale 0-1
     weight: int, default 2
         Stroke weight in pixels
+    simplify: float, optional
+        Simplify the line with this tolerance in Web Mercator meters. Each
+        run of same-colored segments is simplified separately, so the
+        points where the color changes are kept.
+    encoding: {"polyline"}, optional
+        Ship the lines as strings encoded with the Google polyline
+        algorithm, see :class:`folium.vector_layers.PolyLine`.
     **kwargs
         Further parameters available. See folium.map.FeatureGroup
 
@@ -1958,25 +2246,28 @@ class ColorLine(FeatureGroup):
         nb_steps: int = 12,
         weight: Optional[int] = None,
         opacity: Optional[float] = None,
+        simplify: Optional[float] = None,
+        encoding: Optional[str] = None,
         **kwargs: Any,
     ):
         super().__init__(**kwargs)
         self._name = "ColorLine"
-        coords = validate_locations(positions)
+        coords = validate_locations_array(positions)
+        colors = np.asarray(colors, dtype=float)[: len(coords) - 1]
 
         if colormap is None:
             cm: StepColormap = LinearColormap(
                 ["green", "yellow", "red"],
-                vmin=min(colors),
-                vmax=max(colors),
+                vmin=colors.min(),
+                vmax=colors.max(),
             ).to_step(nb_steps)
         elif isinstance(colormap, LinearColormap):
             cm = colormap.to_step(nb_steps)
         elif isinstance(colormap, list) or isinstance(colormap, tuple):
             cm = LinearColormap(
                 colormap,
-                vmin=min(colors),
-                vmax=max(colors),
+                vmin=colors.min(),
+                vmax=colors.max(),
             ).to_step(nb_steps)
         elif isinstance(colormap, StepColormap):
             cm = colormap
@@ -1985,11 +2276,37 @@ class ColorLine(FeatureGroup):
                 f"Unexpected type for argument `colormap`: {type(colormap)}"
             )
 
-        out: dict[str, list[list[list[float]]]] = {}
-        for (lat1, lng1), (lat2, lng2), color in zip(coords[:-1], coords[1:], colors):
-            out.setdefault(cm(color), []).append([[lat1, lng1], [lat2, lng2]])
-        for key, val in out.items():
-            self.add_child(PolyLine(val, color=key, weight=weight, opacity=opacity))
+        # Color index of each segment, computed like StepColormap does.
+        steps = np.clip(
+            np.searchsorted(cm.index, colors, side="right") - 1, 0, len(cm.colors) - 1
+        )
+        # Merge consecutive segments with the same color into runs.
+        starts = np.flatnonzero(np.r_[True, steps[1:] != steps[:-1]])
+        ends = np.r_[starts[1:], len(steps)]
+
+        if simplify is not None:
+            mask = np.zeros(len(coords), dtype=bool)
+            mask[starts] = True
+            mask = simplify_locations(coords, simplify, keep=mask)
+        out: dict[int, list[np.ndarray]] = {}
+        for start, end in zip(starts, ends):
+            run = coords[start : end + 1]
+            if simplify is not None:
+                run = run[mask[start : end + 1]]
+            out.setdefault(int(steps[start]), []).append(run)
+        for step, runs in out.items():
+            color = "#" + "".join(
+                f"{_color_float_to_int(u):02x}" for u in cm.colors[step]
+            )
+            self.add_child(
+                PolyLine(
+                    [run.tolist() for run in runs],
+                    color=color,
+                    weight=weight,
+                    opacity=opacity,
+                    encoding=encoding,
+                )
+            )
 
 
 class Control(JSCSSMixin, Class):
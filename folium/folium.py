@@ -3,17 +3,28 @@ Make beautiful, interactive maps with Python and Leaflet.js
 
 """
 
+import gzip
+import os
 import time
 import webbrowser
-from collections.abc import Sequence
-from typing import Any, Optional, Union
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Optional, Union
 
-from branca.element import Element, Figure
+from branca.element import Element, Figure, Link
 
-from folium.elements import JSCSSMixin
+from folium.assets import inlined_assets, shared_assets
+from folium.elements import JSCSSMixin, PerformanceMarks, RawElement
 from folium.map import Evented, FitBounds, Layer
+from folium.progressive import Progressive
 from folium.raster_layers import TileLayer
-from folium.template import Template
+from folium.template import (
+    Template,
+    compact_html,
+    compact_js,
+    compact_output,
+)
 from folium.utilities import (
     TypeBounds,
     TypeJsonValue,
@@ -63,6 +74,85 @@ _default_css = [
 ]
 
 
+_compression_suffixes = {"gzip": ".gz", "br": ".br"}
+
+
+def _import_brotli() -> Any:
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            raise ImportError(
+                "Brotli compression requires the brotli or brotlicffi package."
+            ) from None
+    return brotli
+
+
+class _BrotliWriter:
+    """Minimal writable file that compresses with Brotli into `fileobj`."""
+
+    def __init__(self, fileobj: IO[bytes]):
+        self.fileobj = fileobj
+        self.compressor = _import_brotli().Compressor()
+
+    def write(self, data: bytes) -> None:
+        self.fileobj.write(self.compressor.process(data))
+
+    def close(self) -> None:
+        self.fileobj.write(self.compressor.finish())
+
+
+def _compressed_writer(fileobj: IO[bytes], compression: Optional[str]) -> Any:
+    """Wrap a binary file so that the data written to it is compressed."""
+    if compression == "gzip":
+        # No file name and modification time, for reproducible output.
+        return gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, mtime=0)
+    if compression == "br":
+        return _BrotliWriter(fileobj)
+    return fileobj
+
+
+_compact_children_template = Template(
+    "{% for child in this._children.values() %}"
+    "{{ child.render(**kwargs) }}\n"
+    "{% endfor %}"
+)
+
+
+@contextmanager
+def _compacted(figure: Figure) -> Iterator[None]:
+    """Temporarily replace the rendered parts of the figure by compacted
+    copies, without indentation and blank lines."""
+    parts = [
+        (figure.header, compact_html),
+        (figure.html, compact_html),
+        (figure.script, compact_js),
+    ]
+    originals = [(part._children, part.__dict__.get("_template")) for part, _ in parts]
+    for part, compact in parts:
+        # Links to resources are already one line.
+        part._children = {
+            name: (
+                child
+                if isinstance(child, Link)
+                else RawElement(compact(child.render()))
+            )
+            for name, child in part._children.items()
+        }
+        part._template = _compact_children_template
+    try:
+        yield
+    finally:
+        for (part, _), (children, template) in zip(parts, originals):
+            part._children = children
+            if template is None:
+                del part._template
+            else:
+                part._template = template
+
+
 class GlobalSwitches(Element):
     _template = Template("""
         <script>
@@ -155,6 +245,22 @@ class Map(JSCSSMixin, Evented):
     font_size : int or float or string (default: '1rem')
         The font size to use for Leaflet, can either be a number or a
         string ending in 'rem', 'em', or 'px'.
+    coordinate_precision : int, optional
+        Number of decimals of the coordinates in the output, for all layers
+        on the map. Rounding to 6 decimals keeps a precision of about 0.1 m
+        and makes pages with many coordinates smaller. By default the
+        coordinates are not rounded.
+    performance_marks : bool, default False
+        Measure in the browser how long the script of each layer takes to
+        run and how long its data takes to parse. The timings are stored
+        as `performance.measure` entries and summarized by
+        ``window.__folium_perf.summary()``. When False nothing is added to
+        the page. See :class:`folium.elements.PerformanceMarks`.
+    progressive : bool, default False
+        Construct the map and its base layers while the page loads, and the
+        other layers afterwards, in chunks when the browser is idle. Visible
+        layers come first, and large GeoJSON data is added in batches. See
+        :class:`folium.progressive.Progressive`.
     **kwargs
         Additional keyword arguments are passed to Leaflets Map class:
         https://leafletjs.com/reference.html#map
@@ -234,7 +340,7 @@ class Map(JSCSSMixin, Evented):
             var {{ this.get_name() }} = L.map(
                 {{ this.get_name()|tojson }},
                 {
-                    center: {{ this.location|tojson }},
+                    center: {{ this.location|round_coordinates(this)|tojson }},
                     crs: L.CRS.{{ this.crs }},
                     ...{{this.options|tojavascript}}
 
@@ -292,10 +398,16 @@ class Map(JSCSSMixin, Evented):
         png_enabled: bool = False,
         zoom_control: Union[bool, str] = True,
         font_size: str = "1rem",
+        coordinate_precision: Optional[int] = None,
+        performance_marks: bool = False,
+        progressive: bool = False,
         **kwargs: TypeJsonValue,
     ):
         super().__init__()
         self._name = "Map"
+        self.coordinate_precision = coordinate_precision
+        self.performance_marks = PerformanceMarks(self) if performance_marks else None
+        self.progressive = Progressive(self) if progressive else None
 
         self._png_image: Optional[bytes] = None
         self.png_enabled = png_enabled
@@ -357,6 +469,14 @@ class Map(JSCSSMixin, Evented):
             )
             self.add_child(tile_layer, name=tile_layer.tile_name)
 
+    def render(self, **kwargs):
+        super().render(**kwargs)
+        # After the children, so that their scripts can be wrapped.
+        if self.performance_marks is not None:
+            self.performance_marks.render(**kwargs)
+        if self.progressive is not None:
+            self.progressive.render(**kwargs)
+
     def _repr_html_(self, **kwargs) -> str:
         """Displays the HTML Map in a Jupyter notebook."""
         if self._parent is None:
@@ -421,6 +541,143 @@ class Map(JSCSSMixin, Evented):
             self._png_image = png
         return self._png_image
 
+    def save(
+        self,
+        outfile: Union[str, bytes, Path, BinaryIO],
+        close_file: bool = True,
+        compression: Union[str, Sequence[str], None] = None,
+        inline_assets: Union[bool, str, Path] = False,
+        asset_dir: Union[str, Path, None] = None,
+        compact: bool = False,
+        **kwargs,
+    ):
+        """Saves the map to an HTML file, optionally compressed.
+
+        The document is compressed chunk by chunk while it is generated,
+        so the uncompressed page is never held in memory as a whole.
+
+        Parameters
+        ----------
+        outfile : str, path or file object
+            The file (or filename) where you want to output the html.
+        close_file : bool, default True
+            Whether the file has to be closed after write.
+        compression : {"gzip", "br"} or list of them, optional
+            Compress the output with gzip or Brotli. Brotli needs the
+            `brotli` or `brotlicffi` package. By default it is inferred
+            from a `.gz` or `.br` file name extension. With a list, the
+            plain page is written to `outfile` and a compressed copy for
+            each encoding next to it, like `map.html.gz` and
+            `map.html.br`, from a single render. This lets static file
+            servers pick the variant matching the `Accept-Encoding` of
+            the client.
+        inline_assets : bool or path, default False
+            Embed the Javascript and CSS resources in the page instead of
+            linking to them, so it can be viewed offline. The resources are
+            read from the local asset cache, see :mod:`folium.assets`, or
+            from the cache directory given here.
+        asset_dir : str or path, optional
+            Link to copies of the resources in this directory, together with
+            the static CSS and Javascript helpers that are otherwise repeated
+            in every page. Files are named after a hash of their content, so
+            many maps saved with the same `asset_dir` share them and
+            browsers cache them across pages. The resources are read from
+            the local asset cache, see :mod:`folium.assets`.
+        compact : bool, default False
+            Leave out the indentation, blank lines and comments of the
+            generated HTML and Javascript, and the optional whitespace in
+            the JSON data, to make the page smaller.
+
+        Examples
+        --------
+        >>> m.save("map.html.gz")
+        >>> m.save("map.html", compression=["gzip", "br"])
+        >>> m.save("map.html", inline_assets=True)
+        >>> m.save("site/maps/paris.html", asset_dir="site/folium-assets")
+        >>> m.save("map.html", compact=True)
+        """
+        if inline_assets and asset_dir is not None:
+            raise ValueError("Use either inline_assets or asset_dir, not both.")
+        if isinstance(outfile, bytes):
+            outfile = os.fsdecode(outfile)
+        is_path = isinstance(outfile, (str, Path))
+        if compression is None and is_path:
+            suffix = Path(outfile).suffix
+            for name, compressed_suffix in _compression_suffixes.items():
+                if suffix == compressed_suffix:
+                    compression = name
+
+        if compression is None or isinstance(compression, str):
+            targets = [(outfile, compression)]
+        elif not is_path:
+            raise ValueError("Writing multiple encodings requires a file name.")
+        else:
+            targets = [(outfile, None)] + [
+                (f"{outfile}{_compression_suffixes.get(name, '')}", name)
+                for name in compression
+            ]
+
+        for _, name in targets:
+            if name is not None and name not in _compression_suffixes:
+                raise ValueError(
+                    f"Unknown compression {name!r}, "
+                    f"use one of {list(_compression_suffixes)}."
+                )
+            if name == "br":
+                _import_brotli()
+
+        files = []
+        writers = []
+        try:
+            for target, name in targets:
+                fid = open(target, "wb") if is_path else target
+                files.append(fid)
+                writers.append(_compressed_writer(fid, name))
+            asset_url = None
+            if asset_dir is not None and is_path:
+                asset_url = os.path.relpath(asset_dir, Path(outfile).parent)
+                asset_url = Path(asset_url).as_posix()
+            html = self._iter_html(
+                inline_assets, asset_dir, asset_url, compact, **kwargs
+            )
+            for chunk in html:
+                data = chunk.encode("utf8")
+                for writer in writers:
+                    writer.write(data)
+            for writer, fid in zip(writers, files):
+                if writer is not fid:
+                    writer.close()
+        finally:
+            if is_path or close_file:
+                for fid in files:
+                    fid.close()
+
+    def _iter_html(
+        self,
+        inline_assets: Union[bool, str, Path] = False,
+        asset_dir: Union[str, Path, None] = None,
+        asset_url: Optional[str] = None,
+        compact: bool = False,
+        **kwargs,
+    ) -> Iterator[str]:
+        """Render the whole page, yielding it in parts."""
+        root = self.get_root()
+        if not isinstance(root, Figure):
+            yield root.render(**kwargs)
+            return
+        with compact_output() if compact else nullcontext():
+            for child in root._children.values():
+                child.render(**kwargs)
+        if inline_assets:
+            cache_dir = None if inline_assets is True else inline_assets
+            assets = inlined_assets(root, cache_dir)
+        elif asset_dir is not None:
+            assets = shared_assets(root, asset_dir, asset_url)
+        else:
+            assets = nullcontext()
+        with _compacted(root) if compact else nullcontext(), assets:
+            yield from root._template.generate(this=root, kwargs=kwargs)
+
     def _repr_png_(self) -> Optional[bytes]:
         """Displays the PNG Map in a Jupyter notebook."""
         # The notebook calls all _repr_*_ by default.
@@ -6,11 +6,22 @@ Classes for drawing maps.
 import warnings
 from collections import OrderedDict, defaultdict
 from collections.abc import Sequence
+from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Union, cast
 
+import numpy as np
 from branca.element import Element, Figure, Html, MacroElement
 
-from folium.elements import ElementAddToElement, EventHandler, IncludeStatement
+from folium.assets import write_hashed
+from folium.elements import (
+    ElementAddToElement,
+    EventHandler,
+    IncludeStatement,
+    RawElement,
+    SpatialIndex,
+    descendants,
+    script_owner,
+)
 from folium.template import Template
 from folium.utilities import (
     JsCode,
@@ -18,6 +29,7 @@ from folium.utilities import (
     TypeBoundsReturn,
     TypeJsonValue,
     escape_backticks,
+    pad_boxes,
     parse_options,
     remove_empty,
     validate_location,
@@ -111,6 +123,9 @@ class Layer(Evented):
         Whether the Layer will be included in LayerControls.
     show: bool, default True
         Whether the layer will be shown on opening.
+    coordinate_precision: int, optional
+        Number of decimals of the coordinates of this layer and its children
+        in the output. Overrides the setting of the map.
     """
 
     def __init__(
@@ -119,12 +134,14 @@ class Layer(Evented):
         overlay: bool = False,
         control: bool = True,
         show: bool = True,
+        coordinate_precision: Optional[int] = None,
     ):
         super().__init__()
         self.layer_name = name if name is not None else self.get_name()
         self.overlay = overlay
         self.control = control
         self.show = show
+        self.coordinate_precision = coordinate_precision
 
     def render(self, **kwargs):
         if self.show:
@@ -157,6 +174,15 @@ class FeatureGroup(Layer):
         Whether the layer will be included in LayerControls.
     show: bool, default True
         Whether the layer will be shown on opening.
+    coordinate_precision: int, optional
+        Number of decimals of the coordinates of this layer and its children
+        in the output. Overrides the setting of the map.
+    spatial_index: bool, default False
+        Draw the polylines, polygons, rectangles and circles in the group on
+        a canvas that looks them up in a packed Hilbert R-tree of their
+        bounds, built in Python. Only the ones in view are updated and drawn
+        when the map moves, and only the ones under the mouse are tested for
+        clicks and hovering.
     **kwargs
         Additional (possibly inherited) options. See
         https://leafletjs.com/reference.html#featuregroup
@@ -165,9 +191,17 @@ class FeatureGroup(Layer):
 
     _template = Template("""
         {% macro script(this, kwargs) %}
+            {%- if this.spatial_index %}
+            var {{ this.get_name() }}_renderer = foliumIndexedCanvas(
+                {{ this.index_options|tojson }}
+            );
+            {%- endif %}
             var {{ this.get_name() }} = L.featureGroup(
                 {{ this.options|tojavascript }}
             );
+            {%- if this.spatial_index %}
+            {{ this.get_name() }}_renderer.indexGroup({{ this.get_name() }});
+            {%- endif %}
         {% endmacro %}
         """)
 
@@ -177,13 +211,70 @@ class FeatureGroup(Layer):
         overlay: bool = True,
         control: bool = True,
         show: bool = True,
+        coordinate_precision: Optional[int] = None,
+        spatial_index: bool = False,
         **kwargs: TypeJsonValue,
     ):
-        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        super().__init__(
+            name=name,
+            overlay=overlay,
+            control=control,
+            show=show,
+            coordinate_precision=coordinate_precision,
+        )
         self._name = "FeatureGroup"
         self.tile_name = name if name is not None else self.get_name()
+        self.spatial_index = spatial_index
         self.options = remove_empty(**kwargs)
 
+    def render(self, **kwargs):
+        if not self.spatial_index:
+            return super().render(**kwargs)
+        from folium.vector_layers import (
+            Circle,
+            CircleMarker,
+            Polygon,
+            PolyLine,
+            Rectangle,
+        )
+
+        paths = [
+            child
+            for child in self._children.values()
+            if isinstance(child, (PolyLine, Polygon, Rectangle, Circle, CircleMarker))
+        ]
+        boxes = np.array(
+            [
+                [bounds[0][1], bounds[0][0], bounds[1][1], bounds[1][0]]
+                for bounds in (path._get_self_bounds() for path in paths)
+            ],
+            dtype=float,
+        ).reshape(-1, 4)
+        radii = [
+            path.options.get("radius", 0) if isinstance(path, Circle) else 0
+            for path in paths
+        ]
+        boxes = pad_boxes(boxes, radii)
+        # Strokes are hit a few pixels outside of the bounds.
+        margin = 5.0 + max(
+            [
+                path.options.get("radius", 10) + path.options.get("weight", 3)
+                for path in paths
+                if isinstance(path, CircleMarker)
+            ],
+            default=0,
+        )
+        self.index_options = SpatialIndex.options(boxes, margin)
+        self.add_child(SpatialIndex(), name="spatial_index")
+        # The renderer finds the paths by this option.
+        for i, path in enumerate(paths):
+            path.options["foliumIndex"] = i
+        try:
+            super().render(**kwargs)
+        finally:
+            for path in paths:
+                path.options.pop("foliumIndex", None)
+
 
 class LayerGroup(Layer):
     """
@@ -263,6 +354,20 @@ class LayerControl(MacroElement):
     draggable: bool, default False
           By default the layer control has a fixed position. Set this argument
           to True to allow dragging the control around.
+    lazy: bool, default False
+          Construct the overlays that are not shown on opening only when
+          they are first selected in the control. Until then, their script
+          and data are kept in the page but not run. Overlays that other
+          scripts refer to are constructed on opening as usual.
+    sidecar_dir: str or Path, optional
+          With `lazy`, write the scripts of the lazy overlays to files in
+          this directory instead, to download them when they are selected.
+          The files are named after a hash of their content. When a file
+          fails to load, the overlay fires a "lazyerror" event and the
+          download is tried again the next time the overlay is selected.
+    sidecar_url: str, optional
+          The URL of `sidecar_dir` as seen from the page, by default
+          `sidecar_dir`.
     **kwargs
         Additional (possibly inherited) options. See
         https://leafletjs.com/reference.html#control-layers
@@ -270,7 +375,64 @@ class LayerControl(MacroElement):
     """
 
     _template = Template("""
+        {% macro lazy_runtime(this, kwargs) %}
+            var foliumLazyLayer = (function() {
+                var pending = {};
+                function lazyLayer(name, url) {
+                    var group = L.layerGroup();
+                    var loading = null;
+                    group.on("add", function() {
+                        if (loading) {
+                            return;
+                        }
+                        loading = new Promise(function(resolve, reject) {
+                            pending[name] = resolve;
+                            var script = document.createElement("script");
+                            if (url) {
+                                script.src = url;
+                                script.onerror = function() {
+                                    delete pending[name];
+                                    script.parentNode.removeChild(script);
+                                    reject(new Error("Could not load " + url));
+                                };
+                                document.head.appendChild(script);
+                            } else {
+                                // An inserted script runs right away.
+                                var node = document.querySelector(
+                                    'script[type="text/x-folium-deferred"][data-layer="'
+                                    + name + '"]'
+                                );
+                                script.text = node.text;
+                                node.parentNode.replaceChild(script, node);
+                            }
+                        }).then(function(layer) {
+                            group.addLayer(layer);
+                        }).catch(function(error) {
+                            // Try again when the layer is added next time.
+                            loading = null;
+                            console.error(error);
+                            group.fire("lazyerror", {error: error});
+                        });
+                    });
+                    return group;
+                }
+                lazyLayer.loaded = function(name, layer) {
+                    pending[name](layer);
+                    delete pending[name];
+                };
+                return lazyLayer;
+            })();
+        {% endmacro %}
+
+        {% macro lazy_layer(this, kwargs) %}
+            {{ kwargs.script }}
+            foliumLazyLayer.loaded({{ kwargs.name|tojson }}, {{ kwargs.name }});
+        {% endmacro %}
+
         {% macro script(this,kwargs) %}
+            {%- for name, url in this.lazy_layers.items() %}
+            var {{ name }}_lazy = foliumLazyLayer({{ name|tojson }}, {{ url|tojson }});
+            {%- endfor %}
             var {{ this.get_name() }}_layers = {
                 base_layers : {
                     {%- for key, val in this.base_layers.items() %}
@@ -302,6 +464,9 @@ class LayerControl(MacroElement):
         collapsed: bool = True,
         autoZIndex: bool = True,
         draggable: bool = False,
+        lazy: bool = False,
+        sidecar_dir: Union[str, Path, None] = None,
+        sidecar_url: Optional[str] = None,
         **kwargs: TypeJsonValue,
     ):
         super().__init__()
@@ -310,16 +475,23 @@ class LayerControl(MacroElement):
             position=position, collapsed=collapsed, autoZIndex=autoZIndex, **kwargs
         )
         self.draggable = draggable
+        self.lazy = lazy
+        self.sidecar_dir = sidecar_dir
+        self.sidecar_url = sidecar_url
         self.base_layers: OrderedDict[str, str] = OrderedDict()
         self.overlays: OrderedDict[str, str] = OrderedDict()
+        # The URL of the script of each lazy overlay, None when in the page.
+        self.lazy_layers: OrderedDict[str, Optional[str]] = OrderedDict()
 
     def reset(self) -> None:
         self.base_layers = OrderedDict()
         self.overlays = OrderedDict()
+        self.lazy_layers = OrderedDict()
 
     def render(self, **kwargs):
         """Renders the HTML representation of the element."""
         self.reset()
+        hidden = []
         for item in self._parent._children.values():
             if not isinstance(item, Layer) or not item.control:
                 continue
@@ -328,8 +500,79 @@ class LayerControl(MacroElement):
                 self.base_layers[key] = item.get_name()
             else:
                 self.overlays[key] = item.get_name()
+                if not item.show:
+                    hidden.append(item)
+        if self.lazy and hidden:
+            self._defer(hidden)
         super().render()
 
+    def _defer(self, layers: list[Layer]) -> None:
+        """Move the scripts of the layers out of the page script."""
+        figure = self.get_root()
+        assert isinstance(
+            figure, Figure
+        ), "You cannot render this Element if it is not in a Figure."
+        owners = {
+            element.get_name(): layer.get_name()
+            for layer in layers
+            for element in descendants(layer)
+        }
+        for layer in layers:
+            figure.html._children.pop(f"{layer.get_name()}_lazy", None)
+        scripts = figure.script._children
+        parts: dict[Optional[str], list[str]] = {None: []}
+        parts.update((layer.get_name(), []) for layer in layers)
+        for name, script in scripts.items():
+            # The script of this control from an earlier render.
+            if name != self.get_name():
+                parts[script_owner(name, owners)].append(script.render())
+        texts = {owner: "\n".join(part) for owner, part in parts.items()}
+        # Layers that other scripts refer to are needed on opening.
+        lazy = [
+            layer
+            for layer in layers
+            if texts[layer.get_name()]
+            and not any(
+                layer.get_name() in text
+                for owner, text in texts.items()
+                if owner != layer.get_name()
+            )
+        ]
+        if not lazy:
+            return
+
+        lazy_names = {layer.get_name() for layer in lazy}
+        for name in list(scripts):
+            if script_owner(name, owners) in lazy_names:
+                del scripts[name]
+        macro = self._template.module.__dict__["lazy_layer"]
+        for layer in lazy:
+            name = layer.get_name()
+            text = macro(self, {"name": name, "script": texts[name]})
+            if self.sidecar_dir is None:
+                url = None
+                figure.html.add_child(
+                    RawElement(
+                        '<script type="text/x-folium-deferred" '
+                        f'data-layer="{name}">{text}</script>'
+                    ),
+                    name=f"{name}_lazy",
+                )
+            else:
+                sidecar_url = self.sidecar_url
+                if sidecar_url is None:
+                    sidecar_url = Path(self.sidecar_dir).as_posix()
+                filename = write_hashed(
+                    self.sidecar_dir, f"{layer._name.lower()}.js", text.encode("utf8")
+                )
+                url = f"{sidecar_url.rstrip('/')}/{filename}"
+            self.lazy_layers[name] = url
+            self.overlays[layer.layer_name] = f"{name}_lazy"
+        figure.script.add_child(
+            RawElement(self._template.module.__dict__["lazy_runtime"](self, {})),
+            name="folium_lazy_layers",
+        )
+
 
 class Icon(MacroElement):
     """
@@ -494,7 +737,7 @@ class Marker(MacroElement):
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.marker(
-                {{ this.location|tojson }},
+                {{ this.location|round_coordinates(this)|tojson }},
                 {{ this.options|tojavascript }}
             ).addTo({{ this._parent.get_name() }});
         {% endmacro %}
@@ -759,7 +1002,7 @@ class FitBounds(MacroElement):
     _template = Template("""
         {% macro script(this, kwargs) %}
             {{ this._parent.get_name() }}.fitBounds(
-                {{ this.bounds|tojson }},
+                {{ this.bounds|round_coordinates(this)|tojson }},
                 {{ this.options|tojson }}
             );
         {% endmacro %}
@@ -12,8 +12,11 @@ from folium.plugins.float_image import FloatImage
 from folium.plugins.fullscreen import Fullscreen
 from folium.plugins.geocoder import Geocoder
 from folium.plugins.geoman import GeoMan
+from folium.plugins.glify import GlifyLines, GlifyPoints, GlifyShapes
+from folium.plugins.grid_aggregation import GridAggregation
 from folium.plugins.groupedlayercontrol import GroupedLayerControl
 from folium.plugins.heat_map import HeatMap
+from folium.plugins.heat_map_tiles import HeatMapTiles
 from folium.plugins.heat_map_withtime import HeatMapWithTime
 from folium.plugins.locate_control import LocateControl
 from folium.plugins.marker_cluster import MarkerCluster
@@ -24,6 +27,7 @@ from folium.plugins.overlapping_marker_spiderfier import OverlappingMarkerSpider
 from folium.plugins.pattern import CirclePattern, StripePattern
 from folium.plugins.polyline_offset import PolyLineOffset
 from folium.plugins.polyline_text_path import PolyLineTextPath
+from folium.plugins.precomputed_marker_cluster import PrecomputedMarkerCluster
 from folium.plugins.realtime import Realtime
 from folium.plugins.scroll_zoom_toggler import ScrollZoomToggler
 from folium.plugins.search import Search
@@ -57,8 +61,13 @@ __all__ = [
     "Fullscreen",
     "Geocoder",
     "GeoMan",
+    "GlifyLines",
+    "GlifyPoints",
+    "GlifyShapes",
+    "GridAggregation",
     "GroupedLayerControl",
     "HeatMap",
+    "HeatMapTiles",
     "HeatMapWithTime",
     "LocateControl",
     "MarkerCluster",
@@ -70,6 +79,7 @@ __all__ = [
     "PolyLineFromEncoded",
     "PolyLineTextPath",
     "PolyLineOffset",
+    "PrecomputedMarkerCluster",
     "Realtime",
     "ScrollZoomToggler",
     "Search",
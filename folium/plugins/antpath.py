@@ -17,6 +17,8 @@ class AntPath(JSCSSMixin, BaseMultiLocation):
         Input text or visualization for object displayed when clicking.
     tooltip: str or folium.Tooltip, optional
         Display a text when hovering over the object.
+    simplify: float or dict, optional
+        Simplify the locations, see :class:`folium.vector_layers.PolyLine`.
     **kwargs:
         Polyline and AntPath options. See their Github page for the
         available parameters.
@@ -28,7 +30,7 @@ class AntPath(JSCSSMixin, BaseMultiLocation):
     _template = Template("""
         {% macro script(this, kwargs) %}
             {{ this.get_name() }} = L.polyline.antPath(
-              {{ this.locations|tojson }},
+              {{ this.locations|round_coordinates(this)|tojson }},
               {{ this.options|tojavascript }}
         ).addTo({{this._parent.get_name()}});
         {% endmacro %}
@@ -41,11 +43,12 @@ class AntPath(JSCSSMixin, BaseMultiLocation):
         )
     ]
 
-    def __init__(self, locations, popup=None, tooltip=None, **kwargs):
+    def __init__(self, locations, popup=None, tooltip=None, simplify=None, **kwargs):
         super().__init__(
             locations,
             popup=popup,
             tooltip=tooltip,
+            simplify=simplify,
         )
 
         self._name = "AntPath"
@@ -27,7 +27,7 @@ class BoatMarker(JSCSSMixin, Marker):
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.boatMarker(
-                {{ this.location|tojson }},
+                {{ this.location|round_coordinates(this)|tojson }},
                 {{ this.options|tojavascript }}
             ).addTo({{ this._parent.get_name() }});
             {% if this.wind_heading is not none -%}
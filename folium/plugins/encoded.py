@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 from folium.elements import JSCSSMixin
 from folium.features import MacroElement
 from folium.template import Template
-from folium.vector_layers import path_options
+from folium.vector_layers import _POLYLINE_ENCODED_JS, path_options
 
 
 class _BaseFromEncoded(JSCSSMixin, MacroElement, ABC):
@@ -32,12 +32,7 @@ class _BaseFromEncoded(JSCSSMixin, MacroElement, ABC):
         {% endmacro %}
         """)
 
-    default_js = [
-        (
-            "polyline-encoded",
-            "https://cdn.jsdelivr.net/npm/polyline-encoded@0.0.9/Polyline.encoded.js",
-        )
-    ]
+    default_js = [_POLYLINE_ENCODED_JS]
 
     def __init__(self, encoded: str):
         super().__init__()
@@ -1,6 +1,8 @@
+import numpy as np
+
 from folium.plugins.marker_cluster import MarkerCluster
 from folium.template import Template
-from folium.utilities import if_pandas_df_convert_to_numpy, validate_location
+from folium.utilities import pd, validate_locations_array
 
 
 class FastMarkerCluster(MarkerCluster):
@@ -15,15 +17,22 @@ class FastMarkerCluster(MarkerCluster):
     no reference to any marker data are retained. Methods such
     as get_bounds() are therefore not available when using it.
 
+    The data is stored column-wise and the markers are added to the
+    cluster in one go with `addLayers`, by default with chunked loading
+    so the page stays responsive while the markers load.
+
     Parameters
     ----------
-    data: list of list with values
+    data: list of list with values, array, DataFrame or dict of columns
         List of list of shape [[lat, lon], [lat, lon], etc.]
         When you use a custom callback you could add more values after the
         lat and lon. E.g. [[lat, lon, 'red'], [lat, lon, 'blue']]
+        The first two columns of a DataFrame or dict of columns are used as
+        lat and lon, the other columns are passed to the callback by name.
     callback: string, optional
         A string representation of a valid Javascript function
-        that will be passed each row in data. See the
+        that will be passed each row in data and an object with the
+        values after lat and lon by column name. See the
         FasterMarkerCluster for an example of a custom callback.
     name : string, optional
         The name of the Layer, as it will appear in LayerControls.
@@ -36,6 +45,9 @@ class FastMarkerCluster(MarkerCluster):
     icon_create_function : string, default None
         Override the default behaviour, making possible to customize
         markers colors and sizes.
+    chunked_loading : bool, default True
+        Split the addition of the markers in chunks, so the page doesn't
+        freeze while loading many markers.
     **kwargs
         Additional arguments are passed to Leaflet.markercluster options. See
         https://github.com/Leaflet/Leaflet.markercluster
@@ -47,20 +59,28 @@ class FastMarkerCluster(MarkerCluster):
             var {{ this.get_name() }} = (function(){
                 {{ this.callback }}
 
-                var data = {{ this.data|tojson }};
+                var data = {{ this.payload|tojson }};
                 var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
                 {%- if this.icon_create_function is not none %}
                 cluster.options.iconCreateFunction =
                     {{ this.icon_create_function.strip() }};
                 {%- endif %}
 
-                for (var i = 0; i < data.length; i++) {
-                    var row = data[i];
-                    var marker = callback(row);
-                    marker.addTo(cluster);
+                var names = data.names;
+                var markers = new Array(data.lat.length);
+                for (var i = 0; i < data.lat.length; i++) {
+                    var row = [data.lat[i], data.lng[i]];
+                    var props = {};
+                    for (var j = 0; j < names.length; j++) {
+                        var value = data.columns[j][i];
+                        row.push(value);
+                        props[names[j]] = value;
+                    }
+                    markers[i] = callback(row, props);
                 }
 
                 cluster.addTo({{ this._parent.get_name() }});
+                cluster.addLayers(markers);
                 return cluster;
             })();
         {% endmacro %}""")
@@ -75,6 +95,7 @@ class FastMarkerCluster(MarkerCluster):
         control=True,
         show=True,
         icon_create_function=None,
+        chunked_loading=True,
         **kwargs,
     ):
         if options is not None:
@@ -85,13 +106,11 @@ class FastMarkerCluster(MarkerCluster):
             control=control,
             show=show,
             icon_create_function=icon_create_function,
+            chunked_loading=chunked_loading,
             **kwargs,
         )
         self._name = "FastMarkerCluster"
-        data = if_pandas_df_convert_to_numpy(data)
-        self.data = [
-            [*validate_location(row[:2]), *row[2:]] for row in data  # noqa: E999
-        ]
+        self.data = data
 
         if callback is None:
             self.callback = """
@@ -103,3 +122,52 @@ class FastMarkerCluster(MarkerCluster):
                 };"""
         else:
             self.callback = f"var callback = {callback};"
+
+    @property
+    def data(self) -> list:
+        """The data as a list of rows of the form [lat, lon, *values]."""
+        rows = self.locations.tolist()
+        for column in self.columns.values():
+            for row, value in zip(rows, _to_list(column)):
+                row.append(value)
+        return rows
+
+    @data.setter
+    def data(self, data) -> None:
+        names, columns = _to_columns(data)
+        if len(columns) and len(columns[0]):
+            self.locations = validate_locations_array(np.stack(columns[:2], axis=1))
+        else:
+            self.locations = np.empty((0, 2))
+        self.columns = dict(zip(names[2:], columns[2:]))
+
+    @property
+    def payload(self) -> dict:
+        """The data column-wise, as it is passed to the template."""
+        return {
+            "lat": self.locations[:, 0].tolist(),
+            "lng": self.locations[:, 1].tolist(),
+            "names": list(self.columns),
+            "columns": [_to_list(column) for column in self.columns.values()],
+        }
+
+
+def _to_columns(data) -> tuple[list[str], list]:
+    """Split tabular data in a list of column names and a list of columns."""
+    if pd is not None and isinstance(data, pd.DataFrame):
+        return [str(name) for name in data.columns], [
+            data[name].to_numpy() for name in data.columns
+        ]
+    if isinstance(data, dict):
+        return [str(name) for name in data], list(data.values())
+    if isinstance(data, np.ndarray) and data.ndim == 2:
+        return [str(i) for i in range(data.shape[1])], list(data.T)
+    rows = [list(row) for row in data]
+    if len({len(row) for row in rows}) > 1:
+        raise ValueError("All rows of data should have the same number of values.")
+    columns = [list(column) for column in zip(*rows)]
+    return [str(i) for i in range(len(columns))], columns
+
+
+def _to_list(column) -> list:
+    return column.tolist() if isinstance(column, np.ndarray) else list(column)
@@ -0,0 +1,542 @@
+import base64
+from collections.abc import Sequence
+from typing import Optional, Union
+
+import numpy as np
+from branca.colormap import _parse_color
+
+from folium.elements import JSCSSMixin
+from folium.map import Layer
+from folium.template import Template
+from folium.utilities import (
+    if_pandas_df_convert_to_numpy,
+    remove_empty,
+    validate_locations_array,
+)
+
+TypeColor = Union[str, Sequence, np.ndarray]
+
+
+class _GlifyLayer(JSCSSMixin, Layer):
+    """Base class of the layers rendered with WebGL by Leaflet.glify.
+
+    The geometry and the optional colors and sizes are sent to the browser
+    as base64 encoded typed arrays. When WebGL is not available, the layer
+    falls back to regular Leaflet vector layers drawn on a canvas.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                function decode(data, type) {
+                    var bytes = atob(data);
+                    var buffer = new Uint8Array(bytes.length);
+                    for (var i = 0; i < bytes.length; i++) {
+                        buffer[i] = bytes.charCodeAt(i);
+                    }
+                    return new type(buffer.buffer);
+                }
+                function hasWebGL() {
+                    try {
+                        var canvas = document.createElement("canvas");
+                        return !!(
+                            window.WebGLRenderingContext
+                            && (canvas.getContext("webgl")
+                                || canvas.getContext("experimental-webgl"))
+                        );
+                    } catch (e) {
+                        return false;
+                    }
+                }
+
+                var payload = {{ this.payload|tojson }};
+                var coords = decode(payload.coords, Float64Array);
+                {%- if this.kind != "points" %}
+                var offsets = decode(payload.offsets, Uint32Array);
+                var n = offsets.length - 1;
+                {%- else %}
+                var n = coords.length / 2;
+                {%- endif %}
+                var colors = payload.colors && decode(payload.colors, Uint8Array);
+                var sizes = payload.sizes && decode(payload.sizes, Float32Array);
+                var popups = payload.popups;
+                var tooltips = payload.tooltips;
+
+                function color(i) {
+                    if (!colors) {
+                        return payload.color;
+                    }
+                    return {
+                        r: colors[4 * i] / 255,
+                        g: colors[4 * i + 1] / 255,
+                        b: colors[4 * i + 2] / 255,
+                        a: colors[4 * i + 3] / 255
+                    };
+                }
+                function size(i) {
+                    return sizes ? sizes[i] : payload.size;
+                }
+                function latLngs(i) {
+                    {%- if this.kind == "points" %}
+                    return [coords[2 * i], coords[2 * i + 1]];
+                    {%- else %}
+                    var out = [];
+                    for (var j = offsets[i]; j < offsets[i + 1]; j++) {
+                        out.push([coords[2 * j], coords[2 * j + 1]]);
+                    }
+                    return out;
+                    {%- endif %}
+                }
+                function center(e, i) {
+                    {%- if this.kind == "points" %}
+                    return latLngs(i);
+                    {%- else %}
+                    return e.latlng;
+                    {%- endif %}
+                }
+
+                // Index of the clicked or hovered item, as passed by glify.
+                function index(item) {
+                    {%- if this.kind == "points" %}
+                    return item[2];
+                    {%- else %}
+                    return item.properties.index;
+                    {%- endif %}
+                }
+                function data() {
+                    {%- if this.kind == "points" %}
+                    var points = new Array(n);
+                    for (var i = 0; i < n; i++) {
+                        points[i] = [coords[2 * i], coords[2 * i + 1], i];
+                    }
+                    return points;
+                    {%- else %}
+                    var features = new Array(n);
+                    for (var i = 0; i < n; i++) {
+                        var ring = latLngs(i).map(function(latLng) {
+                            return [latLng[1], latLng[0]];
+                        });
+                        features[i] = {
+                            type: "Feature",
+                            properties: {index: i},
+                            geometry: {
+                                {%- if this.kind == "lines" %}
+                                type: "LineString",
+                                coordinates: ring
+                                {%- else %}
+                                type: "Polygon",
+                                coordinates: [ring]
+                                {%- endif %}
+                            }
+                        };
+                    }
+                    return {type: "FeatureCollection", features: features};
+                    {%- endif %}
+                }
+
+                var layer = L.layerGroup();
+                var glLayer = null;
+                var tooltip = L.tooltip();
+
+                function createGlLayer(map) {
+                    var options = {{ this.options|tojavascript }};
+                    options.map = map;
+                    options.data = data();
+                    options.color = function(i) { return color(i); };
+                    {%- if this.kind == "points" %}
+                    options.latitudeKey = 0;
+                    options.longitudeKey = 1;
+                    options.size = function(i) { return size(i); };
+                    {%- else %}
+                    options.latitudeKey = 1;
+                    options.longitudeKey = 0;
+                    {%- endif %}
+                    {%- if this.kind == "lines" %}
+                    options.weight = function(i) { return size(i); };
+                    {%- endif %}
+                    if (popups) {
+                        options.click = function(e, item) {
+                            var i = index(item);
+                            L.popup().setLatLng(center(e, i))
+                                .setContent(popups[i]).openOn(map);
+                        };
+                    }
+                    if (tooltips) {
+                        options.hover = function(e, item) {
+                            var i = index(item);
+                            tooltip.setLatLng(center(e, i)).setContent(tooltips[i]);
+                            map.openTooltip(tooltip);
+                        };
+                        options.hoverOff = function() {
+                            map.closeTooltip(tooltip);
+                        };
+                    }
+                    return L.glify.{{ this.kind }}(options);
+                }
+
+                function createFallbackLayers() {
+                    var renderer = L.canvas();
+                    for (var i = 0; i < n; i++) {
+                        var c = color(i);
+                        var style = "rgb(" + [c.r, c.g, c.b].map(function(v) {
+                            return Math.round(v * 255);
+                        }).join(",") + ")";
+                        var opacity = (c.a === undefined ? 1 : c.a)
+                            * {{ this.opacity|tojson }};
+                        {%- if this.kind == "points" %}
+                        var item = L.circleMarker(latLngs(i), {
+                            renderer: renderer, stroke: false, radius: size(i) / 2,
+                            fillColor: style, fillOpacity: opacity
+                        });
+                        {%- elif this.kind == "lines" %}
+                        var item = L.polyline(latLngs(i), {
+                            renderer: renderer, color: style, weight: size(i),
+                            opacity: opacity
+                        });
+                        {%- else %}
+                        var item = L.polygon(latLngs(i), {
+                            renderer: renderer, stroke: false,
+                            fillColor: style, fillOpacity: opacity
+                        });
+                        {%- endif %}
+                        if (popups) {
+                            item.bindPopup(popups[i]);
+                        }
+                        if (tooltips) {
+                            item.bindTooltip(tooltips[i]);
+                        }
+                        layer.addLayer(item);
+                    }
+                }
+
+                layer.on("add", function() {
+                    if (layer.getLayers().length) {
+                        return;
+                    }
+                    if (window.L.glify && hasWebGL()) {
+                        try {
+                            glLayer = createGlLayer(layer._map);
+                            return;
+                        } catch (e) {
+                            console.warn("Leaflet.glify failed, using a canvas instead.", e);
+                        }
+                    }
+                    createFallbackLayers();
+                });
+                layer.on("remove", function() {
+                    if (glLayer) {
+                        glLayer.remove();
+                        glLayer = null;
+                    }
+                });
+                return layer;
+            })();
+        {% endmacro %}
+        """)
+
+    default_js = [
+        (
+            "leaflet.glify",
+            "https://cdn.jsdelivr.net/npm/leaflet.glify@3.2.0/dist/glify-browser.js",
+        )
+    ]
+
+    kind = ""
+
+    def __init__(
+        self,
+        coords: np.ndarray,
+        offsets: Optional[np.ndarray],
+        color: TypeColor,
+        size: Union[float, Sequence[float], np.ndarray],
+        opacity: float,
+        popups: Optional[Sequence[str]],
+        tooltips: Optional[Sequence[str]],
+        name: Optional[str],
+        overlay: bool,
+        control: bool,
+        show: bool,
+        **kwargs,
+    ):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self.coords = coords
+        self.offsets = offsets
+        n = len(coords) if offsets is None else len(offsets) - 1
+        self.colors = _to_rgba(color, n)
+        self.sizes = np.asarray(size, dtype=np.float32)
+        if self.sizes.ndim and len(self.sizes) != n:
+            raise ValueError(f"size should be a number or have length {n}.")
+        for values in (popups, tooltips):
+            if values is not None and len(values) != n:
+                raise ValueError(f"popups and tooltips should have length {n}.")
+        self.popups = None if popups is None else [str(v) for v in popups]
+        self.tooltips = None if tooltips is None else [str(v) for v in tooltips]
+        self.opacity = opacity
+        self.options = remove_empty(opacity=opacity, **kwargs)
+
+    @property
+    def payload(self) -> dict:
+        single_color = self.colors.ndim == 1
+        return {
+            "coords": _to_base64(self.coords, "<f8"),
+            "offsets": (
+                None if self.offsets is None else _to_base64(self.offsets, "<u4")
+            ),
+            "color": (
+                dict(zip("rgba", (self.colors / 255).tolist()))
+                if single_color
+                else None
+            ),
+            "colors": None if single_color else _to_base64(self.colors, "u1"),
+            "size": self.sizes.item() if not self.sizes.ndim else None,
+            "sizes": _to_base64(self.sizes, "<f4") if self.sizes.ndim else None,
+            "popups": self.popups,
+            "tooltips": self.tooltips,
+        }
+
+    def _get_self_bounds(self):
+        """
+        Computes the bounds of the object itself (not including it's children)
+        in the form [[lat_min, lon_min], [lat_max, lon_max]].
+
+        """
+        if not len(self.coords):
+            return [[None, None], [None, None]]
+        return [self.coords.min(axis=0).tolist(), self.coords.max(axis=0).tolist()]
+
+
+class GlifyPoints(_GlifyLayer):
+    """
+    Draw a large number of points with WebGL using Leaflet.glify.
+
+    Parameters
+    ----------
+    data: list of list or array of shape (n, 2)
+        Locations of the points in the form [[lat, lng]].
+    color: str or array, default '#3388ff'
+        Color of all points, or a color per point given as a list of color
+        strings or an array of shape (n, 3) or (n, 4) with values between
+        0 and 255 (integers) or 0 and 1 (floats).
+    size: float or array, default 10
+        Diameter of the points in pixels, for all points or per point.
+    opacity: float, default 0.8
+        Opacity of the points.
+    popups: list of str of length n, optional
+        Popup shown when clicking a point.
+    tooltips: list of str of length n, optional
+        Tooltip shown when hovering over a point.
+    name : string, default None
+        The name of the Layer, as it will appear in LayerControls.
+    overlay : bool, default True
+        Adds the layer as an optional overlay (True) or the base layer (False).
+    control : bool, default True
+        Whether the Layer will be included in LayerControls.
+    show: bool, default True
+        Whether the layer will be shown on opening.
+    **kwargs
+        Additional options for Leaflet.glify, see
+        https://github.com/robertleeplummerjr/Leaflet.glify
+
+    """
+
+    kind = "points"
+
+    def __init__(
+        self,
+        data,
+        color: TypeColor = "#3388ff",
+        size: Union[float, Sequence[float], np.ndarray] = 10,
+        opacity: float = 0.8,
+        popups: Optional[Sequence[str]] = None,
+        tooltips: Optional[Sequence[str]] = None,
+        name: Optional[str] = None,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+        **kwargs,
+    ):
+        super().__init__(
+            validate_locations_array(data),
+            None,
+            color=color,
+            size=size,
+            opacity=opacity,
+            popups=popups,
+            tooltips=tooltips,
+            name=name,
+            overlay=overlay,
+            control=control,
+            show=show,
+            **kwargs,
+        )
+        self._name = "GlifyPoints"
+
+
+class GlifyLines(_GlifyLayer):
+    """
+    Draw a large number of lines with WebGL using Leaflet.glify.
+
+    Parameters
+    ----------
+    data: list of lines
+        Each line is a list of locations or an array of shape (k, 2) in the
+        form [[lat, lng]].
+    color: str or array, default '#3388ff'
+        Color of all lines, or a color per line given as a list of color
+        strings or an array of shape (n, 3) or (n, 4) with values between
+        0 and 255 (integers) or 0 and 1 (floats).
+    weight: float or array, default 2
+        Width of the lines in pixels, for all lines or per line.
+    opacity: float, default 0.8
+        Opacity of the lines.
+    popups: list of str of length n, optional
+        Popup shown when clicking a line.
+    tooltips: list of str of length n, optional
+        Tooltip shown when hovering over a line.
+    name : string, default None
+        The name of the Layer, as it will appear in LayerControls.
+    overlay : bool, default True
+        Adds the layer as an optional overlay (True) or the base layer (False).
+    control : bool, default True
+        Whether the Layer will be included in LayerControls.
+    show: bool, default True
+        Whether the layer will be shown on opening.
+    **kwargs
+        Additional options for Leaflet.glify, see
+        https://github.com/robertleeplummerjr/Leaflet.glify
+
+    """
+
+    kind = "lines"
+
+    def __init__(
+        self,
+        data,
+        color: TypeColor = "#3388ff",
+        weight: Union[float, Sequence[float], np.ndarray] = 2,
+        opacity: float = 0.8,
+        popups: Optional[Sequence[str]] = None,
+        tooltips: Optional[Sequence[str]] = None,
+        name: Optional[str] = None,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+        **kwargs,
+    ):
+        super().__init__(
+            *_flatten(data),
+            color=color,
+            size=weight,
+            opacity=opacity,
+            popups=popups,
+            tooltips=tooltips,
+            name=name,
+            overlay=overlay,
+            control=control,
+            show=show,
+            **kwargs,
+        )
+        self._name = "GlifyLines"
+
+
+class GlifyShapes(_GlifyLayer):
+    """
+    Draw a large number of polygons with WebGL using Leaflet.glify.
+
+    Parameters
+    ----------
+    data: list of polygons
+        Each polygon is a list of locations or an array of shape (k, 2) in
+        the form [[lat, lng]], describing its exterior ring.
+    color: str or array, default '#3388ff'
+        Color of all polygons, or a color per polygon given as a list of
+        color strings or an array of shape (n, 3) or (n, 4) with values
+        between 0 and 255 (integers) or 0 and 1 (floats).
+    opacity: float, default 0.5
+        Opacity of the polygons.
+    border: bool, default False
+        Whether to draw the border of the polygons.
+    popups: list of str of length n, optional
+        Popup shown when clicking a polygon.
+    tooltips: list of str of length n, optional
+        Tooltip shown when hovering over a polygon.
+    name : string, default None
+        The name of the Layer, as it will appear in LayerControls.
+    overlay : bool, default True
+        Adds the layer as an optional overlay (True) or the base layer (False).
+    control : bool, default True
+        Whether the Layer will be included in LayerControls.
+    show: bool, default True
+        Whether the layer will be shown on opening.
+    **kwargs
+        Additional options for Leaflet.glify, see
+        https://github.com/robertleeplummerjr/Leaflet.glify
+
+    """
+
+    kind = "shapes"
+
+    def __init__(
+        self,
+        data,
+        color: TypeColor = "#3388ff",
+        opacity: float = 0.5,
+        border: bool = False,
+        popups: Optional[Sequence[str]] = None,
+        tooltips: Optional[Sequence[str]] = None,
+        name: Optional[str] = None,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+        **kwargs,
+    ):
+        super().__init__(
+            *_flatten(data),
+            color=color,
+            size=0,
+            opacity=opacity,
+            popups=popups,
+            tooltips=tooltips,
+            name=name,
+            overlay=overlay,
+            control=control,
+            show=show,
+            border=border,
+            **kwargs,
+        )
+        self._name = "GlifyShapes"
+
+
+def _flatten(data) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenate lines of locations, returning the locations and offsets."""
+    lines = [validate_locations_array(line) for line in data]
+    lengths = [len(line) for line in lines]
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.uint32)
+    coords = np.concatenate(lines) if lines else np.empty((0, 2))
+    return coords, offsets
+
+
+def _to_rgba(color: TypeColor, n: int) -> np.ndarray:
+    """Convert one color or n colors to uint8 RGBA values."""
+    if isinstance(color, str):
+        return np.round(np.array(_parse_color(color)) * 255).astype(np.uint8)
+    color = if_pandas_df_convert_to_numpy(color)
+    if len(color) != n:
+        raise ValueError(f"color should be a single color or have length {n}.")
+    array = np.asarray(color)
+    if array.dtype.kind in "US" or array.dtype == object:
+        unique, inverse = np.unique(array.astype(str), return_inverse=True)
+        return _to_rgba(
+            np.array([_parse_color(c) for c in unique]).reshape(-1, 4), len(unique)
+        )[inverse.ravel()]
+    if array.ndim != 2 or array.shape[1] not in (3, 4):
+        raise ValueError("color should have the shape (n, 3) or (n, 4).")
+    if array.dtype.kind == "f":
+        array = np.round(np.clip(array, 0, 1) * 255)
+    if array.shape[1] == 3:
+        array = np.concatenate([array, np.full((len(array), 1), 255)], axis=1)
+    return array.astype(np.uint8)
+
+
+def _to_base64(values: np.ndarray, dtype: str) -> str:
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype)).decode()
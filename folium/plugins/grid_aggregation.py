@@ -0,0 +1,362 @@
+from collections.abc import Sequence
+from typing import Optional, Union
+
+import numpy as np
+from branca.colormap import ColorMap, StepColormap
+from branca.element import Element, MacroElement
+from branca.utilities import color_brewer
+
+from folium.features import GeoJson
+from folium.folium import Map
+from folium.map import FeatureGroup
+from folium.template import Template
+from folium.utilities import deep_copy, if_pandas_df_convert_to_numpy
+
+_TILE_SIZE = 256
+_MAX_LATITUDE = 85.051128779806589
+
+
+class GridAggregation(FeatureGroup):
+    """
+    Aggregate points in hexagonal or square cells and color the cells.
+
+    The points are binned in NumPy on a Web Mercator grid with cells of
+    `cell_size` pixels at one or more zoom levels. Only the occupied cells
+    are sent to the browser, as GeoJson polygons with the aggregated value
+    in their ``value`` property. With several zoom levels, the cells of the
+    highest level not above the current zoom of the map are shown.
+
+    Like `Choropleth`, the values are colored with a branca `StepColormap`
+    built from a color brewer palette, or with a colormap you provide.
+
+    Parameters
+    ----------
+    data : list of points of the form [lat, lng] or [lat, lng, weight]
+        The points to aggregate.
+        You can also provide a numpy.array of shape (n,2) or (n,3).
+    shape : {'hexagon', 'square'}, default 'hexagon'
+        The shape of the cells.
+    cell_size : float, default 20
+        Size of the cells in pixels at the zoom level they are computed for.
+        For hexagons this is the distance from the center to a corner.
+    zoom_levels : int or list of int, default 8
+        The zoom level(s) to compute the cells for.
+    aggfunc : {'count', 'sum', 'mean'}, default 'count'
+        How the weights of the points in a cell are aggregated. Without
+        weights each point has a weight of one.
+    colormap : branca ColorMap, optional
+        Colormap used to color the values of all zoom levels. When not
+        given, a `StepColormap` is computed for each zoom level separately
+        with `bins` and `fill_color`.
+    bins : int or sequence of scalars, default 6
+        Passed to `numpy.histogram` to compute the steps of the colormap.
+    fill_color : str, default 'YlOrRd'
+        A color brewer palette name, see `branca.utilities.color_brewer`.
+    fill_opacity : float, default 0.6
+        Fill opacity of the cells.
+    line_color : str, default 'white'
+        Color of the cell borders.
+    line_weight : float, default 0
+        Width of the cell borders in pixels.
+    legend_name : str, default ''
+        Caption of the legend. The legend is only added when there is a
+        single colormap.
+    name : string, default None
+        The name of the Layer, as it will appear in LayerControls.
+    overlay : bool, default True
+        Adds the layer as an optional overlay (True) or the base layer (False).
+    control : bool, default True
+        Whether the Layer will be included in LayerControls.
+    show: bool, default True
+        Whether the layer will be shown on opening.
+    **kwargs
+        Additional arguments are passed to the GeoJson layers, for
+        example a `tooltip`.
+
+    Examples
+    --------
+    >>> GridAggregation(data, zoom_levels=range(4, 12)).add_to(m)
+    >>> GridAggregation(data, shape="square", aggfunc="mean").add_to(m)
+
+    """
+
+    def __init__(
+        self,
+        data,
+        shape: str = "hexagon",
+        cell_size: float = 20,
+        zoom_levels: Union[int, Sequence[int]] = 8,
+        aggfunc: str = "count",
+        colormap: Optional[ColorMap] = None,
+        bins: Union[int, Sequence[float]] = 6,
+        fill_color: str = "YlOrRd",
+        fill_opacity: float = 0.6,
+        line_color: str = "white",
+        line_weight: float = 0,
+        legend_name: str = "",
+        name: Optional[str] = None,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+        **kwargs,
+    ):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "GridAggregation"
+        data = np.asarray(if_pandas_df_convert_to_numpy(data), dtype=float)
+        if data.ndim != 2 or data.shape[1] not in (2, 3):
+            raise ValueError(
+                "data should have the shape (n, 2) or (n, 3), "
+                f"instead got {data.shape}."
+            )
+        if np.isnan(data).any():
+            raise ValueError("data may not contain NaNs.")
+        if shape not in ("hexagon", "square"):
+            raise ValueError(f"shape should be 'hexagon' or 'square', not {shape!r}.")
+        if aggfunc not in ("count", "sum", "mean"):
+            raise ValueError(
+                f"aggfunc should be 'count', 'sum' or 'mean', not {aggfunc!r}."
+            )
+        if not color_brewer(fill_color):
+            raise ValueError(
+                "Please pass a valid color brewer code to fill_color. "
+                "See docstring for valid codes."
+            )
+        self.data = data
+        if isinstance(zoom_levels, int):
+            zoom_levels = [zoom_levels]
+        zoom_levels = sorted(zoom_levels)
+
+        self.cells = {
+            zoom: aggregate(
+                data, zoom=zoom, cell_size=cell_size, shape=shape, aggfunc=aggfunc
+            )
+            for zoom in zoom_levels
+        }
+        if colormap is not None:
+            self.colormaps = {zoom: colormap for zoom in zoom_levels}
+        else:
+            self.colormaps = {
+                zoom: _step_colormap(values, bins, fill_color, legend_name)
+                for zoom, (_, values) in self.cells.items()
+            }
+        self.color_scale = (
+            colormap
+            if colormap is not None
+            else self.colormaps[zoom_levels[0]] if len(zoom_levels) == 1 else None
+        )
+
+        self.layers = {}
+        for zoom, (polygons, values) in self.cells.items():
+
+            def style_function(feature, colormap=self.colormaps[zoom]):
+                return {
+                    "fillColor": colormap(feature["properties"]["value"]),
+                    "fillOpacity": fill_opacity,
+                    "color": line_color,
+                    "weight": line_weight,
+                }
+
+            self.layers[zoom] = GeoJson(
+                _to_geojson(polygons, values),
+                style_function=style_function,
+                control=False,
+                show=len(zoom_levels) == 1,
+                # Elements like a tooltip can only belong to one layer.
+                **{
+                    key: deep_copy(value) if isinstance(value, Element) else value
+                    for key, value in kwargs.items()
+                },
+            )
+            self.add_child(self.layers[zoom])
+        if len(zoom_levels) > 1:
+            self.add_child(_ZoomSwitch())
+        if self.color_scale is not None:
+            self.add_child(self.color_scale)
+
+    def render(self, **kwargs):
+        """Render the GeoJson layers and the color scale."""
+        if self.color_scale is not None:
+            # ColorMap needs Map as its parent
+            assert isinstance(
+                self._parent, Map
+            ), "GridAggregation must be added to a Map object."
+            self.color_scale._parent = self._parent
+        super().render(**kwargs)
+
+
+class _ZoomSwitch(MacroElement):
+    """Show the layer of a GridAggregation matching the zoom of the map."""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            (function(){
+                var group = {{ this._parent.get_name() }};
+                var levels = [
+                    {%- for zoom, layer in this._parent.layers.items() %}
+                    [{{ zoom }}, {{ layer.get_name() }}],
+                    {%- endfor %}
+                ];
+                function update() {
+                    var zoom = group._map.getZoom();
+                    var current = levels[0][1];
+                    for (var i = 0; i < levels.length; i++) {
+                        if (levels[i][0] <= zoom) {
+                            current = levels[i][1];
+                        }
+                    }
+                    for (var i = 0; i < levels.length; i++) {
+                        if (levels[i][1] === current) {
+                            group.addLayer(levels[i][1]);
+                        } else {
+                            group.removeLayer(levels[i][1]);
+                        }
+                    }
+                }
+                group.on("add", function() {
+                    group._map.on("zoomend", update);
+                    update();
+                });
+                group.on("remove", function() {
+                    group._map.off("zoomend", update);
+                });
+            })();
+        {% endmacro %}
+    """)
+
+
+def aggregate(
+    data: np.ndarray,
+    zoom: int,
+    cell_size: float = 20,
+    shape: str = "hexagon",
+    aggfunc: str = "count",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Aggregate points in the cells of a Web Mercator grid.
+
+    Parameters
+    ----------
+    data : array of shape (n, 2) or (n, 3)
+        Points of the form [lat, lng] or [lat, lng, weight].
+    zoom : int
+        Zoom level at which the cells have a size of `cell_size` pixels.
+    cell_size : float, default 20
+        Size of the cells in pixels.
+    shape : {'hexagon', 'square'}, default 'hexagon'
+        The shape of the cells.
+    aggfunc : {'count', 'sum', 'mean'}, default 'count'
+        How the weights of the points in a cell are aggregated.
+
+    Returns
+    -------
+    The corners of the occupied cells as an array of shape (k, corners, 2)
+    in the form [lat, lng], and the aggregated value of each cell.
+    """
+    scale = _TILE_SIZE * 2**zoom
+    lat = np.radians(np.clip(data[:, 0], -_MAX_LATITUDE, _MAX_LATITUDE))
+    x = (data[:, 1] + 180.0) / 360.0 * scale
+    y = (1.0 - np.arcsinh(np.tan(lat)) / np.pi) / 2.0 * scale
+    weights = data[:, 2] if data.shape[1] == 3 else np.ones(len(data))
+
+    if shape == "hexagon":
+        col, row = _hexbin(x, y, cell_size)
+    else:
+        col, row = np.floor(x / cell_size), np.floor(y / cell_size)
+    col, row = col.astype(np.int64), row.astype(np.int64)
+    col_min, row_min = col.min(initial=0), row.min(initial=0)
+    width = col.max(initial=0) - col_min + 1
+    keys = (row - row_min) * width + (col - col_min)
+    n_keys = int(keys.max(initial=-1)) + 1
+    if n_keys <= 4 * len(keys) + 1024:
+        # Counting is much faster than sorting when the grid is small enough.
+        occupied = np.flatnonzero(np.bincount(keys, minlength=n_keys))
+        lookup = np.empty(n_keys, dtype=np.int64)
+        lookup[occupied] = np.arange(len(occupied))
+        inverse = lookup[keys]
+    else:
+        occupied, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.ravel()
+    row, col = occupied // width + row_min, occupied % width + col_min
+
+    if aggfunc == "count":
+        values = np.bincount(inverse).astype(float)
+    else:
+        values = np.bincount(inverse, weights=weights)
+        if aggfunc == "mean":
+            values = values / np.bincount(inverse)
+
+    if shape == "hexagon":
+        dx, dy = cell_size * np.sqrt(3), cell_size * 1.5
+        center_x = (col + (row & 1) / 2) * dx
+        center_y = row * dy
+        angles = np.pi / 6 + np.arange(6) * np.pi / 3
+        corner_x = center_x[:, None] + cell_size * np.cos(angles)
+        corner_y = center_y[:, None] + cell_size * np.sin(angles)
+    else:
+        corner_x = (col[:, None] + np.array([0, 1, 1, 0])) * cell_size
+        corner_y = (row[:, None] + np.array([0, 0, 1, 1])) * cell_size
+
+    corner_lng = corner_x / scale * 360.0 - 180.0
+    corner_lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * corner_y / scale))))
+    return np.stack([corner_lat, corner_lng], axis=-1), values
+
+
+def _hexbin(
+    x: np.ndarray, y: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the column and row of the pointy-top hexagon containing each point.
+
+    This follows the algorithm of d3-hexbin, vectorized: a point is in the
+    hexagon of the nearest center of two offset rectangular grids. Unlike
+    d3-hexbin the distances are compared in pixels, so points close to the
+    border of two hexagons are not assigned to the wrong one.
+    """
+    dx, dy = radius * np.sqrt(3), radius * 1.5
+    py = y / dy
+    row = np.round(py)
+    odd = row.astype(np.int64) & 1
+    px = x / dx - odd / 2
+    col = np.round(px)
+    py1 = py - row
+
+    # Near the top or bottom of a row the point may be in a neighbor row.
+    col2 = col + np.where(px < col, -1, 1) / 2
+    row2 = row + np.where(py < row, -1, 1)
+    px1 = px - col
+    px2, py2 = px - col2, py - row2
+    neighbor = (np.abs(py1) * 3 > 1) & (
+        (px1 * dx) ** 2 + (py1 * dy) ** 2 > (px2 * dx) ** 2 + (py2 * dy) ** 2
+    )
+    col = np.where(neighbor, col2 + np.where(odd, 1, -1) / 2, col)
+    row = np.where(neighbor, row2, row)
+    return col, row
+
+
+def _step_colormap(
+    values: np.ndarray,
+    bins: Union[int, Sequence[float]],
+    fill_color: str,
+    caption: str,
+) -> StepColormap:
+    _, bin_edges = np.histogram(values, bins=bins)
+    return StepColormap(
+        color_brewer(fill_color, n=len(bin_edges) - 1),
+        index=list(bin_edges),
+        vmin=bin_edges[0],
+        vmax=bin_edges[-1],
+        caption=caption,
+    )
+
+
+def _to_geojson(polygons: np.ndarray, values: np.ndarray) -> dict:
+    rings = np.concatenate([polygons, polygons[:, :1]], axis=1)[..., ::-1]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+                "properties": {"value": value},
+            }
+            for ring, value in zip(rings.tolist(), values.tolist())
+        ],
+    }
@@ -2,14 +2,17 @@ import warnings
 
 import numpy as np
 
-from folium.elements import JSCSSMixin
+from folium.elements import Inflate, JSCSSMixin
 from folium.map import Layer
 from folium.template import Template
 from folium.utilities import (
+    compress_json,
+    get_coordinate_precision,
     if_pandas_df_convert_to_numpy,
     none_max,
     none_min,
     remove_empty,
+    round_coordinates,
     validate_location,
 )
 
@@ -43,14 +46,30 @@ class HeatMap(JSCSSMixin, Layer):
         Whether the Layer will be included in LayerControls.
     show: bool, default True
         Whether the layer will be shown on opening.
+    coordinate_precision: int, optional
+        Number of decimals of the coordinates in the output, the weights are
+        not rounded. Overrides the setting of the map.
+    compress: bool or int, default False
+        Embed the data compressed with deflate and base64 encoded, which is
+        inflated in the browser. If True, data of at least 10 kB is
+        compressed; pass an int to set this threshold in bytes.
     """
 
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.heatLayer(
-                {{ this.data|tojson }},
+                {%- if this.compressed %}
+                [],
+                {%- else %}
+                {{ this.data|round_coordinates(this, 2)|tojson }},
+                {%- endif %}
                 {{ this.options|tojavascript }}
             );
+            {%- if this.compressed %}
+            foliumInflate({{ this.compressed|tojson }}).then(function(data) {
+                {{ this.get_name() }}.setLatLngs(data);
+            });
+            {%- endif %}
         {% endmacro %}
         """)
 
@@ -73,10 +92,19 @@ class HeatMap(JSCSSMixin, Layer):
         overlay=True,
         control=True,
         show=True,
+        coordinate_precision=None,
+        compress=False,
         **kwargs,
     ):
-        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        super().__init__(
+            name=name,
+            overlay=overlay,
+            control=control,
+            show=show,
+            coordinate_precision=coordinate_precision,
+        )
         self._name = "HeatMap"
+        self.compress = compress
         data = if_pandas_df_convert_to_numpy(data)
         self.data = [
             [*validate_location(line[:2]), *[float(w) for w in line[2:]]]
@@ -99,6 +127,17 @@ class HeatMap(JSCSSMixin, Layer):
             **kwargs,
         )
 
+    def render(self, **kwargs):
+        self.compressed = None
+        if self.compress:
+            precision = get_coordinate_precision(self)
+            self.compressed = compress_json(
+                round_coordinates(self.data, precision, columns=2), self.compress
+            )
+            if self.compressed is not None:
+                self.add_child(Inflate(), name="inflate")
+        super().render(**kwargs)
+
     def _get_self_bounds(self):
         """
         Computes the bounds of the object itself (not including it's children)
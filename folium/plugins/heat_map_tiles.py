@@ -0,0 +1,414 @@
+import hashlib
+import math
+import os
+import shutil
+import struct
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+from branca.colormap import _parse_color
+
+from folium.map import FeatureGroup
+from folium.plugins.heat_map import HeatMap
+from folium.raster_layers import TileLayer
+from folium.utilities import if_pandas_df_convert_to_numpy
+
+_DEFAULT_GRADIENT = {0.4: "blue", 0.6: "cyan", 0.7: "lime", 0.8: "yellow", 1: "red"}
+
+_TILE_SIZE = 256
+_MAX_LATITUDE = 85.051128779806589
+
+
+class HeatMapTiles(FeatureGroup):
+    """
+    Create a heatmap layer from a pyramid of PNG tiles rendered in Python.
+
+    `HeatMap` sends every point to the browser, which redraws the whole
+    canvas on every pan and zoom. For very large point sets this class
+    instead computes the heat per zoom level with NumPy and writes the
+    result as local ``{z}/{x}/{y}.png`` tiles that are displayed with a
+    `TileLayer`. When the number of points is below `threshold` a regular
+    client-side `HeatMap` is used instead.
+
+    The tiles are written to disk whenever the map is rendered, also when it
+    is shown in a notebook, so `tiles_dir` has to be given explicitly when
+    there are at least `threshold` points. The tiles go to a subdirectory of
+    `tiles_dir` named after a hash of the data and the options. Tiles of
+    other data in the same `tiles_dir` are therefore never shown, and
+    rendering the same heatmap again does not write the tiles again.
+
+    Like `HeatMap`, points are aggregated in cells of half the kernel size,
+    `min_opacity` is the lowest intensity of a cell and `gradient` maps
+    intensities to colors. Unlike `HeatMap`, which scales the weights by
+    the distance of the zoom level to `max_zoom`, the intensities of each
+    zoom level are normalized by the cell with the largest weight at that
+    zoom level, so every zoom level uses the whole gradient.
+
+    Parameters
+    ----------
+    data : list of points of the form [lat, lng] or [lat, lng, weight]
+        The points you want to plot.
+        You can also provide a numpy.array of shape (n,2) or (n,3).
+    tiles_dir : str, optional
+        Directory in which the tile pyramid is written when the map is
+        rendered. Required when there are at least `threshold` points.
+    tiles_url : str, optional
+        Url of `tiles_dir` as seen from the saved map. Defaults to `tiles_dir`,
+        which works when the map is saved next to the tiles directory.
+    threshold : int, default 100000
+        Below this number of points a client-side `HeatMap` is used.
+    min_tile_zoom : int, default 0
+        Lowest zoom level for which tiles are rendered.
+    max_tile_zoom : int, default 12
+        Highest zoom level for which tiles are rendered. Tiles of this zoom
+        level are scaled up when zooming in further.
+    name : string, default None
+        The name of the Layer, as it will appear in LayerControls.
+    min_opacity : default 0.5
+        The minimum opacity the heat will start at.
+    max_zoom : default 18
+        Only used by the client-side `HeatMap` fallback.
+    radius : int, default 25
+        Radius of each "point" of the heatmap
+    blur : int, default 15
+        Amount of blur
+    gradient : dict, default None
+        Color gradient config. Defaults to
+        {.4: "blue", .6: "cyan", .7: "lime", .8: "yellow", 1: "red"}
+    attr : str, default 'folium'
+        Attribution of the tile layer.
+    max_workers : int, optional
+        Number of threads used to render the tiles of a zoom level.
+    overlay : bool, default True
+        Adds the layer as an optional overlay (True) or the base layer (False).
+    control : bool, default True
+        Whether the Layer will be included in LayerControls.
+    show: bool, default True
+        Whether the layer will be shown on opening.
+    **kwargs
+        Additional options for the `HeatMap` fallback.
+
+    Examples
+    --------
+    >>> HeatMapTiles(data, tiles_dir="output/heat").add_to(m)
+    >>> m.save("output/map.html")
+
+    """
+
+    def __init__(
+        self,
+        data,
+        tiles_dir: Optional[str] = None,
+        tiles_url: Optional[str] = None,
+        threshold: int = 100_000,
+        min_tile_zoom: int = 0,
+        max_tile_zoom: int = 12,
+        name: Optional[str] = None,
+        min_opacity: float = 0.5,
+        max_zoom: int = 18,
+        radius: int = 25,
+        blur: int = 15,
+        gradient: Optional[dict] = None,
+        attr: str = "folium",
+        max_workers: Optional[int] = None,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+        **kwargs,
+    ):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "HeatMapTiles"
+        data = np.asarray(if_pandas_df_convert_to_numpy(data), dtype=float)
+        if data.ndim != 2 or data.shape[1] not in (2, 3):
+            raise ValueError(
+                "data should have the shape (n, 2) or (n, 3), "
+                f"instead got {data.shape}."
+            )
+        if np.isnan(data).any():
+            raise ValueError("data may not contain NaNs.")
+        if tiles_dir is None and len(data) >= threshold:
+            raise ValueError(
+                f"Pass tiles_dir to write the tiles of {len(data)} points to, "
+                "or raise threshold above it to use a client-side HeatMap."
+            )
+        self.data = data
+        self.tiles_dir = tiles_dir
+        self.min_tile_zoom = min_tile_zoom
+        self.max_tile_zoom = max_tile_zoom
+        self.min_opacity = min_opacity
+        self.radius = radius
+        self.blur = blur
+        self.gradient = gradient or _DEFAULT_GRADIENT
+        self.max_workers = max_workers
+
+        if len(data) < threshold:
+            self.layer = HeatMap(
+                data,
+                min_opacity=min_opacity,
+                max_zoom=max_zoom,
+                radius=radius,
+                blur=blur,
+                gradient=gradient,
+                control=False,
+                **kwargs,
+            )
+        else:
+            url = (tiles_url or tiles_dir).replace(os.sep, "/").rstrip("/")
+            self.layer = TileLayer(
+                tiles=f"{url}/{self.version}/{{z}}/{{x}}/{{y}}.png",
+                attr=attr,
+                min_zoom=min_tile_zoom,
+                max_native_zoom=max_tile_zoom,
+                max_zoom=max(max_zoom, max_tile_zoom),
+                overlay=True,
+                control=False,
+            )
+        self.add_child(self.layer)
+
+    @property
+    def version(self) -> str:
+        """Name of the subdirectory of `tiles_dir` that holds the tiles."""
+        options = (
+            self.min_tile_zoom,
+            self.max_tile_zoom,
+            self.min_opacity,
+            self.radius,
+            self.blur,
+            sorted((float(key), str(color)) for key, color in self.gradient.items()),
+        )
+        digest = hashlib.sha256(repr(options).encode())
+        digest.update(self.data.tobytes())
+        return digest.hexdigest()[:12]
+
+    def render(self, **kwargs):
+        if isinstance(self.layer, TileLayer):
+            self.write_tiles()
+        super().render(**kwargs)
+
+    def write_tiles(self) -> None:
+        """Render the tile pyramid of all zoom levels to `tiles_dir`.
+
+        Nothing is written if the tiles of this version already exist.
+        """
+        path = os.path.join(self.tiles_dir, self.version)
+        if os.path.isdir(path):
+            return
+        # Write to a temporary directory first, so that a version directory
+        # never holds a partial pyramid.
+        root = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        os.makedirs(root)
+        try:
+            self._write_pyramid(root)
+            os.replace(root, path)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    def _write_pyramid(self, root: str) -> None:
+        palette = _gradient_palette(self.gradient)
+        # Same kernel size and cell size as leaflet-heat.
+        kernel_radius = self.radius + self.blur
+        sigma = (self.radius + self.blur / 2) / 2
+        kernel = _gaussian_kernel(sigma)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for zoom in range(self.min_tile_zoom, self.max_tile_zoom + 1):
+                tiles = _heat_cells_per_tile(
+                    self.data,
+                    zoom,
+                    cell_size=kernel_radius / 2,
+                    pad=len(kernel) // 2,
+                    min_opacity=self.min_opacity,
+                )
+                list(
+                    executor.map(
+                        lambda tile: self._write_tile(
+                            root, zoom, *tile, kernel, palette
+                        ),
+                        tiles,
+                    )
+                )
+
+    def _write_tile(
+        self,
+        root: str,
+        zoom: int,
+        x: int,
+        y: int,
+        local: np.ndarray,
+        alpha: np.ndarray,
+        kernel: np.ndarray,
+        palette: np.ndarray,
+    ) -> None:
+        pad = len(kernel) // 2
+        size = _TILE_SIZE + 2 * pad
+        grid = np.bincount(
+            local[:, 1] * size + local[:, 0], weights=alpha, minlength=size * size
+        ).reshape(size, size)
+        heat = np.clip(_separable_blur(grid, kernel), 0, 1)
+        if not heat.any():
+            return
+        rgba = palette[(heat * 255).astype(np.uint8)]
+        rgba[..., 3] = (heat * 255).astype(np.uint8)
+        path = os.path.join(root, str(zoom), str(x))
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, f"{y}.png"), "wb") as f:
+            f.write(_encode_png(rgba))
+
+    def _get_self_bounds(self):
+        """
+        Computes the bounds of the object itself (not including it's children)
+        in the form [[lat_min, lon_min], [lat_max, lon_max]].
+
+        """
+        if not len(self.data):
+            return [[None, None], [None, None]]
+        return [
+            self.data[:, :2].min(axis=0).tolist(),
+            self.data[:, :2].max(axis=0).tolist(),
+        ]
+
+
+def _project(data: np.ndarray, zoom: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the Web Mercator pixel coordinates of lat/lon pairs at `zoom`."""
+    scale = _TILE_SIZE * 2**zoom
+    lat = np.radians(np.clip(data[:, 0], -_MAX_LATITUDE, _MAX_LATITUDE))
+    x = (data[:, 1] + 180.0) / 360.0 * scale
+    y = (1.0 - np.arcsinh(np.tan(lat)) / np.pi) / 2.0 * scale
+    return x, y
+
+
+def _heat_cells_per_tile(
+    data: np.ndarray,
+    zoom: int,
+    cell_size: float,
+    pad: int,
+    min_opacity: float,
+) -> list[tuple[int, int, np.ndarray, np.ndarray]]:
+    """Aggregate points in cells and group the cells per tile they touch.
+
+    Returns a list of ``(x, y, local, alpha)`` tuples with the tile indices,
+    the pixel position of each cell within the padded tile and its opacity.
+    """
+    x, y = _project(data, zoom)
+    weights = data[:, 2] if data.shape[1] == 3 else np.ones(len(data))
+
+    # Weighted centroid and total weight of each cell, like leaflet-heat.
+    n_cells = int(math.ceil(_TILE_SIZE * 2**zoom / cell_size)) + 1
+    cells = (x // cell_size).astype(np.int64) * n_cells + (y // cell_size).astype(
+        np.int64
+    )
+    _, inverse = np.unique(cells, return_inverse=True)
+    total = np.bincount(inverse, weights=weights)
+    nonzero = total != 0
+    safe_total = np.where(nonzero, total, 1)
+    px = np.round(np.bincount(inverse, weights=weights * x) / safe_total)
+    py = np.round(np.bincount(inverse, weights=weights * y) / safe_total)
+    px = px[nonzero].astype(np.int64)
+    py = py[nonzero].astype(np.int64)
+    total = total[nonzero]
+    if not len(total):
+        return []
+    alpha = np.clip(total / total.max(), min_opacity, 1)
+
+    # A cell contributes to every tile within `pad` pixels.
+    n_tiles = 2**zoom
+    reach = pad // _TILE_SIZE + 1
+    tile_x, tile_y, cell_ids = [], [], []
+    for dx in range(-reach, reach + 1):
+        for dy in range(-reach, reach + 1):
+            tx = px // _TILE_SIZE + dx
+            ty = py // _TILE_SIZE + dy
+            mask = (
+                (tx >= 0)
+                & (tx < n_tiles)
+                & (ty >= 0)
+                & (ty < n_tiles)
+                & (px >= tx * _TILE_SIZE - pad)
+                & (px < (tx + 1) * _TILE_SIZE + pad)
+                & (py >= ty * _TILE_SIZE - pad)
+                & (py < (ty + 1) * _TILE_SIZE + pad)
+            )
+            tile_x.append(tx[mask])
+            tile_y.append(ty[mask])
+            cell_ids.append(np.nonzero(mask)[0])
+    tx, ty, ids = (np.concatenate(a) for a in (tile_x, tile_y, cell_ids))
+
+    order = np.argsort(tx * n_tiles + ty, kind="stable")
+    tx, ty, ids = tx[order], ty[order], ids[order]
+    keys = tx * n_tiles + ty
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    out = []
+    for start, end in zip(starts, np.r_[starts[1:], len(keys)]):
+        i, j = int(tx[start]), int(ty[start])
+        sel = ids[start:end]
+        local = np.stack(
+            [px[sel] - i * _TILE_SIZE + pad, py[sel] - j * _TILE_SIZE + pad], axis=1
+        )
+        out.append((i, j, local, alpha[sel]))
+    return out
+
+
+def _gaussian_kernel(sigma: float) -> np.ndarray:
+    """Return a 1D Gaussian kernel with a peak value of one."""
+    half = int(math.ceil(3 * sigma))
+    offsets = np.arange(-half, half + 1)
+    return np.exp(-(offsets**2) / (2 * sigma**2))
+
+
+def _separable_blur(grid: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Convolve a padded grid with `kernel` along both axes.
+
+    Each 1D pass is a product with a banded matrix, so the work is done
+    by BLAS. The output only contains the pixels that are fully covered
+    by the kernel, so the padding is cropped off.
+    """
+    n = grid.shape[0] - len(kernel) + 1
+    band = np.zeros((n, grid.shape[0]))
+    rows = np.arange(n)[:, None]
+    band[rows, rows + np.arange(len(kernel))] = kernel
+    return band @ grid @ band.T
+
+
+def _gradient_palette(gradient: dict) -> np.ndarray:
+    """Return a 256 x 4 uint8 array interpolating the gradient color stops."""
+    stops = sorted((float(key), _parse_color(color)) for key, color in gradient.items())
+    positions = np.array([stop for stop, _ in stops])
+    colors = np.array([color for _, color in stops])
+    x = np.linspace(0, 1, 256)
+    palette = np.stack(
+        [np.interp(x, positions, colors[:, channel]) for channel in range(4)], axis=1
+    )
+    return (palette * 255).round().astype(np.uint8)
+
+
+def _encode_png(rgba: np.ndarray) -> bytes:
+    """Encode an RGBA uint8 image as PNG.
+
+    Unlike `branca.utilities.write_png` this uses the default zlib
+    compression level, which is several times faster on heatmap tiles
+    for a nearly identical file size.
+    """
+    height, width = rgba.shape[:2]
+    raw = np.concatenate(
+        [np.zeros((height, 1), dtype=np.uint8), rgba.reshape(height, width * 4)],
+        axis=1,
+    ).tobytes()
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack("!I", len(data))
+            + tag
+            + data
+            + struct.pack("!I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack("!2I5B", width, height, 8, 6, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(raw)),
+            chunk(b"IEND", b""),
+        ]
+    )
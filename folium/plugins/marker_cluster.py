@@ -1,7 +1,15 @@
+import json
+
+from branca.element import MacroElement
+
 from folium.elements import JSCSSMixin
-from folium.map import Layer, Marker
+from folium.map import Icon, Layer, Marker, Popup
 from folium.template import Template
-from folium.utilities import remove_empty, validate_locations
+from folium.utilities import (
+    remove_empty,
+    validate_locations,
+    validate_locations_array,
+)
 
 
 class MarkerCluster(JSCSSMixin, Layer):
@@ -16,6 +24,10 @@ class MarkerCluster(JSCSSMixin, Layer):
         Popup for each marker, either a Popup object or a string or None.
     icons: list of length n, default None
         Icon for each marker, either an Icon object or a string or None.
+
+        When all popups are strings and all icons are `Icon` objects, the
+        markers are stored column-wise and created in a single loop in the
+        browser, with identical popups and icons shared between markers.
     name : string, default None
         The name of the Layer, as it will appear in LayerControls
     overlay : bool, default True
@@ -91,7 +103,13 @@ class MarkerCluster(JSCSSMixin, Layer):
         super().__init__(name=name, overlay=overlay, control=control, show=show)
         self._name = "MarkerCluster"
 
-        if locations is not None:
+        if locations is not None and _is_homogeneous(popups, icons):
+            markers = _CompactMarkers(locations, popups=popups, icons=icons)
+            # The shared icons are created before the markers using them.
+            for icon in markers.icons:
+                self.add_child(icon)
+            self.add_child(markers)
+        elif locations is not None:
             locations = validate_locations(locations)
             for i, location in enumerate(locations):
                 self.add_child(
@@ -104,3 +122,107 @@ class MarkerCluster(JSCSSMixin, Layer):
         if icon_create_function is not None:
             assert isinstance(icon_create_function, str)
         self.icon_create_function = icon_create_function
+
+
+class _CompactMarkers(MacroElement):
+    """Markers of a MarkerCluster stored as columns of values.
+
+    The icons in `icons` are shared by the markers and should be added to the
+    map before this element.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            (function(){
+                var data = {{ this.payload|tojson }};
+                {%- if this.icons %}
+                var icons = [
+                    {%- for icon in this.icons %}
+                    {{ icon.get_name() }},
+                    {%- endfor %}
+                ];
+                {%- endif %}
+                var markers = new Array(data.lat.length);
+                for (var i = 0; i < data.lat.length; i++) {
+                    var marker = L.marker([data.lat[i], data.lng[i]]);
+                    {%- if this.icons %}
+                    if (data.icon[i] !== null) {
+                        marker.setIcon(icons[data.icon[i]]);
+                    }
+                    {%- endif %}
+                    {%- if this.popups %}
+                    if (data.popup[i] !== null) {
+                        marker.bindPopup(data.popups[data.popup[i]], {"maxWidth": "100%"});
+                    }
+                    {%- endif %}
+                    markers[i] = marker;
+                }
+                {{ this._parent.get_name() }}.addLayers(markers);
+            })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, locations, popups=None, icons=None):
+        super().__init__()
+        self._name = "CompactMarkers"
+        self.locations = validate_locations_array(locations)
+        for values in (popups, icons):
+            if values is not None and len(values) != len(self.locations):
+                raise ValueError(
+                    "popups and icons should have the same length as locations."
+                )
+        self.popups = {}
+        self.popup_index = None
+        if popups is not None:
+            self.popup_index = [
+                (
+                    None
+                    if popup is None
+                    else self.popups.setdefault(
+                        '<div style="width: 100.0%; height: 100.0%;">' f"{popup}</div>",
+                        len(self.popups),
+                    )
+                )
+                for popup in popups
+            ]
+        self.icons = []
+        self.icon_index = None
+        if icons is not None:
+            unique_icons = {}
+            self.icon_index = []
+            for icon in icons:
+                if icon is None:
+                    self.icon_index.append(None)
+                    continue
+                key = (icon.color, json.dumps(icon.options, sort_keys=True))
+                if key not in unique_icons:
+                    unique_icons[key] = len(self.icons)
+                    self.icons.append(icon)
+                self.icon_index.append(unique_icons[key])
+
+    @property
+    def payload(self) -> dict:
+        return {
+            "lat": self.locations[:, 0].tolist(),
+            "lng": self.locations[:, 1].tolist(),
+            "popup": self.popup_index,
+            "popups": list(self.popups),
+            "icon": self.icon_index,
+        }
+
+    def _get_self_bounds(self):
+        return [
+            self.locations.min(axis=0).tolist(),
+            self.locations.max(axis=0).tolist(),
+        ]
+
+
+def _is_homogeneous(popups, icons) -> bool:
+    """Whether the markers of a MarkerCluster can be stored column-wise."""
+    return all(
+        popup is None or not isinstance(popup, (Popup, MacroElement))
+        for popup in (popups if popups is not None else [])
+    ) and all(
+        icon is None or type(icon) is Icon
+        for icon in (icons if icons is not None else [])
+    )
@@ -0,0 +1,271 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from folium.elements import JSCSSMixin
+from folium.map import Layer
+from folium.template import Template
+from folium.utilities import if_pandas_df_convert_to_numpy
+
+_MAX_LATITUDE = 85.051128779806589
+
+
+class PrecomputedMarkerCluster(JSCSSMixin, Layer):
+    """
+    Add marker clusters that are computed in Python for every zoom level.
+
+    `MarkerCluster` and `FastMarkerCluster` let Leaflet.markercluster build
+    its cluster tree in the browser when the page loads, which gets slow for
+    very large numbers of points. This class builds the cluster hierarchy
+    with NumPy instead and only ships a table of clusters per zoom level.
+    The browser shows the clusters of the current zoom level that are in
+    view and zooms in when clicking a cluster, without an indexing step.
+
+    Points are clustered on a grid with cells of `radius` pixels, starting
+    from `max_zoom` and merging the clusters of each zoom level into the
+    next lower one. Above `max_zoom` the individual points are shown.
+
+    Parameters
+    ----------
+    data: list of list or array of shape (n, 2)
+        Data points of the form [[lat, lng]].
+    popups: list of str of length n, optional
+        Popup text of each point.
+    radius: int, default 80
+        Size in pixels of the grid cells that are merged into a cluster.
+    min_zoom: int, default 0
+        Lowest zoom level for which clusters are computed.
+    max_zoom: int, default 16
+        Highest zoom level for which clusters are computed.
+    name : string, default None
+        The name of the Layer, as it will appear in LayerControls.
+    overlay : bool, default True
+        Adds the layer as an optional overlay (True) or the base layer (False).
+    control : bool, default True
+        Whether the Layer will be included in LayerControls.
+    show: bool, default True
+        Whether the layer will be shown on opening.
+    icon_create_function : string, default None
+        Javascript function that receives the number of points of a
+        cluster and returns its icon.
+
+    Example
+    -------
+    >>> icon_create_function = '''
+    ...     function(count) {
+    ...     return L.divIcon({html: '<b>' + count + '</b>',
+    ...                       className: 'marker-cluster marker-cluster-small',
+    ...                       iconSize: new L.Point(20, 20)});
+    ...     }
+    ... '''
+
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var points = {{ this.points|tojson }};
+                var clusters = {{ this.clusters|tojson }};
+                var layer = L.layerGroup();
+
+                {%- if this.icon_create_function is not none %}
+                var iconCreateFunction = {{ this.icon_create_function.strip() }};
+                {%- else %}
+                var iconCreateFunction = function(count) {
+                    var size = count < 10 ? "small" : count < 100 ? "medium" : "large";
+                    return L.divIcon({
+                        html: "<div><span>" + count + "</span></div>",
+                        className: "marker-cluster marker-cluster-" + size,
+                        iconSize: new L.Point(40, 40)
+                    });
+                };
+                {%- endif %}
+
+                function addPoint(i) {
+                    var marker = L.marker([points.lat[i], points.lng[i]]);
+                    if (points.popup) {
+                        marker.bindPopup(points.popup[i]);
+                    }
+                    layer.addLayer(marker);
+                }
+
+                function addCluster(i) {
+                    var latlng = [clusters.lat[i], clusters.lng[i]];
+                    var marker = L.marker(latlng, {
+                        icon: iconCreateFunction(clusters.count[i])
+                    });
+                    marker.on("click", function() {
+                        layer._map.setView(latlng, clusters.expansion[i]);
+                    });
+                    layer.addLayer(marker);
+                }
+
+                function redraw() {
+                    var map = layer._map;
+                    var zoom = Math.round(map.getZoom());
+                    var bounds = map.getBounds().pad(0.5);
+                    layer.clearLayers();
+                    for (var i = 0; i < clusters.lat.length; i++) {
+                        if (
+                            clusters.min_zoom[i] <= zoom
+                            && zoom <= clusters.max_zoom[i]
+                            && bounds.contains([clusters.lat[i], clusters.lng[i]])
+                        ) {
+                            addCluster(i);
+                        }
+                    }
+                    for (var i = 0; i < points.lat.length; i++) {
+                        if (
+                            points.zoom[i] <= zoom
+                            && bounds.contains([points.lat[i], points.lng[i]])
+                        ) {
+                            addPoint(i);
+                        }
+                    }
+                }
+
+                layer.on("add", function() {
+                    layer._map.on("moveend", redraw);
+                    redraw();
+                });
+                layer.on("remove", function() {
+                    layer._map.off("moveend", redraw);
+                });
+                return layer;
+            })();
+        {% endmacro %}""")
+
+    default_css = [
+        (
+            "markerclustercss",
+            "https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.css",
+        ),
+        (
+            "markerclusterdefaultcss",
+            "https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.Default.css",
+        ),
+    ]
+
+    def __init__(
+        self,
+        data,
+        popups: Optional[list] = None,
+        radius: int = 80,
+        min_zoom: int = 0,
+        max_zoom: int = 16,
+        name: Optional[str] = None,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+        icon_create_function: Optional[str] = None,
+    ):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "PrecomputedMarkerCluster"
+        data = np.asarray(if_pandas_df_convert_to_numpy(data), dtype=float)
+        if data.ndim != 2 or data.shape[1] != 2:
+            raise ValueError(
+                f"data should have the shape (n, 2), instead got {data.shape}."
+            )
+        if np.isnan(data).any():
+            raise ValueError("data may not contain NaNs.")
+        if popups is not None and len(popups) != len(data):
+            raise ValueError("popups should have the same length as data.")
+        self.data = data
+        point_zooms, clusters = cluster_hierarchy(
+            data, radius=radius, min_zoom=min_zoom, max_zoom=max_zoom
+        )
+        self.points = {
+            "lat": data[:, 0].tolist(),
+            "lng": data[:, 1].tolist(),
+            "zoom": point_zooms.tolist(),
+            "popup": None if popups is None else [str(popup) for popup in popups],
+        }
+        self.clusters = {key: values.tolist() for key, values in clusters.items()}
+        if icon_create_function is not None:
+            assert isinstance(icon_create_function, str)
+        self.icon_create_function = icon_create_function
+
+    def _get_self_bounds(self):
+        """
+        Computes the bounds of the object itself (not including it's children)
+        in the form [[lat_min, lon_min], [lat_max, lon_max]].
+
+        """
+        if not len(self.data):
+            return [[None, None], [None, None]]
+        return [self.data.min(axis=0).tolist(), self.data.max(axis=0).tolist()]
+
+
+def cluster_hierarchy(
+    data: np.ndarray, radius: int = 80, min_zoom: int = 0, max_zoom: int = 16
+) -> tuple[np.ndarray, dict]:
+    """Compute the clusters of lat/lng points for every zoom level.
+
+    A cluster or point is often shown unchanged over a range of zoom
+    levels, so each of them is stored once together with that range.
+
+    Returns the lowest zoom level at which each point is shown on its own
+    and a dict of arrays describing the clusters: their weighted centroid
+    (``lat``, ``lng``), number of points (``count``), the zoom levels at
+    which they are shown (``min_zoom`` to ``max_zoom``) and the zoom level
+    at which they split up (``expansion``).
+    """
+    lat = np.radians(np.clip(data[:, 0], -_MAX_LATITUDE, _MAX_LATITUDE))
+    x = (data[:, 1] + 180.0) / 360.0
+    y = (1.0 - np.arcsinh(np.tan(lat)) / np.pi) / 2.0
+    count = np.ones(len(data))
+    expansion = np.full(len(data), max_zoom + 1)
+    # Points are nodes 0..n-1, new clusters are appended after them.
+    nodes = np.arange(len(data))
+    node_zooms = np.full(len(data), max_zoom + 1)
+    clusters = {key: [] for key in ("x", "y", "count", "max_zoom", "expansion")}
+
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        cell_size = radius / (256 * 2**zoom)
+        n_cells = int(math.ceil(1 / cell_size)) + 1
+        cells = (x // cell_size).astype(np.int64) * n_cells + (y // cell_size).astype(
+            np.int64
+        )
+        _, parent = np.unique(cells, return_inverse=True)
+        parent = parent.ravel()
+        n_children = np.bincount(parent)
+        first_child = np.empty(len(n_children), dtype=np.int64)
+        first_child[parent[::-1]] = np.arange(len(parent))[::-1]
+        new = n_children > 1
+
+        total = np.bincount(parent, weights=count)
+        x = np.bincount(parent, weights=x * count) / total
+        y = np.bincount(parent, weights=y * count) / total
+        count = total
+        expansion = np.where(new, zoom + 1, expansion[first_child])
+
+        # A cluster with a single child is the same node as that child.
+        nodes = nodes[first_child]
+        nodes[new] = len(node_zooms) + np.arange(np.count_nonzero(new))
+        node_zooms = np.concatenate(
+            [node_zooms, np.empty(np.count_nonzero(new), dtype=np.int64)]
+        )
+        node_zooms[nodes] = zoom
+        for key, values in (
+            ("x", x),
+            ("y", y),
+            ("count", count),
+            ("max_zoom", np.full(len(count), zoom)),
+            ("expansion", expansion),
+        ):
+            clusters[key].append(values[new])
+
+    # The clusters of `min_zoom` are also shown when zoomed out further.
+    node_zooms[nodes] = 0
+    x, y, count, max_zooms, expansion = (
+        np.concatenate([np.empty(0), *values]) for values in clusters.values()
+    )
+    return node_zooms[: len(data)], {
+        "lat": np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y)))),
+        "lng": x * 360.0 - 180.0,
+        "count": count.astype(np.int64),
+        "min_zoom": node_zooms[len(data) :],
+        "max_zoom": max_zooms.astype(np.int64),
+        "expansion": expansion.astype(np.int64),
+    }
@@ -38,7 +38,7 @@ class SemiCircle(JSCSSMixin, Marker):
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.semiCircle(
-                {{ this.location|tojson }},
+                {{ this.location|round_coordinates(this)|tojson }},
                 {{ this.options|tojavascript }}
                 )
                 {%- if this.direction %}
@@ -127,7 +127,7 @@ class TimeSliderChoropleth(JSCSSMixin, Layer):
             {% endif %}
 
             var {{ this.get_name() }} = L.geoJson(
-                {{ this.data|tojson }},
+                {{ this.data|round_coordinates(this)|tojson }},
                 {onEachFeature: onEachFeature}
             );
 
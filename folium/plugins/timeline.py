@@ -83,7 +83,7 @@ class Timeline(GeoJson):
           var {{ this.get_name() }}_options = {{ this.options|tojavascript }};
 
           var {{ this.get_name() }} = L.timeline(
-              {{ this.data|tojson }},
+              {{ this.data|round_coordinates(this)|tojson }},
               {{ this.get_name() }}_options
           );
           {{ this.get_name() }}.addTo({{ this._parent.get_name() }});
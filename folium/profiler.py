@@ -0,0 +1,305 @@
+"""
+Profile the rendering of a map.
+
+:func:`profile` measures how long each element takes to render and how many
+bytes it contributes to the header, html and script parts of the page::
+
+    with folium.profile(m) as p:
+        m.save("map.html")
+    print(p.table())
+
+The render methods are only wrapped inside the `with` block, so rendering
+outside of it is not slowed down.
+
+"""
+
+import json
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Optional
+
+import jinja2
+from branca.element import Element, Figure
+
+import folium.template
+from folium.features import GeoJsonStyleMapper
+
+_parts = ("header", "html", "script")
+
+
+class _Stats:
+    def __init__(self, name: str, cls: str):
+        self.name = name
+        self.cls = cls
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        # The children added to the figure, by figure part and name.
+        self.added: dict[tuple[str, str], Element] = {}
+        self.bytes = dict.fromkeys(_parts, 0)
+
+
+class Profile:
+    """Render statistics collected by :func:`profile`.
+
+    Times are in seconds. The total time of an element includes rendering
+    its children, the self time does not.
+    """
+
+    def __init__(self):
+        self._elements: dict[int, _Stats] = {}
+        self.functions: dict[str, dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "time": 0.0}
+        )
+        # The (stats, start time, time spent in nested elements) of the
+        # elements that are being rendered.
+        self._stack: list[list] = []
+        # Keep the rendered elements alive while profiling, so that their
+        # ids are not reused.
+        self._alive: list[Element] = []
+
+    def elements(self) -> list[dict]:
+        """Return the statistics of each rendered element."""
+        return [
+            {
+                "name": stats.name,
+                "class": stats.cls,
+                "calls": stats.calls,
+                "total_time": stats.total_time,
+                "self_time": stats.self_time,
+                "bytes": dict(stats.bytes),
+            }
+            for stats in self._elements.values()
+        ]
+
+    def classes(self) -> list[dict]:
+        """Return the statistics summed over the elements of each class."""
+        out: dict[str, dict] = {}
+        for element in self.elements():
+            row = out.setdefault(
+                element["class"],
+                {
+                    "class": element["class"],
+                    "count": 0,
+                    "calls": 0,
+                    "total_time": 0.0,
+                    "self_time": 0.0,
+                    "bytes": dict.fromkeys(_parts, 0),
+                },
+            )
+            row["count"] += 1
+            for key in ("calls", "total_time", "self_time"):
+                row[key] += element[key]
+            for part in _parts:
+                row["bytes"][part] += element["bytes"][part]
+        return list(out.values())
+
+    def to_dict(self) -> dict:
+        """Return all statistics as a dict."""
+        return {
+            "elements": self.elements(),
+            "classes": self.classes(),
+            "functions": {name: dict(row) for name, row in self.functions.items()},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """Return all statistics as JSON, `kwargs` are passed to `json.dumps`."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def table(
+        self, by: str = "class", sort: str = "self_time", limit: Optional[int] = 20
+    ) -> str:
+        """Return a text table of the statistics, largest first.
+
+        Parameters
+        ----------
+        by: {"class", "element"}, default "class"
+            Whether to show a row per class or per element.
+        sort: str, default "self_time"
+            Sort by "calls", "total_time", "self_time", "bytes" or one of
+            "header", "html" and "script" for their bytes.
+        limit: int, optional
+            Show only this many rows, by default 20.
+        """
+        if by == "class":
+            rows = self.classes()
+            label = "class"
+        elif by == "element":
+            rows = self.elements()
+            label = "name"
+        else:
+            raise ValueError(f"by should be 'class' or 'element', not {by!r}.")
+
+        def key(row: dict) -> float:
+            if sort == "bytes":
+                return sum(row["bytes"].values())
+            if sort in _parts:
+                return row["bytes"][sort]
+            return row[sort]
+
+        rows = sorted(rows, key=key, reverse=True)[:limit]
+        width = max([len(label)] + [len(row[label]) for row in rows])
+        lines = [
+            f"{label:<{width}} {'calls':>7} {'total ms':>10} {'self ms':>10} "
+            f"{'header':>10} {'html':>10} {'script':>10}"
+        ]
+        for row in rows:
+            lines.append(
+                f"{row[label]:<{width}} {row['calls']:>7} "
+                f"{row['total_time'] * 1000:>10.2f} {row['self_time'] * 1000:>10.2f} "
+                + " ".join(f"{row['bytes'][part]:>10}" for part in _parts)
+            )
+        if self.functions:
+            lines.append("")
+            width = max(len(name) for name in self.functions)
+            lines.append(f"{'function':<{width}} {'calls':>7} {'total ms':>10}")
+            for name, row in sorted(
+                self.functions.items(), key=lambda item: -item[1]["time"]
+            ):
+                lines.append(
+                    f"{name:<{width}} {row['calls']:>7} {row['time'] * 1000:>10.2f}"
+                )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.table()
+
+    def _wrap_render(self, render: Callable) -> Callable:
+        def wrapper(element: Element, *args, **kwargs):
+            key = id(element)
+            if any(frame[0] is self._elements.get(key) for frame in self._stack):
+                # A render method calling the one of its parent class.
+                return render(element, *args, **kwargs)
+            stats = self._elements.get(key)
+            if stats is None:
+                stats = self._elements[key] = _Stats(
+                    element.get_name(), type(element).__name__
+                )
+                self._alive.append(element)
+            stats.calls += 1
+            frame = [stats, time.perf_counter(), 0.0]
+            self._stack.append(frame)
+            try:
+                return render(element, *args, **kwargs)
+            finally:
+                self._stack.pop()
+                elapsed = time.perf_counter() - frame[1]
+                stats.total_time += elapsed
+                stats.self_time += elapsed - frame[2]
+                if self._stack:
+                    self._stack[-1][2] += elapsed
+
+        return wrapper
+
+    def _wrap_function(self, name: str, func: Callable) -> Callable:
+        # `wraps` keeps the attributes that jinja uses to pass the context.
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                row = self.functions[name]
+                row["calls"] += 1
+                row["time"] += time.perf_counter() - start
+
+        return wrapper
+
+    def _wrap_add_child(self, add_child: Callable, parts: dict) -> Callable:
+        def wrapper(element: Element, child: Element, name=None, *args, **kwargs):
+            result = add_child(element, child, name, *args, **kwargs)
+            part = parts.get(id(element))
+            if part is not None and self._stack:
+                key = (part, child.get_name() if name is None else name)
+                self._stack[-1][0].added.setdefault(key, child)
+            return result
+
+        return wrapper
+
+    def _count_bytes(self) -> None:
+        claimed = set()
+        for stats in self._elements.values():
+            for (part, name), child in stats.added.items():
+                if (part, name) in claimed:
+                    continue
+                claimed.add((part, name))
+                stats.bytes[part] += len(child.render().encode("utf8"))
+
+
+def _element_classes() -> list[type]:
+    classes = [Element]
+    out = []
+    while classes:
+        cls = classes.pop()
+        out.append(cls)
+        classes.extend(cls.__subclasses__())
+    return list(dict.fromkeys(out))
+
+
+@contextmanager
+def profile(element: Element) -> Iterator[Profile]:
+    """Collect render statistics of an element and its children.
+
+    Rendering inside the `with` block is profiled: the render time and
+    call count of each element, the number of bytes each element adds to
+    the header, html and script parts of the figure, and the time spent
+    in the GeoJson style mapping, JSON serialization, coordinate rounding
+    and `Template.render`.
+
+    The wrapped functions are patched globally, so rendering in other
+    threads during the `with` block is counted as well.
+
+    Examples
+    --------
+    >>> with folium.profile(m) as p:
+    ...     m.save("map.html")
+    >>> print(p.table(by="element", sort="script"))
+    >>> report = p.to_dict()
+    """
+    prof = Profile()
+    root = element.get_root()
+    parts = {}
+    if isinstance(root, Figure):
+        parts = {id(getattr(root, part)): part for part in _parts}
+
+    patched: list[tuple[Any, str, Any]] = []
+
+    def patch(owner: Any, name: str, value: Any) -> None:
+        patched.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, value)
+
+    for cls in _element_classes():
+        if "render" in cls.__dict__:
+            patch(cls, "render", prof._wrap_render(cls.__dict__["render"]))
+    patch(Element, "add_child", prof._wrap_add_child(Element.add_child, parts))
+    patch(
+        jinja2.Template,
+        "render",
+        prof._wrap_function("Template.render", jinja2.Template.render),
+    )
+    for name in ("get_style_map", "get_highlight_map"):
+        method = GeoJsonStyleMapper.__dict__[name]
+        patch(
+            GeoJsonStyleMapper,
+            name,
+            prof._wrap_function(f"GeoJsonStyleMapper.{name}", method),
+        )
+    # Compiled templates hold on to their filters, so the functions that the
+    # filters call are wrapped instead.
+    patch(json, "dumps", prof._wrap_function("json.dumps", json.dumps))
+    patch(
+        folium.template,
+        "round_coordinates",
+        prof._wrap_function("round_coordinates", folium.template.round_coordinates),
+    )
+
+    try:
+        yield prof
+    finally:
+        for owner, name, value in reversed(patched):
+            setattr(owner, name, value)
+        prof._count_bytes()
+        prof._alive.clear()
@@ -0,0 +1,238 @@
+"""
+Construct the layers of a map after the page has loaded.
+
+By default the scripts of all elements run in one block while the page
+loads, so a map with many layers freezes the page before the first tile
+is painted. :class:`Progressive` runs the map and its base layers first,
+and schedules the scripts of the other elements in chunks when the
+browser is idle.
+
+"""
+
+from branca.element import Element, Figure, MacroElement
+
+from folium.elements import RawElement, descendants, script_owner
+from folium.map import CustomPane, FitBounds, FitOverlays, Layer, Marker
+from folium.template import Template
+from folium.vector_layers import BaseMultiLocation, Rectangle
+
+# Elements that only depend on the map, so that they can be moved ahead of
+# the elements before them.
+_independent = (Layer, Marker, BaseMultiLocation, Rectangle)
+
+# Elements that other elements may depend on, or that set the view.
+_immediate = (CustomPane, FitBounds, FitOverlays)
+
+
+class Progressive(MacroElement):
+    """Defer the construction of the layers of a map.
+
+    The script of the map, of its base layers and of the panes and bounds
+    set on it run while the page loads. The scripts of the other children
+    of the map are moved to inert ``<script>`` elements, which are run one
+    by one when the browser is idle, using `requestIdleCallback` or
+    `setTimeout` where it is not available. Visible layers are constructed
+    first, hidden layers and the elements added after them follow.
+
+    While the scripts run, `L.GeoJSON.addData` adds large collections of
+    features in batches of `batch_size`, one batch per chunk. The map fires
+    a ``progressiveload`` event when all layers and data are added.
+
+    Parameters
+    ----------
+    element: Map
+        The map of which to defer the layers.
+    batch_size: int, default 500
+        Number of GeoJSON features to add at once.
+    """
+
+    _template = Template("""
+        {% macro runtime(this, kwargs) %}
+            var foliumProgressive = (function() {
+                var queue = [];
+                var scheduled = false;
+                var addData = null;
+                var batchSize = {{ this.batch_size|tojson }};
+                // Milliseconds of work per chunk without requestIdleCallback.
+                var budget = 8;
+
+                function schedule() {
+                    if (scheduled) {
+                        return;
+                    }
+                    scheduled = true;
+                    if (window.requestIdleCallback) {
+                        requestIdleCallback(work, {timeout: 200});
+                    } else {
+                        setTimeout(work, 0);
+                    }
+                }
+
+                function work(deadline) {
+                    scheduled = false;
+                    var end = performance.now() + budget;
+                    function hasTime() {
+                        if (deadline && deadline.timeRemaining) {
+                            return deadline.timeRemaining() > 1;
+                        }
+                        return performance.now() < end;
+                    }
+                    do {
+                        queue.shift()();
+                    } while (queue.length && hasTime());
+                    if (queue.length) {
+                        schedule();
+                    } else {
+                        unhook();
+                    }
+                }
+
+                function execute(node) {
+                    // An inserted script runs right away, in the global scope.
+                    var script = document.createElement("script");
+                    script.text = node.text;
+                    node.parentNode.replaceChild(script, node);
+                }
+
+                function batchedAddData(data) {
+                    var features = Array.isArray(data) ? data : data && data.features;
+                    var original = addData;
+                    if (!features || features.length <= batchSize) {
+                        return original.call(this, data);
+                    }
+                    var layer = this;
+                    var style = layer.options.style;
+                    // The features that are added later get the style that
+                    // is set in the meantime.
+                    layer.setStyle = function(style) {
+                        layer.options.style = style;
+                        return L.GeoJSON.prototype.setStyle.call(layer, style);
+                    };
+                    function batch(start) {
+                        return function() {
+                            original.call(layer, features.slice(start, start + batchSize));
+                        };
+                    }
+                    var tasks = [];
+                    for (var start = 0; start < features.length; start += batchSize) {
+                        tasks.push(batch(start));
+                    }
+                    tasks.push(function() {
+                        delete layer.setStyle;
+                        layer.options.style = style;
+                    });
+                    tasks.shift()();
+                    queue.unshift.apply(queue, tasks);
+                    schedule();
+                    return this;
+                }
+
+                function hook() {
+                    if (!addData && window.L && L.GeoJSON) {
+                        addData = L.GeoJSON.prototype.addData;
+                        L.GeoJSON.prototype.addData = batchedAddData;
+                    }
+                }
+
+                function unhook() {
+                    if (addData) {
+                        L.GeoJSON.prototype.addData = addData;
+                        addData = null;
+                    }
+                }
+
+                function run(map) {
+                    var selector = 'script[type="text/x-folium-deferred"][data-map="'
+                        + map.getContainer().id + '"]';
+                    document.querySelectorAll(selector).forEach(function(node) {
+                        queue.push(function() {
+                            hook();
+                            execute(node);
+                        });
+                    });
+                    queue.push(function() {
+                        map.fire("progressiveload");
+                    });
+                    schedule();
+                }
+
+                return {run: run};
+            })();
+        {% endmacro %}
+
+        {% macro html(this, kwargs) %}
+            {%- for unit in this.units %}
+            <script type="text/x-folium-deferred" data-map={{ this.element.get_name()|tojson }}>
+                {{ unit }}
+            </script>
+            {%- endfor %}
+        {% endmacro %}
+
+        {% macro script(this, kwargs) %}
+            foliumProgressive.run({{ this.element.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, element: Element, batch_size: int = 500):
+        super().__init__()
+        self._name = "Progressive"
+        self.element = element
+        self.batch_size = batch_size
+        self.units: list[str] = []
+
+    def render(self, **kwargs):
+        figure = self.element.get_root()
+        assert isinstance(
+            figure, Figure
+        ), "You cannot render this Element if it is not in a Figure."
+        children = list(self.element._children.values())
+        owners = {}
+        for i, child in enumerate(children):
+            for element in descendants(child):
+                owners[element.get_name()] = i
+
+        scripts = figure.script._children
+        units: list[list[Element]] = [[] for _ in children]
+        for name, script in list(scripts.items()):
+            owner = script_owner(name, owners)
+            if owner is None or self._is_immediate(children[owner]):
+                continue
+            units[owner].append(scripts.pop(name))
+
+        # Visible layers first. Elements that are not layers may refer to
+        # the layers before them, so they wait for the hidden ones.
+        order = []
+        after_hidden = False
+        for i, child in enumerate(children):
+            hidden = isinstance(child, Layer) and not child.show
+            after_hidden = after_hidden or hidden
+            dependent = not isinstance(child, _independent) and after_hidden
+            order.append((hidden or dependent, i))
+        self.units = [
+            "\n".join(script.render() for script in units[i])
+            for _, i in sorted(order)
+            if units[i]
+        ]
+
+        name = self.element.get_name()
+        figure.html.add_child(
+            RawElement(self._template.module.__dict__["html"](self, kwargs)),
+            name=f"{name}_progressive",
+        )
+        # After the scripts that stay, in case more were added.
+        for key in ("folium_progressive", f"{name}_progressive"):
+            scripts.pop(key, None)
+        figure.script.add_child(
+            RawElement(self._template.module.__dict__["runtime"](self, kwargs)),
+            name="folium_progressive",
+        )
+        figure.script.add_child(
+            RawElement(self._template.module.__dict__["script"](self, kwargs)),
+            name=f"{name}_progressive",
+        )
+
+    @staticmethod
+    def _is_immediate(element: Element) -> bool:
+        if isinstance(element, Layer) and not element.overlay:
+            return True
+        return isinstance(element, _immediate)
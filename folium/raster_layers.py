@@ -301,7 +301,7 @@ class ImageOverlay(Layer):
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.imageOverlay(
                 {{ this.url|tojson }},
-                {{ this.bounds|tojson }},
+                {{ this.bounds|round_coordinates(this)|tojson }},
                 {{ this.options|tojavascript }}
             );
         {% endmacro %}
@@ -373,7 +373,7 @@ class VideoOverlay(Layer):
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.videoOverlay(
                 {{ this.video_url|tojson }},
-                {{ this.bounds|tojson }},
+                {{ this.bounds|round_coordinates(this)|tojson }},
                 {{ this.options|tojavascript }}
             );
         {% endmacro %}
@@ -1,10 +1,37 @@
 import json
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Union
 
 import jinja2
 from branca.element import Element
+from jinja2.utils import htmlsafe_json_dumps
 
-from folium.utilities import JsCode, TypeJsonValue, camelize
+from folium.utilities import (
+    JsCode,
+    TypeJsonValue,
+    camelize,
+    get_coordinate_precision,
+    round_coordinates,
+)
+
+_compact: ContextVar[bool] = ContextVar("folium_compact", default=False)
+
+
+@contextmanager
+def compact_output() -> Iterator[None]:
+    """Render templates without optional whitespace in this context.
+
+    The `tojavascript` and `tojson` filters leave out the indentation and
+    the spaces after separators.
+    """
+    token = _compact.set(True)
+    try:
+        yield
+    finally:
+        _compact.reset(token)
 
 
 def tojavascript(obj: Union[str, JsCode, dict, list, Element]) -> str:
@@ -12,6 +39,16 @@ def tojavascript(obj: Union[str, JsCode, dict, list, Element]) -> str:
         return obj.js_code
     elif isinstance(obj, Element):
         return obj.get_name()
+    elif _compact.get() and isinstance(obj, dict):
+        items = (
+            (f'"{camelize(key)}"' if isinstance(key, str) else str(key))
+            + ":"
+            + tojavascript(value)
+            for key, value in obj.items()
+        )
+        return "{" + ",".join(items) + "}"
+    elif _compact.get() and isinstance(obj, list):
+        return "[" + ",".join(tojavascript(value) for value in obj) + "]"
     elif isinstance(obj, dict):
         out = ["{\n"]
         for key, value in obj.items():
@@ -34,9 +71,29 @@ def tojavascript(obj: Union[str, JsCode, dict, list, Element]) -> str:
         return _to_escaped_json(obj)
 
 
+def round_coordinates_of(value, element: Element, columns: int = 0):
+    """Round coordinates to the `coordinate_precision` set on the element
+    or one of its parents."""
+    return round_coordinates(value, get_coordinate_precision(element), columns)
+
+
+@jinja2.pass_eval_context
+def tojson(eval_ctx, value, indent=None):
+    """The builtin `tojson` filter, without spaces in compact output."""
+    if _compact.get() and indent is None:
+        policies = eval_ctx.environment.policies
+        return htmlsafe_json_dumps(
+            value,
+            dumps=policies["json.dumps_function"],
+            **{**policies["json.dumps_kwargs"], "separators": (",", ":")},
+        )
+    return jinja2.filters.do_tojson(eval_ctx, value, indent)
+
+
 def _to_escaped_json(obj: TypeJsonValue) -> str:
+    separators = (",", ":") if _compact.get() else None
     return (
-        json.dumps(obj)
+        json.dumps(obj, separators=separators)
         .replace("<", "\\u003c")
         .replace(">", "\\u003e")
         .replace("&", "\\u0026")
@@ -44,11 +101,211 @@ def _to_escaped_json(obj: TypeJsonValue) -> str:
     )
 
 
+_json_string = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+
+def escape_braces(json_text: str) -> str:
+    """Escape the curly braces in the strings of JSON text.
+
+    Rendered scripts are parsed as a template again when they are added to
+    the figure, so strings containing ``{{`` or ``{%``, like encoded
+    polylines, would break the page. Javascript decodes the escaped braces
+    to the same strings.
+    """
+    return _json_string.sub(
+        lambda match: match.group(0).replace("{", "\\u007b").replace("}", "\\u007d"),
+        json_text,
+    )
+
+
 class Environment(jinja2.Environment):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.filters["tojavascript"] = tojavascript
+        self.filters["round_coordinates"] = round_coordinates_of
+        self.filters["tojson"] = tojson
+        self.filters["escape_braces"] = escape_braces
 
 
 class Template(jinja2.Template):
     environment_class = Environment
+
+
+_regex_preceders = set("(,=:[!&|?{};+-*%<>~^")
+# Punctuation that never needs whitespace next to it.
+_tight = set("{}[]();,=:")
+# Newlines after or before these can be left out without changing how
+# semicolons are inserted.
+_newline_free_after = set("{[(,;:=")
+_newline_free_before = set("}]),;:.?")
+
+
+def compact_js(code: str) -> str:
+    """Remove comments, indentation and blank lines from Javascript code.
+
+    Strings, template literals and regular expressions are kept as they
+    are. Newlines are kept where automatic semicolon insertion could
+    depend on them.
+    """
+    out: list[str] = []
+    # A stack of the brace depth in code, with None for template literals.
+    modes: list = [0]
+    # The last significant character of the output and pending whitespace.
+    last = ""
+    space = ""
+    i = 0
+    n = len(code)
+
+    def emit(text: str) -> None:
+        nonlocal last, space
+        if space and out:
+            if "\n" in space:
+                if last not in _newline_free_after and text[0] not in (
+                    _newline_free_before
+                ):
+                    out.append("\n")
+            elif last not in _tight and text[0] not in _tight:
+                out.append(" ")
+        space = ""
+        out.append(text)
+        last = text[-1]
+
+    while i < n:
+        c = code[i]
+        if modes[-1] is None:
+            # Inside a template literal.
+            j = i
+            while j < n and code[j] not in "\\`$":
+                j += 1
+            if j > i:
+                out.append(code[i:j])
+            elif c == "\\":
+                out.append(code[i : i + 2])
+                j = i + 2
+            elif c == "`":
+                modes.pop()
+                out.append(c)
+                j = i + 1
+            elif code.startswith("${", i):
+                modes.append(0)
+                out.append("${")
+                j = i + 2
+            else:
+                out.append(c)
+                j = i + 1
+            last = out[-1][-1]
+            i = j
+            continue
+        if c in " \t\r\n":
+            j = i
+            while j < n and code[j] in " \t\r\n":
+                j += 1
+            space += code[i:j]
+            i = j
+        elif code.startswith("//", i):
+            j = code.find("\n", i)
+            i = n if j == -1 else j
+        elif code.startswith("/*", i):
+            j = code.find("*/", i + 2)
+            j = n if j == -1 else j + 2
+            space += "\n" if "\n" in code[i:j] else " "
+            i = j
+        elif c in "\"'" or (c == "/" and (last in _regex_preceders or not last)):
+            j = _skip_literal(code, i)
+            emit(code[i:j])
+            i = j
+        elif c == "`":
+            emit(c)
+            modes.append(None)
+            i += 1
+        else:
+            if c == "{":
+                modes[-1] += 1
+            elif c == "}":
+                if modes[-1] == 0 and len(modes) > 1:
+                    # The end of a ${...} placeholder.
+                    modes.pop()
+                    out.append(c)
+                    space = ""
+                    last = c
+                    i += 1
+                    continue
+                modes[-1] -= 1
+            j = i + 1
+            if _is_word(c):
+                while j < n and _is_word(code[j]):
+                    j += 1
+            emit(code[i:j])
+            i = j
+    return "".join(out)
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c in "_$\\" or ord(c) > 127
+
+
+def _skip_literal(code: str, i: int) -> int:
+    """Return the end of the string or regular expression literal at i."""
+    quote = code[i]
+    in_class = False
+    j = i + 1
+    while j < len(code):
+        c = code[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == "\n":
+            break
+        if quote == "/" and c == "[":
+            in_class = True
+        elif quote == "/" and c == "]":
+            in_class = False
+        elif c == quote and not in_class:
+            return j + 1
+        j += 1
+    return j
+
+
+_html_blocks = re.compile(
+    r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def compact_html(html: str) -> str:
+    """Remove indentation and blank lines from HTML.
+
+    Whitespace that contains a newline is replaced by a single newline.
+
+    The content of ``<script>`` elements is compacted with
+    :func:`compact_js`. The content of ``<pre>`` and ``<textarea>``
+    elements, and of scripts that are not Javascript, is kept as is.
+    """
+    out = []
+    position = 0
+    for match in _html_blocks.finditer(html):
+        out.append(_compact_lines(html[position : match.start()]))
+        start_tag, tag, content, end_tag = match.groups()
+        if tag.lower() == "script" and _is_javascript(start_tag):
+            content = compact_js(content)
+        elif tag.lower() == "style":
+            content = _compact_lines(content)
+        out.append(start_tag + content + end_tag)
+        position = match.end()
+    out.append(_compact_lines(html[position:]))
+    return "".join(out)
+
+
+def _compact_lines(text: str) -> str:
+    # A newline is still whitespace between inline elements.
+    return re.sub(r"\s*\n\s*", "\n", text)
+
+
+def _is_javascript(start_tag: str) -> bool:
+    match = re.search(r"""\btype\s*=\s*["']?([^"'\s>]+)""", start_tag, re.IGNORECASE)
+    return match is None or match.group(1).lower() in (
+        "text/javascript",
+        "application/javascript",
+        "module",
+        "text/x-folium-deferred",
+    )
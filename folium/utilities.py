@@ -6,6 +6,7 @@ import math
 import os
 import tempfile
 import uuid
+import zlib
 from collections.abc import Iterable, Iterator, Sequence
 from contextlib import contextmanager
 from typing import (
@@ -126,6 +127,30 @@ def validate_locations(locations: TypeLine) -> list[list[float]]:
     return [validate_location(coord_pair) for coord_pair in locations]
 
 
+def validate_locations_array(locations: TypeLine) -> np.ndarray:
+    """Validate lat/lon coordinate pairs and return them as an (n, 2) array.
+
+    This is a vectorized alternative to `validate_locations` for large
+    numbers of locations.
+    """
+    locations = if_pandas_df_convert_to_numpy(locations)
+    _validate_locations_basics(locations)
+    try:
+        array = np.asarray(locations, dtype=float)
+    except (TypeError, ValueError):
+        # Raise the more descriptive error of the validation per location.
+        validate_locations(locations)
+        raise
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(
+            "Expected two (lat, lon) values for each location, "
+            f"instead got an array of shape {array.shape}."
+        )
+    if np.isnan(array).any():
+        raise ValueError("Location values cannot contain NaNs.")
+    return array
+
+
 def validate_multi_locations(
     locations: TypeMultiLine,
 ) -> Union[list[list[float]], list[list[list[float]]]]:
@@ -133,13 +158,14 @@ def validate_multi_locations(
     locations = if_pandas_df_convert_to_numpy(locations)
     _validate_locations_basics(locations)
     try:
-        float(next(iter(next(iter(next(iter(locations)))))))  # type: ignore
+        first = next(iter(next(iter(locations))))  # type: ignore
     except (TypeError, StopIteration):
-        # locations is a list of coordinate pairs
-        return [validate_location(coord_pair) for coord_pair in locations]  # type: ignore
-    else:
-        # locations is a list of a list of coordinate pairs, recurse
-        return [validate_locations(lst) for lst in locations]  # type: ignore
+        first = None
+    if isinstance(first, Iterable) and not isinstance(first, str):
+        # locations is a list of lists of coordinate pairs, recurse
+        return [validate_multi_locations(lst) for lst in locations]  # type: ignore
+    # locations is a list of coordinate pairs
+    return [validate_location(coord_pair) for coord_pair in locations]  # type: ignore
 
 
 def if_pandas_df_convert_to_numpy(obj: Any) -> Any:
@@ -272,6 +298,501 @@ def mercator_transform(
     return out
 
 
+def simplify_locations(
+    locations: Any, tolerance: float, keep: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Simplify a line with the Douglas-Peucker algorithm.
+
+    The distances are computed in Web Mercator meters. All segments of the
+    recursion at the same depth are processed at once with NumPy.
+
+    Parameters
+    ----------
+    locations: array of shape (n, 2)
+        The line in the form [[lat, lng]].
+    tolerance: float
+        Maximum distance in meters between the line and its simplification.
+    keep: boolean array of length n, optional
+        Locations that must be kept. The parts of the line between them
+        are simplified separately.
+
+    Returns
+    -------
+    A boolean mask of the locations to keep. The first and last location
+    are always kept.
+    """
+    locations = np.asarray(locations, dtype=float)
+    n = len(locations)
+    keep = np.zeros(n, dtype=bool) if keep is None else np.array(keep, dtype=bool)
+    if n == 0:
+        return keep
+    keep[[0, -1]] = True
+    earth_radius = 6378137.0
+    lat = np.radians(np.clip(locations[:, 0], -85.051128779806589, 85.051128779806589))
+    x = earth_radius * np.radians(locations[:, 1])
+    y = earth_radius * np.arcsinh(np.tan(lat))
+
+    kept = np.flatnonzero(keep)
+    starts, ends = kept[:-1], kept[1:]
+    while True:
+        counts = ends - starts - 1
+        starts, ends, counts = starts[counts > 0], ends[counts > 0], counts[counts > 0]
+        if not len(starts):
+            return keep
+        # Index of every interior point of every segment.
+        segment = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        index = np.arange(counts.sum()) - offsets[segment] + starts[segment] + 1
+
+        # Distance of each point to the segment between its start and end.
+        ax, ay = x[starts][segment], y[starts][segment]
+        dx, dy = x[ends][segment] - ax, y[ends][segment] - ay
+        length2 = dx**2 + dy**2
+        t = np.clip(
+            ((x[index] - ax) * dx + (y[index] - ay) * dy)
+            / np.where(length2 == 0, 1, length2),
+            0,
+            1,
+        )
+        distance = np.hypot(x[index] - ax - t * dx, y[index] - ay - t * dy)
+
+        max_distance = np.maximum.reduceat(distance, offsets)
+        is_max = distance == max_distance[segment]
+        _, first = np.unique(segment[is_max], return_index=True)
+        split_index = index[is_max][first]
+        split = max_distance > tolerance
+        split_index = split_index[split]
+        keep[split_index] = True
+        starts, ends = (
+            np.concatenate([starts[split], split_index]),
+            np.concatenate([split_index, ends[split]]),
+        )
+
+
+def encode_polyline(locations: Any, precision: int = 5) -> str:
+    """Encode a line with the Google Encoded Polyline Algorithm.
+
+    See https://developers.google.com/maps/documentation/utilities/polylinealgorithm
+
+    Parameters
+    ----------
+    locations: array of shape (n, 2)
+        The line in the form [[lat, lng]].
+    precision: int, default 5
+        Number of decimals that are kept.
+    """
+    return encode_polylines([locations], precision=precision)[0]
+
+
+def encode_polylines(lines: Iterable[Any], precision: int = 5) -> list[str]:
+    """Encode several lines at once with the Google Encoded Polyline Algorithm.
+
+    The coordinates of all lines are rounded, delta encoded and split into
+    5-bit chunks in a single vectorized pass.
+    """
+    lines = [np.reshape(np.asarray(line, dtype=float), (-1, 2)) for line in lines]
+    if not lines:
+        return []
+    lengths = np.array([len(line) for line in lines])
+    values = np.round(np.concatenate(lines) * 10**precision).astype(np.int64)
+    deltas = np.diff(values, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    # The first point of each line is encoded as is.
+    starts = (np.cumsum(lengths) - lengths)[lengths > 0]
+    deltas[starts] = values[starts]
+    deltas = deltas.ravel()
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).view(np.uint64)
+
+    max_chunks = max(1, -(-int(zigzag.max(initial=0)).bit_length() // 5))
+    shifts = np.arange(max_chunks, dtype=np.uint64) * np.uint64(5)
+    chunks = (zigzag[:, None] >> shifts) & np.uint64(31)
+    n_chunks = 1 + (zigzag[:, None] >> shifts[1:] > 0).sum(axis=1)
+    position = np.arange(max_chunks)
+    # All but the last chunk of a value have the continuation bit set.
+    chunks[position < n_chunks[:, None] - 1] |= np.uint64(0x20)
+    chars = (chunks + np.uint64(63)).astype(np.uint8)[position < n_chunks[:, None]]
+
+    ends = np.cumsum(n_chunks.reshape(-1, 2).sum(axis=1))
+    ends = np.concatenate([[0], ends])[np.cumsum(lengths)]
+    encoded = chars.tobytes().decode("ascii")
+    return [encoded[start:end] for start, end in zip(np.r_[0, ends[:-1]], ends)]
+
+
+def encode_geojson(data: dict, precision: int = 5) -> dict:
+    """Encode the lines and rings of GeoJSON geometries as encoded polylines.
+
+    Returns a copy of `data` in which the coordinates of each line or ring
+    are replaced by a string. Coordinates keep the GeoJSON [lng, lat]
+    order. Points, and lines with more than two dimensions, are kept as is.
+    """
+    data, slots = _copy_geojson(
+        data, {"LineString": 0, "MultiLineString": 1, "Polygon": 1, "MultiPolygon": 2}
+    )
+    slots = [
+        (container, key)
+        for container, key in slots
+        if container[key] and all(len(position) == 2 for position in container[key])
+    ]
+    encoded = encode_polylines(
+        [container[key] for container, key in slots], precision=precision
+    )
+    for (container, key), line in zip(slots, encoded):
+        container[key] = line
+    return data
+
+
+def _copy_geojson(data: dict, depths: dict[str, int]) -> tuple[dict, list]:
+    """Copy GeoJSON data down to the coordinates of its geometries.
+
+    `depths` maps the geometry types to visit to the number of list levels
+    above their lists of positions. Returns the copy and the (container,
+    key) pairs holding each list of positions, or position for points.
+    """
+    slots: list[tuple[Any, Any]] = []
+
+    def visit(container, key, depth):
+        if depth:
+            container[key] = value = list(container[key])
+            for i in range(len(value)):
+                visit(value, i, depth - 1)
+        else:
+            slots.append((container, key))
+
+    def copy_geometry(geometry):
+        if not geometry or "type" not in geometry:
+            return geometry
+        geometry = dict(geometry)
+        if geometry["type"] == "GeometryCollection":
+            geometry["geometries"] = [
+                copy_geometry(child) for child in geometry["geometries"]
+            ]
+        elif geometry["type"] in depths:
+            visit(geometry, "coordinates", depths[geometry["type"]])
+        return geometry
+
+    if data.get("type") == "FeatureCollection":
+        data = dict(data)
+        data["features"] = [
+            dict(feature, geometry=copy_geometry(feature.get("geometry")))
+            for feature in data["features"]
+        ]
+    elif data.get("type") == "Feature":
+        data = dict(data, geometry=copy_geometry(data["geometry"]))
+    else:
+        data = copy_geometry(data)
+    return data, slots
+
+
+def round_coordinates(obj: Any, precision: Optional[int], columns: int = 0) -> Any:
+    """Round the coordinates in locations, bounds or GeoJSON/TopoJSON data.
+
+    All numbers are rounded at once with NumPy rather than one by one.
+    The input is not modified.
+
+    Parameters
+    ----------
+    obj: list, array or dict
+        Nested lists of numbers, like locations or bounds, or a GeoJSON or
+        TopoJSON dict.
+    precision: int or None
+        Number of decimals to keep. If None, `obj` is returned unchanged.
+    columns: int, default 0
+        Only round the first `columns` values of each row, for example to
+        leave the weights of [lat, lng, weight] rows untouched. By default
+        all values are rounded.
+
+    Values that are not numbers, like None, are left as they are.
+    """
+    if precision is None or obj is None or isinstance(obj, str):
+        return obj
+    if isinstance(obj, dict) and obj.get("type") == "Topology":
+        obj = dict(obj)
+        if "transform" in obj:
+            # The arcs are quantized to integers already.
+            transform = obj["transform"]
+            obj["transform"] = dict(
+                transform,
+                translate=np.round(transform["translate"], precision).tolist(),
+            )
+            return obj
+        obj["arcs"] = list(obj.get("arcs", []))
+        slots = [(obj["arcs"], i) for i in range(len(obj["arcs"]))]
+    elif isinstance(obj, dict):
+        obj, slots = _copy_geojson(
+            obj,
+            {
+                "Point": 0,
+                "MultiPoint": 0,
+                "LineString": 0,
+                "MultiLineString": 1,
+                "Polygon": 1,
+                "MultiPolygon": 2,
+            },
+        )
+    else:
+        try:
+            values = np.asarray(obj, dtype=float)
+        except (TypeError, ValueError):
+            values = None
+        if values is None or np.isnan(values).any():
+            if not isinstance(obj, (list, tuple, np.ndarray)):
+                # Not a number, like the None of empty bounds.
+                return obj
+            # Ragged, like multiple lines of different lengths, or holding
+            # values that are not numbers.
+            return [
+                (
+                    item
+                    if columns and i >= columns and np.ndim(item) == 0
+                    else round_coordinates(
+                        item, precision, 0 if np.ndim(item) == 0 else columns
+                    )
+                )
+                for i, item in enumerate(obj)
+            ]
+        if columns and values.ndim:
+            values = values.copy()
+            values[..., :columns] = np.round(values[..., :columns], precision)
+        else:
+            values = np.round(values, precision)
+        return values.tolist()
+
+    arrays = [np.asarray(container[key], dtype=float) for container, key in slots]
+    if arrays:
+        flat = np.round(np.concatenate([array.ravel() for array in arrays]), precision)
+        parts = np.split(flat, np.cumsum([array.size for array in arrays])[:-1])
+        for (container, key), array, part in zip(slots, arrays, parts):
+            container[key] = part.reshape(array.shape).tolist()
+    return obj
+
+
+def compress_json(obj: Any, compress: Union[bool, int] = True) -> Optional[str]:
+    """Serialize to JSON, compress with deflate and encode as base64.
+
+    Parameters
+    ----------
+    obj: JSON serializable object
+        The payload to compress.
+    compress: bool or int, default True
+        If True, payloads of at least 10 kB are compressed. If an int, the
+        minimum size in bytes of the JSON to compress it.
+
+    Returns
+    -------
+    The compressed payload, or None if the payload is not compressed.
+    """
+    if compress is False:
+        return None
+    threshold = 10_000 if compress is True else compress
+    data = json.dumps(obj, separators=(",", ":")).encode()
+    if len(data) < threshold:
+        return None
+    return base64.b64encode(zlib.compress(data)).decode()
+
+
+def chunk_features(features: Iterable[dict], zoom: int) -> dict[str, dict]:
+    """Split GeoJSON features into the cells of a grid of map tiles.
+
+    Each feature goes to the web mercator tile at `zoom` that holds the
+    center of its bounds. Features without geometry are left out.
+
+    Returns
+    -------
+    A dict with a ``"<zoom>/<x>/<y>"`` key for each tile with features,
+    holding the features and their bounds as [[south, west], [north, east]].
+    """
+    n = 2**zoom
+    chunks: dict[str, dict] = {}
+    for feature in features:
+        west = south = math.inf
+        east = north = -math.inf
+        for point in iter_coords(feature):
+            west, east = min(west, point[0]), max(east, point[0])
+            south, north = min(south, point[1]), max(north, point[1])
+        if west == math.inf:
+            continue
+        lon = (west + east) / 2
+        lat = math.radians(max(min((south + north) / 2, 85.0511), -85.0511))
+        x = min(max(int((lon + 180) / 360 * n), 0), n - 1)
+        y = int((1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n)
+        y = min(max(y, 0), n - 1)
+        chunk = chunks.setdefault(
+            f"{zoom}/{x}/{y}",
+            {"features": [], "bounds": [[south, west], [north, east]]},
+        )
+        chunk["features"].append(feature)
+        bounds = chunk["bounds"]
+        bounds[0] = [min(bounds[0][0], south), min(bounds[0][1], west)]
+        bounds[1] = [max(bounds[1][0], north), max(bounds[1][1], east)]
+    return chunks
+
+
+def feature_boxes(features: Sequence[dict]) -> np.ndarray:
+    """Return the bounds of GeoJSON features as rows of west, south, east, north.
+
+    Features without geometry get an empty box, with the minimums at
+    infinity and the maximums at minus infinity.
+    """
+    coords: list[Sequence[float]] = []
+    counts = np.zeros(len(features), dtype=int)
+    for i, feature in enumerate(features):
+        points = [point[:2] for point in iter_coords(feature)]
+        coords.extend(points)
+        counts[i] = len(points)
+    boxes = np.tile([np.inf, np.inf, -np.inf, -np.inf], (len(features), 1))
+    if coords:
+        array = np.asarray(coords, dtype=float)
+        present = counts > 0
+        starts = (np.cumsum(counts) - counts)[present]
+        for column, (axis, reduce) in enumerate(
+            [(0, np.minimum), (1, np.minimum), (0, np.maximum), (1, np.maximum)]
+        ):
+            boxes[present, column] = reduce.reduceat(array[:, axis], starts)
+    return boxes
+
+
+def pad_boxes(boxes: np.ndarray, meters: Any) -> np.ndarray:
+    """Widen rows of west, south, east, north by a distance in meters."""
+    boxes = np.array(boxes, dtype=float)
+    lat = np.radians(np.clip((boxes[:, 1] + boxes[:, 3]) / 2, -89, 89))
+    dlat = np.asarray(meters, dtype=float) / 111_320
+    dlon = dlat / np.cos(np.nan_to_num(lat))
+    boxes[:, 0] -= dlon
+    boxes[:, 1] -= dlat
+    boxes[:, 2] += dlon
+    boxes[:, 3] += dlat
+    return boxes
+
+
+def _hilbert(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Return the position of 16 bit coordinates along a Hilbert curve.
+
+    The same as the `hilbert` function of the flatbush library, on arrays.
+    """
+    x = x.astype(np.uint32)
+    y = y.astype(np.uint32)
+    a = x ^ y
+    b = 0xFFFF ^ a
+    c = 0xFFFF ^ (x | y)
+    d = x & (y ^ 0xFFFF)
+
+    A = a | (b >> 1)
+    B = (a >> 1) ^ a
+    C = ((c >> 1) ^ (b & (d >> 1))) ^ c
+    D = ((a & (c >> 1)) ^ (d >> 1)) ^ d
+
+    a, b, c, d = A, B, C, D
+    A = (a & (a >> 2)) ^ (b & (b >> 2))
+    B = (a & (b >> 2)) ^ (b & ((a ^ b) >> 2))
+    C = C ^ ((a & (c >> 2)) ^ (b & (d >> 2)))
+    D = D ^ ((b & (c >> 2)) ^ ((a ^ b) & (d >> 2)))
+
+    a, b, c, d = A, B, C, D
+    A = (a & (a >> 4)) ^ (b & (b >> 4))
+    B = (a & (b >> 4)) ^ (b & ((a ^ b) >> 4))
+    C = C ^ ((a & (c >> 4)) ^ (b & (d >> 4)))
+    D = D ^ ((b & (c >> 4)) ^ ((a ^ b) & (d >> 4)))
+
+    a, b, c, d = A, B, C, D
+    C = C ^ ((a & (c >> 8)) ^ (b & (d >> 8)))
+    D = D ^ ((b & (c >> 8)) ^ ((a ^ b) & (d >> 8)))
+
+    a = C ^ (C >> 1)
+    b = D ^ (D >> 1)
+
+    i0 = x ^ y
+    i1 = b | (0xFFFF ^ (i0 | a))
+    for shift, mask in (
+        (8, 0x00FF00FF),
+        (4, 0x0F0F0F0F),
+        (2, 0x33333333),
+        (1, 0x55555555),
+    ):
+        i0 = (i0 | (i0 << shift)) & mask
+        i1 = (i1 | (i1 << shift)) & mask
+    return (i1 << 1) | i0
+
+
+def pack_rtree(boxes: Any, node_size: int = 16) -> bytes:
+    """Build a packed Hilbert R-tree over boxes, in the flatbush layout.
+
+    The boxes are sorted along a Hilbert curve through their centers and
+    grouped into nodes of `node_size`, bottom up. The result can be loaded
+    with ``Flatbush.from`` in the browser: an 8 byte header, the boxes of
+    the items and nodes as 32 bit floats, rounded outwards, and the indices
+    of the items and of the first child of each node.
+
+    Parameters
+    ----------
+    boxes: array-like of shape (n, 4)
+        The bounds of the items as west, south, east, north. Items with
+        an empty box, like the ones of :func:`feature_boxes`, are never found.
+    node_size: int, default 16
+        The number of children of each node.
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    n = len(boxes)
+    if not n:
+        raise ValueError("Cannot index zero boxes.")
+    node_size = min(max(int(node_size), 2), 65535)
+
+    finite = np.isfinite(boxes).all(axis=1)
+    centers = np.zeros((n, 2))
+    if finite.any():
+        low = boxes[finite, :2].min(axis=0)
+        size = boxes[finite, 2:].max(axis=0) - low
+        size[size == 0] = 1
+        middle = (boxes[finite, :2] + boxes[finite, 2:]) / 2
+        centers[finite] = np.floor(0xFFFF * (middle - low) / size)
+    order = np.argsort(_hilbert(centers[:, 0], centers[:, 1]), kind="stable")
+
+    level = boxes[order]
+    levels = [level]
+    indices = [order]
+    offset = 0
+    while True:
+        starts = np.arange(0, len(level), node_size)
+        indices.append((offset + starts) * 4)
+        offset += len(level)
+        level = np.column_stack(
+            [
+                np.minimum.reduceat(level[:, 0], starts),
+                np.minimum.reduceat(level[:, 1], starts),
+                np.maximum.reduceat(level[:, 2], starts),
+                np.maximum.reduceat(level[:, 3], starts),
+            ]
+        )
+        levels.append(level)
+        if len(level) == 1:
+            break
+
+    nodes = np.concatenate(levels)
+    packed = nodes.astype(np.float32)
+    with np.errstate(invalid="ignore"):
+        low = packed[:, :2] > nodes[:, :2]
+        high = packed[:, 2:] < nodes[:, 2:]
+    packed[:, :2][low] = np.nextafter(packed[:, :2][low], np.float32(-np.inf))
+    packed[:, 2:][high] = np.nextafter(packed[:, 2:][high], np.float32(np.inf))
+    index_type = "<u2" if len(nodes) < 16384 else "<u4"
+    # Version 3 of the format, with Float32Array boxes.
+    header = bytes([0xFB, (3 << 4) + 7]) + node_size.to_bytes(2, "little")
+    header += n.to_bytes(4, "little")
+    return (
+        header
+        + packed.astype("<f4").tobytes()
+        + np.concatenate(indices).astype(index_type).tobytes()
+    )
+
+
+def get_coordinate_precision(element: Element) -> Optional[int]:
+    """Return the `coordinate_precision` of an element or its closest parent."""
+    while element is not None:
+        precision = getattr(element, "coordinate_precision", None)
+        if precision is not None:
+            return precision
+        element = element._parent
+    return None
+
+
 def iter_coords(obj: Any) -> Iterator[tuple[float, ...]]:
     """
     Returns all the coordinate tuples from a geometry or feature.
@@ -3,10 +3,11 @@ Wraps leaflet Polyline, Polygon, Rectangle, Circle, and CircleMarker
 
 """
 
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from typing import Optional, Union
 
-from branca.element import MacroElement
+import numpy as np
+from branca.element import JavascriptLink, MacroElement
 
 from folium.map import Marker, Popup, Tooltip
 from folium.template import Template
@@ -15,7 +16,10 @@ from folium.utilities import (
     TypeMultiLine,
     TypePathOptions,
     camelize,
+    encode_polylines,
+    get_and_assert_figure_root,
     get_bounds,
+    simplify_locations,
     validate_locations,
     validate_multi_locations,
 )
@@ -126,6 +130,103 @@ def path_options(
     return default
 
 
+_POLYLINE_ENCODED_JS = (
+    "polyline-encoded",
+    "https://cdn.jsdelivr.net/npm/polyline-encoded@0.0.9/Polyline.encoded.js",
+)
+
+# Javascript expression creating the latlngs of a BaseMultiLocation.
+_LATLNGS = """
+    {%- if this.encoded is string %}
+    L.PolylineUtil.decode({{ this.encoded|tojson|escape_braces }}),
+    {%- elif this.encoded %}
+    {{ this.encoded|tojson|escape_braces }}.map(function decode(encoded) {
+        return typeof encoded === "string"
+            ? L.PolylineUtil.decode(encoded)
+            : encoded.map(decode);
+    }),
+    {%- else %}
+    {{ this.locations|round_coordinates(this)|tojson }},
+    {%- endif %}"""
+
+
+class _LevelOfDetail(MacroElement):
+    """Swap the locations of the parent path when the map is zoomed.
+
+    Parameters
+    ----------
+    levels: list of (int, locations)
+        The locations to show starting from each zoom level, sorted by
+        zoom level.
+    encoding: {"polyline"}, optional
+        How the locations of the levels are encoded.
+
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            (function() {
+                var layer = {{ this._parent.get_name() }};
+                var levels = {{ this.levels|round_coordinates(this)|tojson|escape_braces }};
+                var current = 0;
+                {%- if this.encoding == "polyline" %}
+                function decode(latlngs) {
+                    return typeof latlngs === "string"
+                        ? L.PolylineUtil.decode(latlngs)
+                        : latlngs.map(decode);
+                }
+                {%- endif %}
+                function update() {
+                    var zoom = layer._map.getZoom();
+                    var level = 0;
+                    while (level + 1 < levels.length && levels[level + 1][0] <= zoom) {
+                        level++;
+                    }
+                    if (level !== current) {
+                        current = level;
+                        {%- if this.encoding == "polyline" %}
+                        layer.setLatLngs(decode(levels[level][1]));
+                        {%- else %}
+                        layer.setLatLngs(levels[level][1]);
+                        {%- endif %}
+                    }
+                }
+                layer.on("add", function() {
+                    layer._map.on("zoomend", update);
+                    update();
+                });
+                layer.on("remove", function() {
+                    layer._map.off("zoomend", update);
+                });
+                if (layer._map) {
+                    layer._map.on("zoomend", update);
+                    update();
+                }
+            })();
+        {% endmacro %}
+        """)
+
+    def __init__(self, levels: list, encoding: Optional[str] = None):
+        super().__init__()
+        self._name = "LevelOfDetail"
+        self.levels = levels
+        self.encoding = encoding
+
+
+def _lines(locations: list) -> list:
+    """Return the lines or rings of possibly nested locations, in order."""
+    if not isinstance(locations[0][0], list):
+        return [locations]
+    return [line for part in locations for line in _lines(part)]
+
+
+def _nest(locations: list, lines: Iterator) -> list:
+    """Put the items of `lines` back in the nesting of `locations`."""
+    if not isinstance(locations[0][0], list):
+        return next(lines)
+    return [_nest(part, lines) for part in locations]
+
+
 class BaseMultiLocation(MacroElement):
     """Base class for vector classes with multiple coordinates.
 
@@ -133,14 +234,36 @@ class BaseMultiLocation(MacroElement):
 
     """
 
+    # Whether the locations describe rings, which are closed implicitly.
+    _closed = False
+
     def __init__(
         self,
         locations: TypeMultiLine,
         popup: Union[Popup, str, None] = None,
         tooltip: Union[Tooltip, str, None] = None,
+        simplify: Union[float, dict[int, float], None] = None,
+        encoding: Optional[str] = None,
     ):
         super().__init__()
+        if encoding not in (None, "polyline"):
+            raise ValueError(f"Unknown encoding {encoding!r}, use 'polyline'.")
         self.locations = validate_multi_locations(locations)
+        if isinstance(simplify, dict):
+            levels = [
+                [int(zoom), self._simplify(tolerance)]
+                for zoom, tolerance in sorted(simplify.items())
+            ]
+            self.locations = levels[0][1]
+            if len(levels) > 1:
+                if encoding is not None:
+                    levels = [[zoom, self._encode(level)] for zoom, level in levels]
+                self.add_child(_LevelOfDetail(levels, encoding=encoding))
+        elif simplify is not None:
+            self.locations = self._simplify(simplify)
+        self.encoded = None
+        if encoding is not None:
+            self.encoded = self._encode(self.locations)
         if popup is not None:
             self.add_child(popup if isinstance(popup, Popup) else Popup(str(popup)))
         if tooltip is not None:
@@ -148,10 +271,45 @@ class BaseMultiLocation(MacroElement):
                 tooltip if isinstance(tooltip, Tooltip) else Tooltip(str(tooltip))
             )
 
+    def _simplify(self, tolerance: float) -> list:
+        """Simplify every line or ring of the locations at once."""
+        lines = _lines(self.locations)
+        coords = np.array([coord for line in lines for coord in line], dtype=float)
+        bounds = np.cumsum([0] + [len(line) for line in lines])
+        keep = np.zeros(len(coords), dtype=bool)
+        keep[bounds[:-1]] = True
+        keep[bounds[1:] - 1] = True
+        if self._closed:
+            # Also keep the inner vertex farthest from the first one, so
+            # that rings don't collapse into a line.
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                if end - start > 2:
+                    inner = coords[start + 1 : end - 1]
+                    distance = ((inner - coords[start]) ** 2).sum(axis=1)
+                    keep[start + 1 + np.argmax(distance)] = True
+        keep = simplify_locations(coords, tolerance, keep=keep)
+        out = (
+            coords[start:end][keep[start:end]].tolist()
+            for start, end in zip(bounds[:-1], bounds[1:])
+        )
+        return _nest(self.locations, out)
+
+    @staticmethod
+    def _encode(locations: list) -> Union[str, list]:
+        """Encode each line or ring with the polyline algorithm."""
+        return _nest(locations, iter(encode_polylines(_lines(locations))))
+
     def _get_self_bounds(self) -> list[list[Optional[float]]]:
         """Compute the bounds of the object itself."""
         return get_bounds(self.locations)
 
+    def render(self, **kwargs):
+        if self.encoded is not None:
+            name, url = _POLYLINE_ENCODED_JS
+            figure = get_and_assert_figure_root(self)
+            figure.header.add_child(JavascriptLink(url), name=name)
+        super().render(**kwargs)
+
 
 class PolyLine(BaseMultiLocation):
     """Draw polyline overlays on a map.
@@ -167,6 +325,16 @@ class PolyLine(BaseMultiLocation):
         Input text or visualization for object displayed when clicking.
     tooltip: str or folium.Tooltip, default None
         Display a text when hovering over the object.
+    simplify: float or dict, optional
+        Simplify the locations with the Douglas-Peucker algorithm, using this
+        tolerance in Web Mercator meters. Pass a dict of zoom levels to
+        tolerances, like ``{0: 1000, 10: 50, 15: 0}``, to compute several
+        levels of detail. The map then shows the locations simplified with
+        the tolerance of the highest zoom level not above the current zoom.
+    encoding: {"polyline"}, optional
+        Ship the locations as strings encoded with the Google polyline
+        algorithm, which are decoded in the browser. This makes the page
+        several times smaller, at the cost of rounding to five decimals.
     smooth_factor: float, default 1.0
         How much to simplify the polyline on each zoom level.
         More means better performance and smoother look,
@@ -179,17 +347,34 @@ class PolyLine(BaseMultiLocation):
 
     """
 
-    _template = Template("""
+    _template = Template(
+        """
         {% macro script(this, kwargs) %}
-            var {{ this.get_name() }} = L.polyline(
-                {{ this.locations|tojson }},
+            var {{ this.get_name() }} = L.polyline("""
+        + _LATLNGS
+        + """
                 {{ this.options|tojson }}
             ).addTo({{this._parent.get_name()}});
         {% endmacro %}
-        """)
+        """
+    )
 
-    def __init__(self, locations, popup=None, tooltip=None, **kwargs):
-        super().__init__(locations, popup=popup, tooltip=tooltip)
+    def __init__(
+        self,
+        locations,
+        popup=None,
+        tooltip=None,
+        simplify=None,
+        encoding=None,
+        **kwargs,
+    ):
+        super().__init__(
+            locations,
+            popup=popup,
+            tooltip=tooltip,
+            simplify=simplify,
+            encoding=encoding,
+        )
         self._name = "PolyLine"
         self.options = path_options(line=True, **kwargs)
 
@@ -210,29 +395,52 @@ class Polygon(BaseMultiLocation):
         Input text or visualization for object displayed when clicking.
     tooltip: str or folium.Tooltip, default None
         Display a text when hovering over the object.
+    simplify: float or dict, optional
+        Simplify the rings with the Douglas-Peucker algorithm, using this
+        tolerance in Web Mercator meters. Pass a dict of zoom levels to
+        tolerances, like ``{0: 1000, 10: 50, 15: 0}``, to compute several
+        levels of detail. The map then shows the locations simplified with
+        the tolerance of the highest zoom level not above the current zoom.
+    encoding: {"polyline"}, optional
+        Ship the locations as strings encoded with the Google polyline
+        algorithm, which are decoded in the browser. This makes the page
+        several times smaller, at the cost of rounding to five decimals.
     **kwargs
         Other valid (possibly inherited) options. See:
         https://leafletjs.com/reference.html#polygon
 
     """
 
-    _template = Template("""
+    _closed = True
+
+    _template = Template(
+        """
         {% macro script(this, kwargs) %}
-            var {{ this.get_name() }} = L.polygon(
-                {{ this.locations|tojson }},
+            var {{ this.get_name() }} = L.polygon("""
+        + _LATLNGS
+        + """
                 {{ this.options|tojson }}
             ).addTo({{this._parent.get_name()}});
         {% endmacro %}
-        """)
+        """
+    )
 
     def __init__(
         self,
         locations: TypeMultiLine,
         popup: Union[Popup, str, None] = None,
         tooltip: Union[Tooltip, str, None] = None,
+        simplify: Union[float, dict[int, float], None] = None,
+        encoding: Optional[str] = None,
         **kwargs: TypePathOptions,
     ):
-        super().__init__(locations, popup=popup, tooltip=tooltip)
+        super().__init__(
+            locations,
+            popup=popup,
+            tooltip=tooltip,
+            simplify=simplify,
+            encoding=encoding,
+        )
         self._name = "Polygon"
         self.options = path_options(line=True, radius=None, **kwargs)
 
@@ -259,7 +467,7 @@ class Rectangle(MacroElement):
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{this.get_name()}} = L.rectangle(
-                {{ this.locations|tojson }},
+                {{ this.locations|round_coordinates(this)|tojson }},
                 {{ this.options|tojson }}
             ).addTo({{this._parent.get_name()}});
         {% endmacro %}
@@ -317,7 +525,7 @@ class Circle(Marker):
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.circle(
-                {{ this.location|tojson }},
+                {{ this.location|round_coordinates(this)|tojson }},
                 {{ this.options|tojson }}
             ).addTo({{ this._parent.get_name() }});
         {% endmacro %}
@@ -361,7 +569,7 @@ class CircleMarker(Marker):
     _template = Template("""
         {% macro script(this, kwargs) %}
             var {{ this.get_name() }} = L.circleMarker(
-                {{ this.location|tojson }},
+                {{ this.location|round_coordinates(this)|tojson }},
                 {{ this.options|tojson }}
             ).addTo({{ this._parent.get_name() }});
         {% endmacro %}
@@ -46,25 +46,34 @@ def test_fast_marker_cluster():
         var {{ this.get_name() }} = (function(){
             {{ this.callback }}
 
-            var data = {{ this.data|tojson }};
+            var data = {{ this.payload|tojson }};
             var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
             {%- if this.icon_create_function is not none %}
             cluster.options.iconCreateFunction =
                 {{ this.icon_create_function.strip() }};
             {%- endif %}
 
-            for (var i = 0; i < data.length; i++) {
-                var row = data[i];
-                var marker = callback(row);
-                marker.addTo(cluster);
+            var names = data.names;
+            var markers = new Array(data.lat.length);
+            for (var i = 0; i < data.lat.length; i++) {
+                var row = [data.lat[i], data.lng[i]];
+                var props = {};
+                for (var j = 0; j < names.length; j++) {
+                    var value = data.columns[j][i];
+                    row.push(value);
+                    props[names[j]] = value;
+                }
+                markers[i] = callback(row, props);
             }
 
             cluster.addTo({{ this._parent.get_name() }});
+            cluster.addLayers(markers);
             return cluster;
         })();
     """)
     expected = normalize(tmpl.render(this=mc))
     assert expected in out
+    assert '"chunkedLoading": true' in out
 
 
 @pytest.mark.parametrize(
@@ -87,3 +96,43 @@ def test_fast_marker_cluster_data(case):
         assert len(data[i]) == 3
         assert data[i][0] == float(i)
         assert data[i][1] == float(i + 5)
+
+
+def test_fast_marker_cluster_columns():
+    df = pd.DataFrame(
+        {"lat": [0.0, 1.0], "lng": [5.0, 6.0], "color": ["red", "blue"], "size": [1, 2]}
+    )
+    for data in (df, {name: df[name].to_numpy() for name in df.columns}):
+        mc = FastMarkerCluster(data)
+        assert mc.payload == {
+            "lat": [0.0, 1.0],
+            "lng": [5.0, 6.0],
+            "names": ["color", "size"],
+            "columns": [["red", "blue"], [1, 2]],
+        }
+        assert mc.data == [[0.0, 5.0, "red", 1], [1.0, 6.0, "blue", 2]]
+
+
+def test_fast_marker_cluster_set_data():
+    mc = FastMarkerCluster([[0, 5]])
+    mc.data = [[1, 6, "red"], [2, 7, "blue"]]
+    assert mc.data == [[1.0, 6.0, "red"], [2.0, 7.0, "blue"]]
+    assert mc.payload == {
+        "lat": [1.0, 2.0],
+        "lng": [6.0, 7.0],
+        "names": ["2"],
+        "columns": [["red", "blue"]],
+    }
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        [[0, 5], [1, None]],
+        [[0, 5, "red"], [1, 6]],
+        {"lat": [0, 1], "lng": ["a", "b"]},
+    ],
+)
+def test_fast_marker_cluster_data_exceptions(case):
+    with pytest.raises((TypeError, ValueError)):
+        FastMarkerCluster(case)
@@ -0,0 +1,87 @@
+"""
+Test Glify
+----------
+"""
+
+import base64
+
+import numpy as np
+import pytest
+
+import folium
+from folium.plugins import GlifyLines, GlifyPoints, GlifyShapes
+from folium.utilities import normalize
+
+
+def decode(data, dtype):
+    return np.frombuffer(base64.b64decode(data), dtype=dtype)
+
+
+def test_glify_points():
+    data = np.array([[45.0, 3.0], [46.0, 4.0], [47.0, 5.0]])
+    m = folium.Map([45.0, 3.0], zoom_start=4)
+    layer = GlifyPoints(
+        data,
+        color=np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255]]),
+        size=[1, 2, 3],
+        popups=["a", "b", "c"],
+    ).add_to(m)
+    out = normalize(m._parent.render())
+
+    assert (
+        '<script src="https://cdn.jsdelivr.net/npm/leaflet.glify@3.2.0/dist/glify-browser.js"></script>'  # noqa
+        in out
+    )
+    assert "return L.glify.points(options);" in out
+    assert f"{layer.get_name()}.addTo({m.get_name()});" in out
+
+    payload = layer.payload
+    np.testing.assert_array_equal(decode(payload["coords"], "<f8"), data.ravel())
+    assert decode(payload["colors"], "u1").tolist() == [
+        *[255, 0, 0, 255],
+        *[0, 255, 0, 255],
+        *[0, 0, 255, 255],
+    ]
+    assert decode(payload["sizes"], "<f4").tolist() == [1, 2, 3]
+    assert payload["color"] is None
+    assert payload["popups"] == ["a", "b", "c"]
+    assert layer.get_bounds() == [[45.0, 3.0], [47.0, 5.0]]
+
+
+def test_glify_single_color():
+    payload = GlifyPoints([[0, 0]], color="red", size=5).payload
+    assert payload["color"] == {"r": 1.0, "g": 0.0, "b": 0.0, "a": 1.0}
+    assert payload["colors"] is None
+    assert payload["size"] == 5
+    assert payload["sizes"] is None
+
+
+def test_glify_lines_and_shapes():
+    lines = [[[0, 0], [1, 1]], [[2, 2], [3, 3], [4, 4]]]
+    for cls in (GlifyLines, GlifyShapes):
+        layer = cls(lines, color=["red", "#0000ff"])
+        payload = layer.payload
+        assert decode(payload["offsets"], "<u4").tolist() == [0, 2, 5]
+        assert decode(payload["coords"], "<f8").tolist() == list(
+            np.ravel(lines[0] + lines[1])
+        )
+        assert decode(payload["colors"], "u1").tolist() == [
+            *[255, 0, 0, 255],
+            *[0, 0, 255, 255],
+        ]
+        assert layer.get_bounds() == [[0, 0], [4, 4]]
+    assert GlifyShapes(lines).options["border"] is False
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"color": ["red"]},
+        {"size": [1, 2, 3]},
+        {"popups": ["a"]},
+        {"color": np.zeros((2, 5))},
+    ],
+)
+def test_glify_exceptions(kwargs):
+    with pytest.raises(ValueError):
+        GlifyPoints([[0, 0], [1, 1]], **kwargs)
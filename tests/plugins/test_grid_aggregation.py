@@ -0,0 +1,82 @@
+"""
+Test GridAggregation
+--------------------
+"""
+
+import numpy as np
+import pytest
+from branca.colormap import LinearColormap
+
+import folium
+from folium.plugins import GridAggregation
+from folium.plugins.grid_aggregation import _hexbin, aggregate
+from folium.utilities import normalize
+
+
+@pytest.fixture
+def data():
+    np.random.seed(seed=26082009)
+    return np.random.normal(size=(10000, 2)) + [45, 3]
+
+
+def test_hexbin_nearest_center():
+    np.random.seed(seed=26082009)
+    x, y = np.random.uniform(0, 500, size=(2, 10000))
+    col, row = _hexbin(x, y, 10)
+    center_x = (col + (row.astype(int) & 1) / 2) * 10 * np.sqrt(3)
+    center_y = row * 15
+    assert (np.hypot(x - center_x, y - center_y) <= 10 + 1e-9).all()
+
+
+@pytest.mark.parametrize("shape,corners", [("hexagon", 6), ("square", 4)])
+def test_aggregate(data, shape, corners):
+    polygons, values = aggregate(data, zoom=6, shape=shape)
+    assert polygons.shape == (len(values), corners, 2)
+    assert values.sum() == len(data)
+    # The cells are around the points.
+    assert np.abs(polygons.mean(axis=(0, 1)) - [45, 3]).max() < 0.5
+
+
+def test_aggregate_weights():
+    data = np.array([[45.0, 3.0, 1.0], [45.0, 3.0, 3.0], [-45.0, -3.0, 5.0]])
+    _, values = aggregate(data, zoom=5, aggfunc="sum")
+    assert sorted(values) == [4, 5]
+    _, values = aggregate(data, zoom=5, aggfunc="mean")
+    assert sorted(values) == [2, 5]
+
+
+def test_grid_aggregation(data):
+    m = folium.Map([45.0, 3.0], zoom_start=6)
+    grid = GridAggregation(data, zoom_levels=6, legend_name="count").add_to(m)
+    out = normalize(m._parent.render())
+
+    (layer,) = grid.layers.values()
+    assert f"{layer.get_name()}.addTo({grid.get_name()});" in out
+    assert grid.color_scale.caption == "count"
+    assert f"var {grid.color_scale.get_name()} = {{}};" in out
+    feature = layer.data["features"][0]
+    assert feature["geometry"]["type"] == "Polygon"
+    assert set(feature["properties"]) == {"value"}
+
+
+def test_grid_aggregation_zoom_levels(data):
+    m = folium.Map([45.0, 3.0], zoom_start=6)
+    colormap = LinearColormap(["white", "red"], vmin=0, vmax=100)
+    grid = GridAggregation(data, zoom_levels=[8, 4, 6], colormap=colormap)
+    grid.add_to(m)
+    out = normalize(m._parent.render())
+
+    assert list(grid.layers) == [4, 6, 8]
+    for zoom, layer in grid.layers.items():
+        assert f"[{zoom},{layer.get_name()}]," in out
+        assert f"{layer.get_name()}.addTo({grid.get_name()});" not in out
+    assert 'group._map.on("zoomend",update);' in out
+    assert grid.color_scale is colormap
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"shape": "triangle"}, {"aggfunc": "max"}, {"fill_color": "nope"}]
+)
+def test_grid_aggregation_exceptions(data, kwargs):
+    with pytest.raises(ValueError):
+        GridAggregation(data, **kwargs)
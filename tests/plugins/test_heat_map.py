@@ -3,6 +3,10 @@ Test HeatMap
 ------------
 """
 
+import base64
+import json
+import zlib
+
 import numpy as np
 import pytest
 
@@ -106,3 +110,23 @@ def test_heatmap_integer_numpy_no_weight():
     m = folium.Map()
     HeatMap(data).add_to(m)
     assert "L.heatLayer" in m.get_root().render()
+
+
+def test_heat_map_compress():
+    m = folium.Map()
+    data = [[45.5, 3.25, 1.0], [45.75, 3.5, 2.0]]
+    hm = HeatMap(data, compress=1).add_to(m)
+    out = normalize(m._parent.render())
+    assert f"var {hm.get_name()} = L.heatLayer([]," in out
+    assert out.count("function foliumInflate(data)") == 1
+
+    compressed = out.split('foliumInflate("')[1].split('"')[0]
+    assert json.loads(zlib.decompress(base64.b64decode(compressed))) == data
+
+
+def test_heat_map_compress_threshold():
+    m = folium.Map()
+    HeatMap([[45.5, 3.25]], compress=True).add_to(m)
+    out = m._parent.render()
+    assert "foliumInflate" not in out
+    assert "[[45.5, 3.25]]" in out
@@ -0,0 +1,94 @@
+"""
+Test HeatMapTiles
+-----------------
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import folium
+from folium.plugins import HeatMap, HeatMapTiles
+from folium.raster_layers import TileLayer
+from folium.utilities import normalize
+
+
+@pytest.fixture
+def data():
+    np.random.seed(3141592)
+    return np.random.normal(size=(500, 3)) * np.array([[1, 1, 0]]) + np.array(
+        [[48, 5, 1]]
+    )
+
+
+def test_heat_map_tiles_fallback(data):
+    hm = HeatMapTiles(data, radius=10)
+    assert isinstance(hm.layer, HeatMap)
+    assert hm.layer.options["radius"] == 10
+    m = folium.Map([48.0, 5.0], zoom_start=6)
+    hm.add_to(m)
+    out = normalize(m.get_root().render())
+    assert "L.heatLayer(" in out
+    assert "L.tileLayer(" in out  # only the base map
+
+
+def test_heat_map_tiles(data, tmp_path):
+    tiles_dir = os.path.join(tmp_path, "heat")
+    hm = HeatMapTiles(
+        data, tiles_dir=tiles_dir, tiles_url="heat", threshold=0, max_tile_zoom=3
+    )
+    assert isinstance(hm.layer, TileLayer)
+    assert not os.path.exists(tiles_dir)
+
+    m = folium.Map([48.0, 5.0], zoom_start=6)
+    hm.add_to(m)
+    out = normalize(m.get_root().render())
+    assert os.listdir(tiles_dir) == [hm.version]
+    for zoom in range(4):
+        assert os.listdir(os.path.join(tiles_dir, hm.version, str(zoom)))
+    x, y = 2**2 * (5 + 180) // 360, 2**2 // 2 - 1
+    path = os.path.join(tiles_dir, hm.version, "2", str(x), f"{y}.png")
+    with open(path, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    assert f'"heat/{hm.version}/{{z}}/{{x}}/{{y}}.png"' in out
+    assert '"maxNativeZoom": 3,' in out
+    np.testing.assert_allclose(
+        m.get_bounds(), [data[:, :2].min(axis=0), data[:, :2].max(axis=0)]
+    )
+
+    # Rendering again keeps the tiles that were written.
+    mtime = os.path.getmtime(path)
+    m.get_root().render()
+    assert os.path.getmtime(path) == mtime
+
+
+def test_heat_map_tiles_versions(data, tmp_path):
+    tiles_dir = os.path.join(tmp_path, "heat")
+    first = HeatMapTiles(data, tiles_dir=tiles_dir, threshold=0, max_tile_zoom=2)
+    moved = HeatMapTiles(
+        data * [[-1, 1, 1]], tiles_dir=tiles_dir, threshold=0, max_tile_zoom=2
+    )
+    assert first.version != moved.version
+    for hm in (first, moved):
+        m = folium.Map()
+        hm.add_to(m)
+        m.get_root().render()
+    assert sorted(os.listdir(tiles_dir)) == sorted([first.version, moved.version])
+    # No tiles of the first data are served for the moved data.
+    x, y = 2**2 * (5 + 180) // 360, 2**2 // 2 - 1
+    assert os.path.exists(
+        os.path.join(tiles_dir, first.version, "2", str(x), f"{y}.png")
+    )
+    assert not os.path.exists(
+        os.path.join(tiles_dir, moved.version, "2", str(x), f"{y}.png")
+    )
+
+
+def test_heat_map_tiles_exception():
+    with pytest.raises(ValueError, match="tiles_dir"):
+        HeatMapTiles(np.array([[45.0, 3.0]]), threshold=1)
+    with pytest.raises(ValueError):
+        HeatMapTiles(np.array([[4, 5, 1], [3, 6, np.nan]]))
+    with pytest.raises(ValueError):
+        HeatMapTiles(np.array([3, 4, 5]))
@@ -7,6 +7,7 @@ import numpy as np
 
 import folium
 from folium import plugins
+from folium.plugins.marker_cluster import _CompactMarkers
 from folium.template import Template
 from folium.utilities import normalize
 
@@ -32,10 +33,16 @@ def test_marker_cluster():
                 {{ this.icon_create_function.strip() }};
             {%- endif %}
 
-        {% for marker in this._children.values() %}
-            var {{marker.get_name()}} = L.marker(
-                {{ marker.location|tojson }}, {}
-            ).addTo({{this.get_name()}});
+        {% for markers in this._children.values() %}
+            (function(){
+                var data = {{ markers.payload|tojson }};
+                var markers = new Array(data.lat.length);
+                for (var i = 0; i < data.lat.length; i++) {
+                    var marker = L.marker([data.lat[i], data.lng[i]]);
+                    markers[i] = marker;
+                }
+                {{ this.get_name() }}.addLayers(markers);
+            })();
         {% endfor %}
 
         {{ this.get_name() }}.addTo({{ this._parent.get_name() }});
@@ -68,3 +75,31 @@ def test_marker_cluster():
             [59.839718052359274, 29.94931046497927],
         ],
     )
+
+
+def test_marker_cluster_shared_popups_and_icons():
+    locations = [[0, 0], [1, 1], [2, 2], [3, 3]]
+    popups = ["a", "b", "a", None]
+    icons = [folium.Icon(color="red"), folium.Icon(color="red"), None, folium.Icon()]
+    m = folium.Map()
+    mc = plugins.MarkerCluster(locations, popups=popups, icons=icons).add_to(m)
+    *shared_icons, markers = mc._children.values()
+    assert isinstance(markers, _CompactMarkers)
+    assert shared_icons == [icons[0], icons[3]]
+    assert markers.payload["popup"] == [0, 1, 0, None]
+    assert markers.payload["icon"] == [0, 0, None, 1]
+    assert markers.icons == [icons[0], icons[3]]
+
+    out = normalize(m._parent.render())
+    assert out.count("L.AwesomeMarkers.icon(") == 2
+    assert f"var icons = [{icons[0].get_name()},{icons[3].get_name()},];" in out
+    assert out.index(icons[0].get_name()) < out.index("var icons")
+    assert mc.get_bounds() == [[0, 0], [3, 3]]
+
+
+def test_marker_cluster_popup_objects():
+    locations = [[0, 0], [1, 1]]
+    popups = [folium.Popup("a"), "b"]
+    mc = plugins.MarkerCluster(locations, popups=popups)
+    assert all(isinstance(child, folium.Marker) for child in mc._children.values())
+    assert len(mc._children) == 2
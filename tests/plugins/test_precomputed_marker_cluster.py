@@ -0,0 +1,63 @@
+"""
+Test PrecomputedMarkerCluster
+-----------------------------
+"""
+
+import numpy as np
+import pytest
+
+import folium
+from folium.plugins import PrecomputedMarkerCluster
+from folium.plugins.precomputed_marker_cluster import cluster_hierarchy
+from folium.utilities import normalize
+
+
+@pytest.fixture
+def data():
+    np.random.seed(seed=26082009)
+    return np.random.normal(size=(1000, 2)) * [2, 2] + [45, 3]
+
+
+def test_precomputed_marker_cluster(data):
+    m = folium.Map([45.0, 3.0], zoom_start=4)
+    mc = PrecomputedMarkerCluster(data, popups=[str(i) for i in range(len(data))])
+    mc.add_to(m)
+    out = normalize(m._parent.render())
+
+    assert (
+        '<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.Default.css"/>'  # noqa
+        in out
+    )
+    # The cluster tree is built in Python, no need for the markercluster js.
+    assert "leaflet.markercluster.js" not in out
+    assert f"var {mc.get_name()} = (function(){{" in out
+    assert f"{mc.get_name()}.addTo({m.get_name()});" in out
+    assert mc.points["popup"][3] == "3"
+    assert mc.get_bounds() == [
+        data.min(axis=0).tolist(),
+        data.max(axis=0).tolist(),
+    ]
+
+
+@pytest.mark.parametrize("zoom", range(0, 20))
+def test_cluster_hierarchy_counts(data, zoom):
+    point_zooms, clusters = cluster_hierarchy(data, max_zoom=16)
+    visible = (clusters["min_zoom"] <= zoom) & (zoom <= clusters["max_zoom"])
+    # Every point is shown exactly once at every zoom level.
+    assert clusters["count"][visible].sum() + (point_zooms <= zoom).sum() == len(data)
+    if zoom > 16:
+        assert (point_zooms <= zoom).all()
+
+
+def test_cluster_hierarchy_expansion(data):
+    _, clusters = cluster_hierarchy(data)
+    assert (clusters["count"] > 1).all()
+    assert (clusters["expansion"] > clusters["max_zoom"]).all()
+    assert (clusters["min_zoom"] <= clusters["max_zoom"]).all()
+
+
+def test_precomputed_marker_cluster_exception():
+    with pytest.raises(ValueError):
+        PrecomputedMarkerCluster([[1, 2, 3]])
+    with pytest.raises(ValueError):
+        PrecomputedMarkerCluster([[1, 2]], popups=["a", "b"])
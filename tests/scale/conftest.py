@@ -0,0 +1,33 @@
+import tracemalloc
+
+import pytest
+
+
+class MemoryTracker:
+    """Measure the peak memory allocated by Python while building a map
+    and while saving it."""
+
+    def __init__(self):
+        self.build = None
+        self.save = None
+
+    def run(self, make_map, outfile):
+        tracemalloc.start()
+        try:
+            m = make_map()
+            self.build = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            m.save(outfile)
+            self.save = tracemalloc.get_traced_memory()[1] - current
+        finally:
+            tracemalloc.stop()
+        return m
+
+
+@pytest.fixture
+def memory():
+    """Pytest fixture that yields a MemoryTracker."""
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc is already in use.")
+    return MemoryTracker()
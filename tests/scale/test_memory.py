@@ -0,0 +1,133 @@
+"""
+Memory budgets of large maps
+----------------------------
+
+The peak memory that Python allocates to build and to save maps with
+synthetic datasets must stay within a budget per data point or polygon.
+The budgets leave some headroom over the current usage, so that a change
+that copies the data once more fails these tests.
+
+Run with ``pytest tests/scale``. The largest datasets are marked slow and
+are skipped unless ``--run-slow`` is given.
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import folium
+from folium import plugins
+
+MiB = 2**20
+# Memory used independently of the size of the data.
+OVERHEAD = 5 * MiB
+
+
+def make_points(n):
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.uniform(-60, 60, n), rng.uniform(-180, 180, n)])
+
+
+def make_polygons(n):
+    """Return a GeoJSON FeatureCollection of n squares on a grid."""
+    side = int(np.ceil(np.sqrt(n)))
+    size = 0.8 * 120 / side
+    features = []
+    for i in range(n):
+        x = -170 + (i % side) * 340 / side
+        y = -60 + (i // side) * 120 / side
+        ring = [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+        features.append(
+            {
+                "type": "Feature",
+                "id": str(i),
+                "properties": {"value": i % 10},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+point_sizes = [
+    100_000,
+    1_000_000,
+    pytest.param(10_000_000, marks=pytest.mark.slow),
+]
+polygon_sizes = [10_000, 100_000]
+
+
+def check_budget(memory, n, build, save):
+    assert memory.build < OVERHEAD + build * n, (
+        f"Building used {memory.build / MiB:.0f} MiB, "
+        f"the budget is {(OVERHEAD + build * n) / MiB:.0f} MiB."
+    )
+    assert memory.save < OVERHEAD + save * n, (
+        f"Saving used {memory.save / MiB:.0f} MiB, "
+        f"the budget is {(OVERHEAD + save * n) / MiB:.0f} MiB."
+    )
+
+
+@pytest.mark.parametrize("n", point_sizes)
+def test_heat_map(memory, tmp_path, n):
+    data = make_points(n)
+
+    def make_map():
+        m = folium.Map()
+        plugins.HeatMap(data).add_to(m)
+        return m
+
+    memory.run(make_map, tmp_path / "map.html")
+    check_budget(memory, n, build=260, save=700)
+
+
+@pytest.mark.parametrize("n", point_sizes)
+def test_fast_marker_cluster(memory, tmp_path, n):
+    data = make_points(n)
+
+    def make_map():
+        m = folium.Map()
+        plugins.FastMarkerCluster(data).add_to(m)
+        return m
+
+    memory.run(make_map, tmp_path / "map.html")
+    check_budget(memory, n, build=50, save=650)
+
+
+@pytest.mark.parametrize("n", polygon_sizes)
+def test_geojson(memory, tmp_path, n):
+    data = make_polygons(n)
+
+    def make_map():
+        m = folium.Map()
+        folium.GeoJson(
+            data,
+            style_function=lambda feature: {"weight": feature["properties"]["value"]},
+        ).add_to(m)
+        return m
+
+    memory.run(make_map, tmp_path / "map.html")
+    check_budget(memory, n, build=150, save=5400)
+
+
+@pytest.mark.parametrize("n", polygon_sizes)
+def test_choropleth(memory, tmp_path, n):
+    geo_data = make_polygons(n)
+    df = pd.DataFrame(
+        {
+            "id": [feature["id"] for feature in geo_data["features"]],
+            "value": [
+                feature["properties"]["value"] for feature in geo_data["features"]
+            ],
+        }
+    )
+
+    def make_map():
+        m = folium.Map()
+        folium.Choropleth(
+            geo_data, data=df, columns=["id", "value"], key_on="feature.id"
+        ).add_to(m)
+        return m
+
+    memory.run(make_map, tmp_path / "map.html")
+    check_budget(memory, n, build=250, save=5600)
@@ -1,9 +1,18 @@
+import json
+import os
+import statistics
+import time
+
 import pytest
 from selenium.webdriver import Chrome, ChromeOptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.expected_conditions import visibility_of_element_located
 from selenium.webdriver.support.ui import WebDriverWait
 
+import folium
+from folium.elements import PerformanceMarks
+from folium.utilities import temp_html_filepath
+
 
 @pytest.fixture(scope="session")
 def driver():
@@ -25,6 +34,8 @@ class DriverFolium(Chrome):
         options.add_argument("--disable-gpu")
         options.add_argument("--headless")
         options.add_argument("--window-size=1024,768")
+        # Report the JS heap size without rounding in performance.memory.
+        options.add_argument("--enable-precise-memory-info")
         super().__init__(options=options)
 
     def get_file(self, filepath):
@@ -53,3 +64,191 @@ class DriverFolium(Chrome):
         wait = WebDriverWait(self, timeout=timeout)
         is_visible = visibility_of_element_located((By.CSS_SELECTOR, css_selector))
         return wait.until(is_visible)
+
+
+@pytest.fixture
+def browser_benchmark(driver):
+    """Pytest fixture that yields a BrowserBenchmark.
+
+    Results are appended to ``<fixture>.jsonl`` files in the directory in
+    the ``FOLIUM_BROWSER_BENCHMARK_DIR`` environment variable, by default
+    ``.benchmarks/browser``.
+    """
+    directory = os.environ.get(
+        "FOLIUM_BROWSER_BENCHMARK_DIR", os.path.join(".benchmarks", "browser")
+    )
+    return BrowserBenchmark(driver, directory)
+
+
+_COLLECT_JS = """
+var entries = performance.getEntriesByType("measure").filter(function(entry) {
+    return entry.name.indexOf("folium:") === 0;
+});
+return {
+    navigation: performance.getEntriesByType("navigation")[0].toJSON(),
+    measures: entries.map(function(entry) {
+        return {
+            name: entry.name.slice(7),
+            start: entry.startTime,
+            duration: entry.duration,
+            detail: entry.detail || null
+        };
+    }),
+    heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+    folium: window.__folium_perf.summary()
+};
+"""
+
+# Runs the steps one after the other, waiting for each to finish moving the
+# map and for two more frames, so that the layers are redrawn.
+_INTERACT_JS = """
+var map = window[arguments[0]];
+var steps = arguments[1];
+var done = arguments[arguments.length - 1];
+var frames = [];
+var results = [];
+var running = true;
+var last = null;
+function frame(now) {
+    if (last !== null) {
+        frames.push(now - last);
+    }
+    last = now;
+    if (running) {
+        requestAnimationFrame(frame);
+    }
+}
+requestAnimationFrame(frame);
+var heapBefore = performance.memory ? performance.memory.usedJSHeapSize : null;
+var start = performance.now();
+function next(i) {
+    if (i >= steps.length) {
+        running = false;
+        done({
+            frames: frames,
+            steps: results,
+            duration: performance.now() - start,
+            heap_before: heapBefore,
+            heap_after: performance.memory ? performance.memory.usedJSHeapSize : null
+        });
+        return;
+    }
+    var step = steps[i];
+    var stepStart = performance.now();
+    var finished = false;
+    function finish(timedOut) {
+        if (finished) {
+            return;
+        }
+        finished = true;
+        requestAnimationFrame(function() {
+            requestAnimationFrame(function() {
+                results.push({
+                    step: step,
+                    duration: performance.now() - stepStart,
+                    timed_out: timedOut
+                });
+                next(i + 1);
+            });
+        });
+    }
+    map.once("moveend", function() { finish(false); });
+    // A step that does not move the map does not fire moveend.
+    setTimeout(function() { finish(true); }, 5000);
+    map[step[0]].apply(map, step.slice(1));
+}
+next(0);
+"""
+
+DEFAULT_STEPS = [
+    ["zoomIn"],
+    ["zoomIn"],
+    ["panBy", [300, 0]],
+    ["panBy", [0, 300]],
+    ["panBy", [-300, 0]],
+    ["panBy", [0, -300]],
+    ["zoomOut"],
+    ["zoomOut"],
+]
+
+
+class BrowserBenchmark:
+    """Measure how a map performs in the browser.
+
+    The page is instrumented with the `performance_marks` option of the map,
+    which measures the script of each element and the parsing of data.
+    After the page has loaded, the Navigation Timing data and these
+    measures are collected, and a sequence of pan and zoom steps is run
+    while recording the time between frames and the JS heap size.
+    """
+
+    def __init__(self, driver, directory):
+        self.driver = driver
+        self.directory = directory
+
+    def run(self, name, m, steps=None, timeout=120):
+        """Load the map, run the steps and store the results under `name`."""
+        if steps is None:
+            steps = DEFAULT_STEPS
+        html = self.render(m)
+        with temp_html_filepath(html) as filepath:
+            self.driver.get_file(filepath)
+            WebDriverWait(self.driver, timeout=timeout).until(
+                lambda driver: driver.execute_script(
+                    "return document.readyState === 'complete'"
+                    " && performance.getEntriesByType('navigation')[0]"
+                    ".loadEventEnd > 0;"
+                )
+            )
+            self.driver.verify_js_logs()
+            results = self.driver.execute_script(_COLLECT_JS)
+            self.driver.set_script_timeout(timeout)
+            interaction = self.driver.execute_async_script(
+                _INTERACT_JS, m.get_name(), steps
+            )
+            self.driver.verify_js_logs()
+        results["interaction"] = interaction
+        results["summary"] = self.summarize(results)
+        self.store(name, results)
+        return results
+
+    @staticmethod
+    def render(m):
+        """Render the page of the map with performance marks."""
+        performance_marks = m.performance_marks
+        m.performance_marks = PerformanceMarks(m)
+        try:
+            return m.get_root().render()
+        finally:
+            m.performance_marks = performance_marks
+
+    @staticmethod
+    def summarize(results):
+        navigation = results["navigation"]
+        measures = results["measures"]
+        frames = sorted(results["interaction"]["frames"]) or [0]
+        return {
+            "dom_content_loaded": navigation["domContentLoadedEventEnd"],
+            "load": navigation["loadEventEnd"],
+            "init": sum(m["duration"] for m in measures if m["name"][:5] == "init:"),
+            "parse": sum(m["duration"] for m in measures if m["name"][:6] == "parse:"),
+            "frames": len(frames),
+            "frame_mean": statistics.mean(frames),
+            "frame_p95": frames[int(0.95 * (len(frames) - 1))],
+            "frame_max": frames[-1],
+            "long_frames": sum(frame > 50 for frame in frames),
+            "interaction": results["interaction"]["duration"],
+            "heap": results["heap"],
+            "heap_after_interaction": results["interaction"]["heap_after"],
+        }
+
+    def store(self, name, results):
+        os.makedirs(self.directory, exist_ok=True)
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "folium": folium.__version__,
+            "browser": self.driver.capabilities.get("browserVersion"),
+            **results,
+        }
+        with open(os.path.join(self.directory, f"{name}.jsonl"), "a") as f:
+            f.write(json.dumps(record) + "\n")
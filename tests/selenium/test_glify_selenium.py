@@ -0,0 +1,31 @@
+from selenium.webdriver.common.action_chains import ActionChains
+
+import folium
+from folium.plugins import GlifyPoints
+from folium.utilities import temp_html_filepath
+
+
+def test_glify_points(driver):
+    """Verify that GlifyPoints draws and handles clicks, with WebGL or not.
+
+    Headless Chrome may not provide WebGL, in which case the layer falls
+    back to canvas circle markers.
+
+    """
+    m = folium.Map((0.5, 0.5), zoom_start=8, tiles=None, width=800, height=600)
+    GlifyPoints(
+        [(0.5, 0.5), (0, 0), (1, 1)],
+        color=["red", "green", "blue"],
+        size=30,
+        popups=["center", "bottom left", "top right"],
+    ).add_to(m)
+    html = m.get_root().render()
+    with temp_html_filepath(html) as filepath:
+        driver.get_file(filepath)
+        assert driver.wait_until(".folium-map")
+        driver.verify_js_logs()
+    element = driver.wait_until(".folium-map")
+    assert driver.wait_until(".leaflet-overlay-pane canvas, canvas.leaflet-layer")
+    ActionChains(driver).move_to_element(element).click().perform()
+    popup = driver.wait_until(".leaflet-popup-content")
+    assert popup.text == "center"
@@ -0,0 +1,100 @@
+"""
+Client-side performance of large maps.
+
+Each case loads a map in headless Chrome, collects its load, init and
+parse timings, then pans and zooms while recording frame times and the JS
+heap size. The results are stored per case by the `browser_benchmark`
+fixture, so that they can be compared between runs.
+
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import folium
+from folium import plugins
+
+rootpath = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def random_points(n):
+    rng = np.random.default_rng(0)
+    return rng.normal([45.5, -122.6], [0.5, 0.5], size=(n, 2))
+
+
+def read_counties():
+    with open(os.path.join(rootpath, "us-counties.json")) as f:
+        return json.load(f)
+
+
+def markers():
+    m = folium.Map([45.5, -122.6], zoom_start=8, tiles=None)
+    for i, point in enumerate(random_points(1000).tolist()):
+        folium.Marker(point, popup=str(i)).add_to(m)
+    return m
+
+
+def geojson():
+    m = folium.Map([43, -100], zoom_start=4, tiles=None)
+    folium.GeoJson(
+        read_counties(),
+        style_function=lambda feature: {"weight": 1},
+        highlight_function=lambda feature: {"weight": 3},
+        tooltip=folium.GeoJsonTooltip(["name"]),
+    ).add_to(m)
+    return m
+
+
+def choropleth():
+    df = pd.read_csv(
+        os.path.join(rootpath, "us_county_data.csv"),
+        na_values=[" "],
+        dtype={"FIPS_Code": str},
+    )
+    m = folium.Map([43, -100], zoom_start=4, tiles=None)
+    folium.Choropleth(
+        geo_data=read_counties(),
+        data=df,
+        columns=["FIPS_Code", "Unemployment_rate_2011"],
+        key_on="feature.id",
+        fill_color="YlGn",
+    ).add_to(m)
+    return m
+
+
+def heat_map():
+    m = folium.Map([45.5, -122.6], zoom_start=8, tiles=None)
+    plugins.HeatMap(random_points(100_000)).add_to(m)
+    return m
+
+
+def fast_marker_cluster():
+    m = folium.Map([45.5, -122.6], zoom_start=8, tiles=None)
+    plugins.FastMarkerCluster(random_points(50_000)).add_to(m)
+    return m
+
+
+@pytest.mark.parametrize(
+    "make_map", [markers, geojson, choropleth, heat_map, fast_marker_cluster]
+)
+def test_performance(browser_benchmark, make_map):
+    m = make_map()
+    results = browser_benchmark.run(make_map.__name__, m)
+
+    assert results["navigation"]["loadEventEnd"] > 0
+    names = [measure["name"] for measure in results["measures"]]
+    assert f"init:{m.get_name()}" in names
+    for child in m._children.values():
+        if f"init:{child.get_name()}" in names:
+            break
+    else:
+        raise AssertionError("The layers were not measured.")
+    assert results["folium"]["init"] > 0
+    steps = results["interaction"]["steps"]
+    assert len(steps) == 8
+    assert not any(step["timed_out"] for step in steps)
+    assert results["summary"]["frames"] > 0
@@ -0,0 +1,164 @@
+"""
+Test the asset cache
+--------------------
+
+"""
+
+import pytest
+
+import folium
+from folium import assets
+from folium.plugins import HeatMap
+
+
+def fill_cache(cache_dir):
+    for kind, url in assets.default_urls():
+        path = assets.url_to_path(url, cache_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if kind == "js":
+            path.write_text(f"/* {url} */ var tag = '</script>';")
+        else:
+            path.write_text(".a { background: url(../images/a.png); }")
+
+
+def test_url_to_path(tmp_path):
+    path = assets.url_to_path(
+        "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js", tmp_path
+    )
+    assert path == tmp_path / "cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"
+    with pytest.raises(ValueError):
+        assets.url_to_path("leaflet.js", tmp_path)
+
+
+def test_save_inline_assets(tmp_path):
+    cache_dir = tmp_path / "cache"
+    fill_cache(cache_dir)
+    image = assets.url_to_path(
+        "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/images/a.png", cache_dir
+    )
+    image.parent.mkdir(parents=True)
+    image.write_bytes(b"png")
+
+    m = folium.Map()
+    HeatMap([[45.5, 3.25]]).add_to(m)
+    m.get_root().header.add_child(
+        folium.elements.JavascriptLink(folium.folium._default_js[0][1]),
+        name="leaflet_again",
+    )
+    m.save(tmp_path / "map.html", inline_assets=cache_dir)
+    html = (tmp_path / "map.html").read_text()
+
+    assert "<script src=" not in html
+    assert '<link rel="stylesheet"' not in html
+    assert html.count("leaflet@1.9.3/dist/leaflet.js */") == 1
+    assert "leaflet_heat.min.js */" in html
+    assert "var tag = '<\\/script>';" in html
+    assert 'url("data:image/png;base64,cG5n")' in html
+    assert (
+        'url("https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/images/a.png")' in html
+    )
+
+    # The links are restored afterwards.
+    m.save(tmp_path / "linked.html")
+    assert "<script src=" in (tmp_path / "linked.html").read_text()
+
+
+def test_save_inline_assets_missing(tmp_path):
+    m = folium.Map()
+    with pytest.raises(FileNotFoundError, match="python -m folium.assets"):
+        m.save(tmp_path / "map.html", inline_assets=tmp_path / "cache")
+
+
+def test_prefetch(tmp_path, monkeypatch):
+    requested = []
+
+    class Response:
+        def __init__(self, url):
+            self.content = (
+                b"url('font.woff') url(data:x)" if url.endswith(".css") else b"x"
+            )
+
+        def raise_for_status(self):
+            pass
+
+    def get(url, timeout):
+        requested.append(url)
+        return Response(url)
+
+    monkeypatch.setattr(assets.requests, "get", get)
+    paths = assets.prefetch(["https://example.com/lib/style.css"], cache_dir=tmp_path)
+    assert requested == [
+        "https://example.com/lib/style.css",
+        "https://example.com/lib/font.woff",
+    ]
+    assert paths == [
+        tmp_path / "example.com/lib/style.css",
+        tmp_path / "example.com/lib/font.woff",
+    ]
+
+    # Cached files are not downloaded again.
+    assets.prefetch(["https://example.com/lib/style.css"], cache_dir=tmp_path)
+    assert len(requested) == 2
+
+
+def test_write_hashed(tmp_path):
+    name = assets.write_hashed(tmp_path, "leaflet.js", b"x")
+    assert name.startswith("leaflet.") and name.endswith(".js")
+    assert assets.write_hashed(tmp_path, "leaflet.js", b"x") == name
+    assert assets.write_hashed(tmp_path, "leaflet.js", b"y") != name
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [name, assets.write_hashed(tmp_path, "leaflet.js", b"y")]
+    )
+
+
+def test_save_asset_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    fill_cache(cache_dir)
+    monkeypatch.setenv("FOLIUM_ASSET_CACHE", str(cache_dir))
+    asset_dir = tmp_path / "site" / "folium-assets"
+    (tmp_path / "site" / "maps").mkdir(parents=True)
+    data = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"name": "a"},
+                "geometry": {"type": "Point", "coordinates": [3.25, 45.5]},
+            }
+        ],
+    }
+
+    pages = []
+    for i in range(2):
+        m = folium.Map()
+        folium.GeoJson(
+            data, tooltip=folium.GeoJsonTooltip(["name"]), compress=1
+        ).add_to(m)
+        m.save(tmp_path / "site" / "maps" / f"{i}.html", asset_dir=asset_dir)
+        pages.append((tmp_path / "site" / "maps" / f"{i}.html").read_text())
+
+    files = sorted(path.name for path in asset_dir.iterdir())
+    assert (
+        len(files)
+        == len(folium.folium._default_js) + len(folium.folium._default_css) + 3
+    )
+    for name in files:
+        assert f"../folium-assets/{name}" in pages[1]
+    for page in pages:
+        assert "https://" not in page.split("</head>")[0]
+        assert "html, body" not in page
+        assert "function foliumInflate" not in page
+        assert "foliumInflate(" in page
+    css = (asset_dir / next(f for f in files if f.startswith("map."))).read_text()
+    assert "html, body" in css
+    assert "#map {" in css
+
+    # The page still works without shared assets.
+    html = m.get_root().render()
+    assert "function foliumInflate" in html
+    assert "html, body" in html
+
+
+def test_save_asset_dir_and_inline_assets(tmp_path):
+    with pytest.raises(ValueError):
+        folium.Map().save(tmp_path / "map.html", inline_assets=True, asset_dir=tmp_path)
@@ -4,17 +4,19 @@ Folium Features Tests
 
 """
 
+import base64
 import json
 import os
 import warnings
 
+import numpy as np
 import pytest
 from branca.element import Element
 
 import folium
-from folium import Choropleth, ClickForMarker, GeoJson, Map, Popup
+from folium import Choropleth, CircleMarker, ClickForMarker, GeoJson, Map, Popup
 from folium.elements import EventHandler
-from folium.utilities import JsCode
+from folium.utilities import JsCode, encode_geojson
 
 
 @pytest.mark.parametrize("geometry_type", ["Polygon", "MultiPolygon"])
@@ -186,6 +188,37 @@ def test_color_line():
     m._repr_html_()
 
 
+def test_color_line_merges_segments():
+    color_line = folium.ColorLine(
+        [[0, 0], [0, 1], [0, 2], [0, 3], [0, 4], [0, 5]],
+        [0, 0, 1, 1, 0],
+        colormap=["blue", "red"],
+        nb_steps=2,
+    )
+    lines = {
+        line.options["color"]: line.locations for line in color_line._children.values()
+    }
+    assert lines == {
+        "#0000ffff": [[[0, 0], [0, 1], [0, 2]], [[0, 4], [0, 5]]],
+        "#ff0000ff": [[[0, 2], [0, 3], [0, 4]]],
+    }
+
+
+def test_color_line_simplify():
+    positions = [[0, 0], [0, 1], [0, 2], [0, 3], [0.001, 4], [0, 5]]
+    color_line = folium.ColorLine(
+        positions, [0, 0, 0, 1, 1], colormap=["blue", "red"], nb_steps=2, simplify=1000
+    )
+    lines = {
+        line.options["color"]: line.locations for line in color_line._children.values()
+    }
+    # The point where the color changes is kept.
+    assert lines == {
+        "#0000ffff": [[[0, 0], [0, 3]]],
+        "#ff0000ff": [[[0, 3], [0, 5]]],
+    }
+
+
 @pytest.fixture
 def vegalite_spec(version):
     file_version = "v1" if version == 1 else "vlater"
@@ -218,6 +251,169 @@ def test_vegalite_major_version(vegalite_spec, version):
 
 
 # GeoJsonTooltip GeometryCollection
+def test_geojson_encoding():
+    m = Map()
+    data = {
+        "type": "Feature",
+        "properties": {},
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]],
+        },
+    }
+    geojson = GeoJson(data, encoding="polyline").add_to(m)
+    out = m._parent.render()
+    assert "Polyline.encoded.js" in out
+    assert (
+        f'{geojson.get_name()}_decode({{"geometry": {{"coordinates": ["~ps|U_p~iFnnqC_ulLvxq`@_mqN"]'
+        in out
+    )
+    assert geojson.data == data
+
+
+@pytest.mark.parametrize("worker", [False, True])
+def test_geojson_encoding_template_syntax(worker):
+    m = Map()
+    data = {
+        "type": "Feature",
+        "properties": {"name": "{% raw %}"},
+        "geometry": {"type": "LineString", "coordinates": [[0.0, -1.131], [0, 0]]},
+    }
+    geojson = GeoJson(data, encoding="polyline", worker=worker).add_to(m)
+    assert "{{" in json.dumps(encode_geojson(data))
+
+    # The encoded strings are not parsed as a template.
+    out = m._parent.render()
+    assert "{{" not in out
+    assert "{%" not in out
+    assert "\\u007b% raw %\\u007d" in out
+    assert geojson.data == data
+
+
+def test_geojson_compress():
+    m = Map()
+    data = {
+        "type": "Feature",
+        "properties": {},
+        "geometry": {"type": "Point", "coordinates": [3.25, 45.5]},
+    }
+    geojson = GeoJson(data, compress=1).add_to(m)
+    out = m._parent.render()
+    assert f"{geojson.get_name()}_add(data);" in out
+    assert out.count("function foliumInflate(data)") == 1
+    assert '"coordinates": [3.25, 45.5]' not in out
+
+
+def test_geojson_worker(tmp_path):
+    m = Map()
+    data = {
+        "type": "Feature",
+        "properties": {},
+        "geometry": {"type": "LineString", "coordinates": [[3.25, 45.5], [3.5, 46]]},
+    }
+    geojson = GeoJson(data, worker=True, worker_batch_size=10).add_to(m)
+    compressed = GeoJson(data, worker=True, compress=1).add_to(m)
+    encoded = GeoJson(data, worker=True, encoding="polyline").add_to(m)
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(data))
+    linked = GeoJson(str(path), worker=True, embed=False).add_to(m)
+    out = m._parent.render()
+    assert out.count("function foliumGeoJsonWorker(source, batchSize, add)") == 1
+    assert f"{geojson.get_name()}.addData(data);" in out
+    assert json.loads(geojson.worker_source["text"]) == data
+    assert list(compressed.worker_source) == ["compressed"]
+    assert linked.worker_source == {"url": str(path)}
+    assert encoded.worker_source["text"] == json.dumps(
+        encode_geojson(data), separators=(",", ":")
+    )
+    # The worker inflates and decodes, so the page does not have to.
+    assert "function foliumInflate" not in out
+    assert "Polyline.encoded.js" not in out
+    assert f"{encoded.get_name()}_decode" not in out
+    assert '"coordinates": [[3.25, 45.5]' not in out
+    assert "return feature.properties && feature.properties.style;" in out
+    with pytest.raises(ValueError):
+        GeoJson(data, worker=True, chunk_zoom=4)
+
+
+def test_geojson_chunks():
+    m = Map()
+    data = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"name": "a"},
+                "geometry": {"type": "Point", "coordinates": [3.25, 45.5]},
+            },
+            {
+                "type": "Feature",
+                "properties": {"name": "b"},
+                "geometry": {"type": "Point", "coordinates": [-122.6, 45.5]},
+            },
+        ],
+    }
+    geojson = GeoJson(data, chunk_zoom=4, max_chunks=10).add_to(m)
+    out = m._parent.render()
+    assert out.count("function foliumGeoJsonChunks(layer, options)") == 1
+    assert f"foliumGeoJsonChunks({geojson.get_name()}, {{" in out
+    assert f"{geojson.get_name()}_add(" not in out.split("foliumGeoJsonChunks(")[2]
+    assert geojson.chunks["index"] == [
+        ["4/8/5", [[45.5, 3.25], [45.5, 3.25]]],
+        ["4/2/5", [[45.5, -122.6], [45.5, -122.6]]],
+    ]
+    assert geojson.chunks["minZoom"] == 4
+    assert geojson.chunks["maxChunks"] == 10
+    assert json.loads(geojson.chunks["data"]["4/8/5"])["features"] == [
+        data["features"][0]
+    ]
+
+
+def test_geojson_chunk_dir(tmp_path):
+    m = Map()
+    data = {"type": "Point", "coordinates": [3.25, 45.5]}
+    geojson = GeoJson(
+        data, chunk_zoom=4, chunk_min_zoom=2, chunk_dir=tmp_path, chunk_url="chunks"
+    ).add_to(m)
+    out = m._parent.render()
+    (path,) = tmp_path.iterdir()
+    assert path.name.startswith("4-8-5.")
+    assert json.loads(path.read_text())["features"][0]["geometry"] == data
+    assert geojson.chunks["urls"] == {"4/8/5": f"chunks/{path.name}"}
+    assert geojson.chunks["minZoom"] == 2
+    assert '"coordinates": [3.25, 45.5]' not in out
+
+
+def test_geojson_chunks_invalid():
+    data = {"type": "Point", "coordinates": [3.25, 45.5]}
+    with pytest.raises(ValueError):
+        GeoJson(data, chunk_zoom=4, compress=True)
+    with pytest.raises(ValueError):
+        GeoJson(data, chunk_zoom=4, encoding="polyline")
+    with pytest.raises(ValueError):
+        GeoJson(data, chunk_zoom=4, spatial_index=True)
+
+
+def test_geojson_spatial_index():
+    m = Map()
+    data = {"type": "Point", "coordinates": [3.25, 45.5]}
+    geojson = GeoJson(
+        data, spatial_index=True, marker=CircleMarker(radius=6, weight=2)
+    ).add_to(m)
+    out = m._parent.render()
+    name = geojson.get_name()
+    assert out.count("function foliumIndexedCanvas(options)") == 1
+    assert f"var {name}_renderer = foliumIndexedCanvas(" in out
+    assert f"renderer: {name}_renderer," in out
+    assert f"{name}_renderer.indexFeatures(data.features);" in out
+    assert geojson.data["type"] == "FeatureCollection"
+    assert geojson.index_options["margin"] == 13
+    tree = base64.b64decode(geojson.index_options["tree"])
+    assert np.frombuffer(tree, "<f4", 4, 8).tolist() == pytest.approx(
+        [3.25, 45.5, 3.25, 45.5]
+    )
+
+
 def test_geojson_tooltip():
     m = folium.Map([30.5, -97.5], zoom_start=10)
     folium.GeoJson(
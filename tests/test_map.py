@@ -4,13 +4,27 @@ Folium map Tests
 
 """
 
+import base64
+import gzip
+import io
 import warnings
 
 import numpy as np
 import pytest
-
-from folium import GeoJson, Map, TileLayer
+from branca.element import MacroElement
+
+from folium import (
+    Circle,
+    CircleMarker,
+    FeatureGroup,
+    GeoJson,
+    Map,
+    PolyLine,
+    TileLayer,
+)
 from folium.map import Class, CustomPane, Icon, LayerControl, Marker, Popup
+from folium.plugins import HeatMap
+from folium.template import Template
 from folium.utilities import JsCode, normalize
 
 tmpl = """
@@ -70,6 +84,62 @@ def test_layer_control_draggable():
     assert normalize(expected) in normalize(rendered)
 
 
+def test_layer_control_lazy():
+    m = Map(tiles=None)
+    lazy = GeoJson(
+        {"type": "Point", "coordinates": [3.25, 45.5]}, show=False, tooltip="a"
+    ).add_to(m)
+    in_front = FeatureGroup(show=False).add_to(m)
+    m.keep_in_front(in_front)
+    shown = FeatureGroup().add_to(m)
+    layer_control = LayerControl(lazy=True).add_to(m)
+    rendered = m.get_root().render()
+    name = lazy.get_name()
+    page_script = rendered.split("</body>")[1]
+
+    assert layer_control.lazy_layers == {name: None}
+    assert list(layer_control.overlays.values()) == [
+        f"{name}_lazy",
+        in_front.get_name(),
+        shown.get_name(),
+    ]
+    assert f"var {name}_lazy = foliumLazyLayer(" in page_script
+    assert f"var {name} = " not in page_script
+    assert f"var {in_front.get_name()} = " in page_script
+    deferred = rendered.split(
+        f'<script type="text/x-folium-deferred" data-layer="{name}">'
+    )
+    assert f"var {name} = L.geoJson(" in deferred[1]
+    assert ".bindTooltip(" in deferred[1]
+    assert f'foliumLazyLayer.loaded("{name}", {name});' in deferred[1]
+
+    # Rendering again gives the same page.
+    assert m.get_root().render() == rendered
+
+
+def test_layer_control_lazy_sidecar(tmp_path):
+    m = Map(tiles=None)
+    lazy = FeatureGroup(show=False).add_to(m)
+    Marker([45.5, 3.25]).add_to(lazy)
+    LayerControl(lazy=True, sidecar_dir=tmp_path, sidecar_url="layers/").add_to(m)
+    rendered = m.get_root().render()
+
+    (path,) = tmp_path.iterdir()
+    assert f"var {lazy.get_name()} = L.featureGroup(" in path.read_text()
+    assert "L.marker(" in path.read_text()
+    assert f'foliumLazyLayer("{lazy.get_name()}", "layers/{path.name}")' in rendered
+    assert "L.marker(" not in rendered
+
+
+def test_layer_control_not_lazy():
+    m = Map(tiles=None)
+    FeatureGroup(show=False).add_to(m)
+    LayerControl().add_to(m)
+    rendered = m.get_root().render()
+    assert "foliumLazyLayer" not in rendered
+    assert "x-folium-deferred" not in rendered
+
+
 def test_popup_ascii():
     popup = Popup("Some text.")
     _id = list(popup.html._children.keys())[0]
@@ -316,3 +386,166 @@ def test_repeated_save_produces_identical_html(tmp_path):
     html2 = path2.read_text()
     html3 = path3.read_text()
     assert html1 == html2 == html3
+
+
+def test_save_gzip(tmp_path):
+    m = Map(location=[40.75, -73.98])
+    Marker([40.7829, -73.9654]).add_to(m)
+    m.save(tmp_path / "map.html")
+    html = (tmp_path / "map.html").read_bytes()
+
+    m.save(tmp_path / "map.html.gz")
+    assert gzip.decompress((tmp_path / "map.html.gz").read_bytes()) == html
+
+    buffer = io.BytesIO()
+    m.save(buffer, close_file=False, compression="gzip")
+    assert gzip.decompress(buffer.getvalue()) == html
+    # The output is reproducible.
+    assert buffer.getvalue() == (tmp_path / "map.html.gz").read_bytes()
+
+
+def test_save_multiple_encodings(tmp_path):
+    brotli = pytest.importorskip("brotli")
+    m = Map(location=[40.75, -73.98])
+    m.save(tmp_path / "map.html", compression=["gzip", "br"])
+    html = (tmp_path / "map.html").read_bytes()
+    assert html == m.get_root().render().encode("utf8")
+    assert gzip.decompress((tmp_path / "map.html.gz").read_bytes()) == html
+    assert brotli.decompress((tmp_path / "map.html.br").read_bytes()) == html
+
+
+def test_save_invalid_compression(tmp_path):
+    m = Map()
+    with pytest.raises(ValueError):
+        m.save(tmp_path / "map.html", compression="zip")
+    assert not (tmp_path / "map.html").exists()
+    with pytest.raises(ValueError):
+        m.save(io.BytesIO(), compression=["gzip"])
+
+
+def test_save_compact(tmp_path):
+    m = Map(location=[40.75, -73.98])
+    Marker([40.7829, -73.9654], tooltip="Central\n  Park").add_to(m)
+    GeoJson(
+        {"type": "Point", "coordinates": [-73.98, 40.75]},
+        tooltip="point",
+    ).add_to(m)
+    html = m.get_root().render()
+    m.save(tmp_path / "map.html", compact=True)
+    compact = (tmp_path / "map.html").read_text()
+
+    assert len(compact) < 0.8 * len(html)
+    assert '{"zoom":10,"zoomControl":true,"preferCanvas":false}' in compact
+    assert "L.marker([40.7829,-73.9654],{}).addTo(" in compact
+    # Template literals are kept as they are.
+    assert (
+        "`<div>\n                     Central\n  Park\n                 </div>`"
+        in compact
+    )
+    # The map renders as before afterwards.
+    assert m.get_root().render() == html
+
+    m = Map([45.5, -122.67499999999998])
+    Marker([45.123456789, -122.1]).add_to(m)
+    out = m.get_root().render()
+    assert "[45.5, -122.67499999999998]" in out
+    assert "[45.123456789, -122.1]" in out
+
+
+def test_coordinate_precision():
+    m = Map([45.5, -122.67499999999998], coordinate_precision=3)
+    Marker([45.123456789, -122.1]).add_to(m)
+    group = FeatureGroup(coordinate_precision=1).add_to(m)
+    PolyLine([[45.123456789, -122.1], [46.987654321, -121.0]]).add_to(group)
+    HeatMap([[45.123456789, -122.1, 0.123456789]]).add_to(m)
+    GeoJson(
+        {"type": "Point", "coordinates": [-122.123456789, 45.123456789]},
+        coordinate_precision=2,
+    ).add_to(m)
+    m.fit_bounds([[45.123456789, -122.1], [46.987654321, -121.0]])
+    out = normalize(m.get_root().render())
+    assert "center: [45.5,-122.675]" in out
+    assert "L.marker([45.123,-122.1]" in out
+    assert "L.polyline([[45.1,-122.1],[47.0,-121.0]]" in out
+    assert "[[45.123,-122.1,0.123456789]]" in out
+    assert '"coordinates": [-122.12,45.12]' in out
+    assert "fitBounds([[45.123,-122.1],[46.988,-121.0]]" in out
+
+
+def test_coordinate_precision_empty_bounds():
+    m = Map(coordinate_precision=3)
+    m.fit_bounds([[None, None], [None, None]])
+    out = normalize(m.get_root().render())
+    assert "fitBounds([[null,null],[null,null]]" in out
+    assert "NaN" not in out
+
+
+def test_performance_marks():
+    m = Map(tiles=None, performance_marks=True)
+    marker = Marker([45.5, -122.6], popup="a").add_to(m)
+    html = m.get_root().render()
+
+    header = html.split("</head>")[0]
+    assert header.index("window.__folium_perf = ") < header.index("leaflet.js")
+    for element in (m, marker, marker._children[next(iter(marker._children))]):
+        name = element.get_name()
+        begin = f'__folium_perf.begin("{name}", "{element._name}");'
+        end = f'__folium_perf.end("{name}");'
+        assert html.count(begin) == 1
+        assert html.index(begin) < html.index(f"var {name} = ") < html.index(end)
+
+    # Rendering again does not wrap the scripts twice.
+    assert m.get_root().render() == html
+
+
+def test_performance_marks_top_level_declarations():
+    m = Map(tiles=None, performance_marks=True)
+    defines = MacroElement()
+    defines._template = Template(
+        "{% macro script(this, kwargs) %}const shared = 1;{% endmacro %}"
+    )
+    uses = MacroElement()
+    uses._template = Template(
+        "{% macro script(this, kwargs) %}console.log(shared);{% endmacro %}"
+    )
+    m.add_child(defines).add_child(uses)
+    html = m.get_root().render()
+
+    # The scripts are not wrapped in a block, which would scope `shared` to it.
+    name = defines.get_name()
+    begin = html.index(f'__folium_perf.begin("{name}", "MacroElement");')
+    end = html.index(f'__folium_perf.end("{name}");')
+    assert html[begin:end].split(";", 1)[1].strip() == "const shared = 1;"
+
+
+def test_performance_marks_disabled():
+    html = Map().get_root().render()
+    assert "performance" not in html
+    assert "__folium_perf" not in html
+
+
+def test_feature_group_spatial_index():
+    m = Map()
+    group = FeatureGroup(spatial_index=True).add_to(m)
+    line = PolyLine([[45, 3], [46, 4]]).add_to(group)
+    CircleMarker([45.5, 3.5], radius=8).add_to(group)
+    Circle([0, 0], radius=1113.2).add_to(group)
+    Marker([45.5, 3.5]).add_to(group)
+    out = m.get_root().render()
+    name = group.get_name()
+    assert f"var {name}_renderer = foliumIndexedCanvas(" in out
+    assert f"{name}_renderer.indexGroup({name});" in out
+    for i in range(3):
+        assert f'"foliumIndex": {i},' in out
+    assert out.count('"foliumIndex"') == 3
+    # The options are only changed while rendering.
+    assert "foliumIndex" not in line.options
+    assert group.index_options["margin"] == 16
+    tree = base64.b64decode(group.index_options["tree"])
+    assert int.from_bytes(tree[4:8], "little") == 3
+    boxes = np.frombuffer(tree, "<f4", 12, 8).reshape(3, 4)
+    np.testing.assert_allclose(
+        sorted(boxes.tolist()),
+        [[-0.01, -0.01, 0.01, 0.01], [3, 45, 4, 46], [3.5, 45.5, 3.5, 45.5]],
+        rtol=1e-6,
+    )
@@ -0,0 +1,85 @@
+"""
+Test the render profiler
+------------------------
+
+"""
+
+import json
+
+import pytest
+
+import folium
+from folium.features import GeoJsonStyleMapper
+
+
+def test_profile(tmp_path):
+    m = folium.Map()
+    geojson = folium.GeoJson(
+        {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"name": "a"},
+                    "geometry": {"type": "Point", "coordinates": [3.25, 45.5]},
+                }
+            ],
+        },
+        style_function=lambda feature: {"color": "red"},
+    ).add_to(m)
+    for i in range(3):
+        folium.Marker([45.5, 3.25 + i], popup=str(i)).add_to(m)
+    render = folium.Marker.render
+
+    with folium.profile(m) as p:
+        m.save(tmp_path / "map.html")
+    html = (tmp_path / "map.html").read_text()
+
+    # The methods are restored.
+    assert folium.Marker.render is render
+    assert GeoJsonStyleMapper.get_style_map.__name__ == "get_style_map"
+
+    elements = {row["name"]: row for row in p.elements()}
+    row = elements[geojson.get_name()]
+    assert row["class"] == "GeoJson"
+    assert row["calls"] == 1
+    assert row["total_time"] >= row["self_time"] > 0
+    assert 0 < row["bytes"]["script"] < len(html)
+
+    classes = {row["class"]: row for row in p.classes()}
+    assert classes["Marker"]["count"] == 3
+    assert classes["Map"]["total_time"] > classes["Marker"]["total_time"]
+    assert classes["Map"]["bytes"]["header"] > 0
+    assert classes["Map"]["bytes"]["html"] > 0
+    assert p.functions["GeoJsonStyleMapper.get_style_map"]["calls"] == 1
+    assert p.functions["json.dumps"]["calls"] > 0
+    assert p.functions["Template.render"]["calls"] > 0
+
+    assert json.loads(p.to_json()) == json.loads(json.dumps(p.to_dict()))
+    table = p.table(by="element", sort="script", limit=2).splitlines()
+    assert table[0].split() == [
+        "name",
+        "calls",
+        "total",
+        "ms",
+        "self",
+        "ms",
+        "header",
+        "html",
+        "script",
+    ]
+    assert table[1].startswith(geojson.get_name())
+    assert "Marker" in str(p)
+    with pytest.raises(ValueError):
+        p.table(by="function")
+
+
+def test_profile_disabled_afterwards():
+    m = folium.Map()
+    with folium.profile(m) as p:
+        m.get_root().render()
+    calls = p.functions["json.dumps"]["calls"]
+    assert calls > 0
+    m.get_root().render()
+    json.dumps({})
+    assert p.functions["json.dumps"]["calls"] == calls
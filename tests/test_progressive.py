@@ -0,0 +1,90 @@
+"""
+Test Progressive
+----------------
+
+"""
+
+import re
+
+import folium
+from folium.map import Class
+from folium.progressive import Progressive
+
+
+def split(html):
+    units = re.findall(
+        r'<script type="text/x-folium-deferred" data-map="(\w+)">(.*?)</script>',
+        html,
+        re.DOTALL,
+    )
+    script = html.split("</body>")[1]
+    return units, script
+
+
+def test_progressive():
+    m = folium.Map(progressive=True)
+    hidden = folium.FeatureGroup(show=False).add_to(m)
+    folium.Marker([45.5, 3.25]).add_to(hidden)
+    geo_json = folium.GeoJson(
+        {"type": "Point", "coordinates": [3.25, 45.5]},
+        tooltip="a",
+    ).add_to(m)
+    marker = folium.Marker([45.5, 3.25], popup="b").add_to(m)
+    control = folium.LayerControl().add_to(m)
+    m.fit_bounds([[45, 3], [46, 4]])
+    html = m.get_root().render()
+    units, script = split(html)
+
+    assert [name for name, _ in units] == [m.get_name()] * 4
+    first = [re.search(r"var (\w+) = ", unit).group(1) for _, unit in units]
+    assert first == [
+        geo_json.get_name(),
+        marker.get_name(),
+        hidden.get_name(),
+        control.get_name() + "_layers",
+    ]
+    # The children of an element are in the same unit.
+    assert ".bindTooltip(" in units[0][1]
+    assert ".bindPopup(" in units[1][1]
+    assert f"{geo_json.get_name()}.addTo({m.get_name()})" in units[0][1]
+
+    assert f"var {m.get_name()} = L.map(" in script
+    assert "L.tileLayer(" in script
+    assert ".fitBounds(" in script
+    assert "L.geoJson(" not in script
+    assert script.index("var foliumProgressive") < script.index(
+        f"foliumProgressive.run({m.get_name()});"
+    )
+
+    # Rendering again gives the same page.
+    assert m.get_root().render() == html
+
+
+def test_progressive_shared_scripts():
+    m = folium.Map(progressive=True)
+    folium.GeoJson.include(foo=1)
+    try:
+        folium.Marker([45.5, 3.25]).add_to(m)
+        folium.GeoJson(
+            {"type": "Point", "coordinates": [3.25, 45.5]}, compress=1
+        ).add_to(m)
+        units, script = split(m.get_root().render())
+    finally:
+        Class._includes.clear()
+    assert "L.GeoJson.include(" in script
+    assert "function foliumInflate" in script
+    assert len(units) == 2
+
+
+def test_progressive_disabled():
+    m = folium.Map()
+    folium.Marker([45.5, 3.25]).add_to(m)
+    html = m.get_root().render()
+    assert "foliumProgressive" not in html
+    assert "x-folium-deferred" not in html
+
+
+def test_progressive_batch_size():
+    m = folium.Map()
+    m.progressive = Progressive(m, batch_size=10)
+    assert "var batchSize = 10;" in m.get_root().render()
@@ -1,7 +1,15 @@
 from branca.element import Element
 
 from folium import JsCode
-from folium.template import Environment, Template, _to_escaped_json, tojavascript
+from folium.template import (
+    Environment,
+    Template,
+    _to_escaped_json,
+    compact_html,
+    compact_js,
+    compact_output,
+    tojavascript,
+)
 
 
 def test_tojavascript_with_jscode():
@@ -72,3 +80,56 @@ def test_environment_filter():
 
 def test_template_environment_class():
     assert Template.environment_class == Environment
+
+
+def test_tojavascript_compact():
+    obj = {"key": ["value", 1], 3: {"nested_key": JsCode("f()")}}
+    with compact_output():
+        assert tojavascript(obj) == '{"key":["value",1],3:{"nestedKey":f()}}'
+        assert _to_escaped_json({"a": [1, 2]}) == '{"a":[1,2]}'
+        assert Template("{{ x|tojson }}").render(x={"a": [1, 2]}) == '{"a":[1,2]}'
+    assert Template("{{ x|tojson }}").render(x={"a": [1, 2]}) == '{"a": [1, 2]}'
+
+
+def test_compact_js():
+    code = """
+        var a = {
+            b: 1 + +c,  // comment
+            d: "  text  ",
+        };
+        /* comment */
+        var e = `<div>
+            ${ a.b ? "x" : `  y  ` }
+        </div>`;
+        var f = /[/ ]+/g.test(d)
+        return
+        a
+        ++e
+    """
+    assert compact_js(code) == (
+        'var a={b:1 + +c,d:"  text  ",};'
+        'var e=`<div>\n            ${a.b ? "x":`  y  `}\n        </div>`;'
+        "var f=/[/ ]+/g.test(d)\nreturn\na\n++e"
+    )
+
+
+def test_compact_html():
+    html = """
+        <div>
+            <pre>  keep
+              this</pre>
+        </div>
+        <style>
+            .a { color: red; }
+        </style>
+        <script type="text/template">  <b>  </script>
+        <script>
+            var a = 1;
+        </script>
+    """
+    assert compact_html(html) == (
+        "\n<div>\n<pre>  keep\n              this</pre>\n</div>\n"
+        "<style>\n.a { color: red; }\n</style>\n"
+        '<script type="text/template">  <b>  </script>\n'
+        "<script>var a=1;</script>\n"
+    )
@@ -1,3 +1,7 @@
+import base64
+import json
+import zlib
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -7,16 +11,27 @@ from folium.utilities import (
     JsCode,
     _is_url,
     camelize,
+    chunk_features,
+    compress_json,
     deep_copy,
+    encode_geojson,
+    encode_polyline,
+    encode_polylines,
     escape_double_quotes,
+    feature_boxes,
     get_obj_in_upper_tree,
     if_pandas_df_convert_to_numpy,
     javascript_identifier_path_to_array_notation,
     normalize_bounds_type,
+    pack_rtree,
+    pad_boxes,
     parse_font_size,
     parse_options,
+    round_coordinates,
+    simplify_locations,
     validate_location,
     validate_locations,
+    validate_locations_array,
     validate_multi_locations,
 )
 
@@ -78,6 +93,9 @@ def test_validate_location_exceptions(location):
 def test_validate_locations(locations):
     outcome = validate_locations(locations)
     assert outcome == [[0.0, 5.0], [1.0, 6.0], [2.0, 7.0]]
+    outcome = validate_locations_array(locations)
+    assert isinstance(outcome, np.ndarray)
+    assert outcome.tolist() == [[0.0, 5.0], [1.0, 6.0], [2.0, 7.0]]
 
 
 @pytest.mark.parametrize(
@@ -115,6 +133,8 @@ def test_validate_locations_exceptions(locations):
     """Test input that should raise an exception."""
     with pytest.raises((TypeError, ValueError)):
         validate_locations(locations)
+    with pytest.raises((TypeError, ValueError)):
+        validate_locations_array(locations)
 
 
 def test_if_pandas_df_convert_to_numpy():
@@ -269,3 +289,245 @@ expected_errors = "The font size must be expressed in rem, em, or px."
 def test_parse_font_size_invalid(value, error_message):
     with pytest.raises(ValueError, match=error_message):
         parse_font_size(value)
+
+
+def test_simplify_locations():
+    locations = [[0, 0], [0, 1], [0.0001, 2], [0, 3], [1, 4], [0, 5]]
+    assert simplify_locations(locations, 100).tolist() == [
+        True,
+        False,
+        False,
+        True,
+        True,
+        True,
+    ]
+    assert simplify_locations(locations, 1).all()
+    keep = np.array([False, True, False, False, False, False])
+    assert simplify_locations(locations, 1e9, keep=keep).tolist() == [
+        True,
+        True,
+        False,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_encode_polyline():
+    # Example from the documentation of the algorithm.
+    locations = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    assert encode_polyline(locations) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert encode_polylines([locations[:2], [], locations[2:]]) == [
+        "_p~iF~ps|U_ulLnnqC",
+        "",
+        "_t~fGfzxbW",
+    ]
+
+
+def test_encode_geojson():
+    data = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {},
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": [[-120.2, 38.5], [-120.95, 40.7]],
+                },
+            },
+            {
+                "type": "Feature",
+                "properties": {},
+                "geometry": {"type": "Point", "coordinates": [-120.2, 38.5]},
+            },
+        ],
+    }
+    encoded = encode_geojson(data)
+    assert encoded["features"][0]["geometry"]["coordinates"] == "~ps|U_p~iFnnqC_ulL"
+    assert encoded["features"][1] == data["features"][1]
+    # The input is not modified.
+    assert data["features"][0]["geometry"]["coordinates"][0] == [-120.2, 38.5]
+
+
+def test_round_coordinates():
+    locations = [[1.23456, 2.0], [3.0, 4.98765]]
+    assert round_coordinates(locations, None) is locations
+    assert round_coordinates(locations, 2) == [[1.23, 2.0], [3.0, 4.99]]
+    assert round_coordinates([[[1.234, 2.0]], [[3.0, 4.0], [5.0, 6.789]]], 1) == [
+        [[1.2, 2.0]],
+        [[3.0, 4.0], [5.0, 6.8]],
+    ]
+    assert round_coordinates([[1.234, 2.345, 0.1234]], 1, columns=2) == [
+        [1.2, 2.3, 0.1234]
+    ]
+
+
+def test_round_coordinates_not_numbers():
+    empty = [[None, None], [None, None]]
+    assert round_coordinates(empty, 2) == empty
+    assert round_coordinates([[1.234, None], [None, 5.678]], 1) == [
+        [1.2, None],
+        [None, 5.7],
+    ]
+    assert round_coordinates([[1.234, None, 0.1234]], 1, columns=2) == [
+        [1.2, None, 0.1234]
+    ]
+    assert round_coordinates(None, 2) is None
+
+
+def test_round_coordinates_geojson():
+    data = {
+        "type": "Feature",
+        "properties": {"value": 1.23456},
+        "geometry": {
+            "type": "GeometryCollection",
+            "geometries": [
+                {"type": "Point", "coordinates": [1.23456, 2.34567]},
+                {"type": "Polygon", "coordinates": [[[1.23456, 2.0], [3.0, 4.98765]]]},
+            ],
+        },
+    }
+    out = round_coordinates(data, 2)
+    assert out["properties"] == {"value": 1.23456}
+    assert out["geometry"]["geometries"][0]["coordinates"] == [1.23, 2.35]
+    assert out["geometry"]["geometries"][1]["coordinates"] == [
+        [[1.23, 2.0], [3.0, 4.99]]
+    ]
+    assert data["geometry"]["geometries"][0]["coordinates"] == [1.23456, 2.34567]
+
+
+def test_round_coordinates_topojson():
+    topology = {"type": "Topology", "arcs": [[[1.23456, 2.0]], [[3.0, 4.98765]]]}
+    assert round_coordinates(topology, 2)["arcs"] == [[[1.23, 2.0]], [[3.0, 4.99]]]
+    quantized = {
+        "type": "Topology",
+        "transform": {"scale": [0.0012345, 0.0012345], "translate": [1.23456, 2.0]},
+        "arcs": [[[1, 2], [3, 4]]],
+    }
+    out = round_coordinates(quantized, 2)
+    assert out["transform"] == {
+        "scale": [0.0012345, 0.0012345],
+        "translate": [1.23, 2.0],
+    }
+    assert out["arcs"] == quantized["arcs"]
+
+
+def test_chunk_features():
+    def feature(*coordinates):
+        return {
+            "type": "Feature",
+            "properties": {},
+            "geometry": {"type": "LineString", "coordinates": list(coordinates)},
+        }
+
+    a = feature([3.2, 45.5], [3.3, 45.6])
+    b = feature([3.1, 45.4], [3.4, 45.7])
+    c = feature([-122.6, 45.5], [-122.7, 45.6])
+    empty = {"type": "Feature", "properties": {}, "geometry": None}
+    chunks = chunk_features([a, b, c, empty], 4)
+    assert chunks == {
+        "4/8/5": {"features": [a, b], "bounds": [[45.4, 3.1], [45.7, 3.4]]},
+        "4/2/5": {"features": [c], "bounds": [[45.5, -122.7], [45.6, -122.6]]},
+    }
+    # Features near the poles and the antimeridian stay in the grid.
+    assert list(chunk_features([feature([180, 89.9])], 2)) == ["2/3/0"]
+
+
+def test_feature_boxes():
+    features = [
+        {
+            "type": "Feature",
+            "properties": {},
+            "geometry": {"type": "LineString", "coordinates": [[3, 45], [4, 44, 10]]},
+        },
+        {"type": "Feature", "properties": {}, "geometry": None},
+        {
+            "type": "Feature",
+            "properties": {},
+            "geometry": {"type": "Point", "coordinates": [-122.5, 45.5]},
+        },
+    ]
+    assert feature_boxes(features).tolist() == [
+        [3, 44, 4, 45],
+        [np.inf, np.inf, -np.inf, -np.inf],
+        [-122.5, 45.5, -122.5, 45.5],
+    ]
+    assert feature_boxes([]).shape == (0, 4)
+
+
+def test_pad_boxes():
+    boxes = pad_boxes([[0, 0, 1, 0], [0, 60, 0, 60]], [111_320, 1113.2])
+    np.testing.assert_allclose(
+        boxes, [[-1, -1, 2, 1], [-0.02, 59.99, 0.02, 60.01]], atol=1e-9
+    )
+
+
+def search(tree: bytes, box) -> list:
+    """Search a tree made by `pack_rtree` like flatbush does."""
+    node_size = int.from_bytes(tree[2:4], "little")
+    n = int.from_bytes(tree[4:8], "little")
+    level_bounds = [n * 4]
+    count = nodes = n
+    while True:
+        count = -(-count // node_size)
+        nodes += count
+        level_bounds.append(nodes * 4)
+        if count == 1:
+            break
+    boxes = np.frombuffer(tree, "<f4", nodes * 4, 8)
+    index_type = "<u2" if nodes < 16384 else "<u4"
+    indices = np.frombuffer(tree, index_type, nodes, 8 + nodes * 16)
+    found = []
+    queue = [len(boxes) - 4]
+    while queue:
+        node = queue.pop()
+        end = min(node + node_size * 4, min(b for b in level_bounds if b > node))
+        for pos in range(node, end, 4):
+            if (
+                box[2] < boxes[pos]
+                or box[3] < boxes[pos + 1]
+                or box[0] > boxes[pos + 2]
+                or box[1] > boxes[pos + 3]
+            ):
+                continue
+            if node >= n * 4:
+                queue.append(int(indices[pos // 4]))
+            else:
+                found.append(int(indices[pos // 4]))
+    return sorted(found)
+
+
+@pytest.mark.parametrize("n", [1, 16, 17, 1000])
+def test_pack_rtree(n):
+    rng = np.random.default_rng(n)
+    low = rng.uniform([-180, -80], [170, 70], (n, 2))
+    boxes = np.hstack([low, low + rng.uniform(0, 5, (n, 2))])
+    boxes[n // 2] = [np.inf, np.inf, -np.inf, -np.inf]
+    tree = pack_rtree(boxes, node_size=16)
+    assert tree[:2] == bytes([0xFB, 0x37])
+    assert int.from_bytes(tree[2:4], "little") == 16
+    assert int.from_bytes(tree[4:8], "little") == n
+    for query in [[-180, -90, 180, 90], [0, 0, 20, 20], [-100.5, 10, -99.5, 11]]:
+        expected = np.nonzero(
+            (boxes[:, 0] <= query[2])
+            & (boxes[:, 1] <= query[3])
+            & (boxes[:, 2] >= query[0])
+            & (boxes[:, 3] >= query[1])
+        )[0]
+        assert search(tree, query) == expected.tolist()
+
+
+def test_pack_rtree_empty():
+    with pytest.raises(ValueError):
+        pack_rtree(np.zeros((0, 4)))
+
+
+def test_compress_json():
+    data = {"values": list(range(5000))}
+    compressed = compress_json(data)
+    assert len(compressed) < len(json.dumps(data))
+    assert json.loads(zlib.decompress(base64.b64decode(compressed))) == data
+    assert compress_json(data, False) is None
+    assert compress_json(data, 100_000) is None
+    assert compress_json([1], 0) is not None
@@ -7,7 +7,7 @@ Test Vector Layers
 import json
 
 from folium import Map
-from folium.utilities import get_bounds, normalize
+from folium.utilities import encode_polyline, get_bounds, normalize
 from folium.vector_layers import (
     Circle,
     CircleMarker,
@@ -400,6 +400,93 @@ def test_mulyipolyline():
     assert multipolyline.options == expected_options
 
 
+def test_polyline_simplify():
+    locations = [[0.0, 0.0], [0.5, 0.4], [0.6, 0.3], [1.0, 0.0]]
+    polyline = PolyLine(locations, simplify=1000)
+    assert polyline.locations == locations
+
+    polyline = PolyLine(locations, simplify=1e6)
+    assert polyline.locations == [[0.0, 0.0], [1.0, 0.0]]
+
+
+def test_polyline_simplify_levels():
+    m = Map()
+    locations = [[0.0, 0.0], [0.5, 0.4], [0.6, 0.3], [1.0, 0.0]]
+    polyline = PolyLine(locations, simplify={5: 1, 0: 1e6}).add_to(m)
+    assert polyline.locations == [[0.0, 0.0], [1.0, 0.0]]
+    (lod,) = polyline._children.values()
+    assert lod.levels == [[0, [[0.0, 0.0], [1.0, 0.0]]], [5, locations]]
+
+    out = normalize(m._parent.render())
+    assert f"var layer = {polyline.get_name()};" in out
+    assert "layer.setLatLngs(levels[level][1]);" in out
+
+
+def test_polygon_simplify_keeps_rings():
+    locations = [
+        [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]],
+        [[0.2, 0.2], [0.2, 0.3], [0.3, 0.3]],
+    ]
+    polygon = Polygon(locations, simplify=1e7)
+    assert polygon.locations == [
+        [[0.0, 0.0], [1.0, 1.0], [1.0, 0.0]],
+        [[0.2, 0.2], [0.2, 0.3], [0.3, 0.3]],
+    ]
+
+
+def test_multipolygon_with_holes_simplify():
+    m = Map()
+    outer = [[0.0, 0.0], [0.0, 1.0], [0.5, 1.0001], [1.0, 1.0], [1.0, 0.0]]
+    hole = [[0.2, 0.2], [0.2, 0.3], [0.3, 0.3]]
+    other = [[5.0, 5.0], [5.0, 6.0], [6.0, 6.0], [6.05, 5.5], [6.0, 5.0]]
+    locations = [[outer, hole], [other]]
+    polygon = Polygon(locations, simplify={0: 1e4, 10: 1}, encoding="polyline")
+    polygon.add_to(m)
+    assert polygon.locations == [
+        [[[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]], hole],
+        [[[5.0, 5.0], [5.0, 6.0], [6.0, 6.0], [6.0, 5.0]]],
+    ]
+    assert [len(part) for part in polygon.encoded] == [2, 1]
+    assert all(isinstance(ring, str) for part in polygon.encoded for ring in part)
+    assert polygon.get_bounds() == [[0.0, 0.0], [6.0, 6.0]]
+    (lod,) = polygon._children.values()
+    assert lod.levels[1][1] == [
+        [encode_polyline(ring) for ring in part] for part in locations
+    ]
+
+    out = normalize(m._parent.render())
+    assert "encoded.map(decode)" in out
+
+
+def test_polyline_encoding():
+    m = Map()
+    locations = [[[38.5, -120.2], [40.7, -120.95]], [[43.252, -126.453], [0, 0]]]
+    polyline = PolyLine(locations, encoding="polyline").add_to(m)
+    assert polyline.encoded == ["_p~iF~ps|U_ulLnnqC", "_t~fGfzxbW~s~fGgzxbW"]
+
+    out = normalize(m._parent.render())
+    assert "Polyline.encoded.js" in out
+    assert '["_p~iF~ps|U_ulLnnqC","_t~fGfzxbW~s~fGgzxbW"].map(' in out
+    assert polyline.get_bounds() == get_bounds(locations)
+
+
+def test_polyline_encoding_template_syntax():
+    m = Map()
+    locations = [[-1.131, 0.0], [0.0, 0.0], [-1.131, 0.0]]
+    polyline = PolyLine(locations, encoding="polyline").add_to(m)
+    polygon = Polygon([locations], simplify={0: 1, 5: 0.1}, encoding="polyline")
+    polygon.add_to(m)
+    assert "{{" in polyline.encoded
+
+    # The encoded strings are not parsed as a template.
+    out = m._parent.render()
+    assert "{{" not in out
+    assert json.dumps(polyline.encoded).replace("{", "\\u007b") in out
+    assert json.loads(json.dumps(polyline.encoded).replace("{", "\\u007b")) == (
+        polyline.encoded
+    )
+
+
 def test_path_options_lower_camel_case():
     options = path_options(fill_color="red", fillOpacity=0.3)
     assert options["fillColor"] == "red"